@@ -0,0 +1,160 @@
+import json
+import platform
+import subprocess
+import tracemalloc
+from datetime import datetime
+from time import perf_counter
+from typing import Literal
+
+import data.configuration as c
+from infrastructure.command_queue import command_queue
+from infrastructure.entity_manager import entity_manager
+from infrastructure.global_inventory import global_inventory
+from infrastructure.io_registry import io_registry
+from infrastructure.machine_scheduler import machine_scheduler
+from infrastructure.node_store import node_store
+from infrastructure.transfer_registry import transfer_registry, cable_registry
+from game.scenarios import SCENARIOS
+from systems.simulation import Simulation
+from logger import logger
+
+# (scenario, size, ticks) for each suite. Tick counts shrink as worlds grow so every case runs in seconds.
+SUITES: dict[str, list[tuple[str, int, int]]] = {
+    "quick": [
+        ("optimization_test", 100, 300),
+        ("conveyor_heavy", 100, 300),
+        ("power_heavy", 100, 300),
+        ("mixed", 100, 300),
+        ("idle_heavy", 100, 300),
+    ],
+    "default": [
+        ("optimization_test", 100, 600),
+        ("optimization_test", 1000, 300),
+        ("optimization_test", 10000, 60),
+        ("conveyor_heavy", 1000, 300),
+        ("power_heavy", 1000, 300),
+        ("mixed", 1000, 300),
+        ("idle_heavy", 1000, 300),
+    ],
+}
+
+def reset_world():
+    """Clears every simulation singleton so scenarios can be built back to back in one process."""
+    entity_manager.clear()
+    transfer_registry.clear()
+    cable_registry.clear()
+    io_registry.clear()
+    global_inventory.clear()
+    command_queue.clear()
+    node_store.clear()
+
+def run_case(scenario: str, size: int, ticks: int, warmup_ticks: int = 30,
+             power_settlement: Literal["batched", "immediate"] = c.POWER_SETTLEMENT_MODE,
+             node_store_mode: Literal["objects", "numpy"] = c.NODE_STORE,
+             batch_recipes: bool = c.BATCH_RECIPES) -> dict:
+    """Builds one scenario and measures it.
+
+    Peak memory is traced while building the world and running the warmup ticks. The timed run happens afterwards
+    with tracing off, calling each Simulation phase separately so time can be attributed per phase.
+
+    Returns:
+        dict: Machine-readable result for this case.
+    """
+    reset_world()
+    node_store.enable(node_store_mode == "numpy")
+
+    tracemalloc.start()
+    start = perf_counter()
+    SCENARIOS[scenario](size)
+    build_seconds = perf_counter() - start
+    simulation = Simulation(power_settlement, batch_recipes=batch_recipes)
+    for _ in range(warmup_ticks):
+        simulation._tick()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    phase_seconds = {name: 0.0 for name, _ in simulation.phases}
+    start = perf_counter()
+    for _ in range(ticks * simulation.STEPS_PER_TICK):
+        simulation._start_tick()
+        for name, phase in simulation.phases:
+            phase_start = perf_counter()
+            phase()
+            phase_seconds[name] += perf_counter() - phase_start
+    run_seconds = perf_counter() - start
+
+    return {
+        "scenario": scenario,
+        "size": size,
+        "power_settlement": power_settlement,
+        "node_store": "numpy" if node_store.enabled else "objects",
+        "batch_recipes": simulation.recipe_batcher is not None,
+        "entities": len(entity_manager.entities),
+        "ticks": ticks,
+        "build_seconds": build_seconds,
+        "run_seconds": run_seconds,
+        "tps": ticks / run_seconds if run_seconds > 0 else float("inf"),
+        "ms_per_tick": run_seconds * 1000 / ticks,
+        "phase_ms_per_tick": {name: seconds * 1000 / ticks for name, seconds in phase_seconds.items()},
+        "peak_memory_bytes": peak_bytes,
+        "machines_asleep": machine_scheduler.count_asleep(),
+    }
+
+def run_suite(cases: list[tuple[str, int, int]],
+              power_settlement: Literal["batched", "immediate"] = c.POWER_SETTLEMENT_MODE,
+              node_store_mode: Literal["objects", "numpy"] = c.NODE_STORE,
+              batch_recipes: bool = c.BATCH_RECIPES) -> dict:
+    results = []
+    for scenario, size, ticks in cases:
+        result = run_case(scenario, size, ticks, power_settlement=power_settlement, node_store_mode=node_store_mode,
+                          batch_recipes=batch_recipes)
+        logger.info(
+            f"[benchmark] {scenario} x{size}: {result['tps']:.1f} TPS, {result['ms_per_tick']:.3f} ms/tick, "
+            f"peak {result['peak_memory_bytes'] / 1024 / 1024:.1f} MiB"
+        )
+        results.append(result)
+    reset_world()
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+def compare(current: dict, baseline: dict) -> list[str]:
+    """Lines describing the TPS and peak memory change of every (scenario, size) case present in both result sets."""
+    baseline_cases = {(r["scenario"], r["size"]): r for r in baseline["results"]}
+    lines = []
+    for result in current["results"]:
+        old = baseline_cases.get((result["scenario"], result["size"]))
+        if not old:
+            continue
+        change = (result["tps"] - old["tps"]) / old["tps"] * 100 if old["tps"] else 0.0
+        old_mib, new_mib = old["peak_memory_bytes"] / 1024 / 1024, result["peak_memory_bytes"] / 1024 / 1024
+        memory_change = (new_mib - old_mib) / old_mib * 100 if old_mib else 0.0
+        modes = ""
+        if old.get("power_settlement") != result.get("power_settlement"):
+            modes = f" [{old.get('power_settlement')} -> {result.get('power_settlement')}]"
+        lines.append(
+            f"{result['scenario']} x{result['size']}: {old['tps']:.1f} -> {result['tps']:.1f} TPS ({change:+.1f}%), "
+            f"peak {old_mib:.1f} -> {new_mib:.1f} MiB ({memory_change:+.1f}%){modes}"
+        )
+    return lines
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def write_results(results: dict, path: str):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=4)
+    logger.info(f"[benchmark] Wrote results to {path}")
+
+def load_results(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
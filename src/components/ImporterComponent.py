@@ -1,22 +1,35 @@
 from components.base_component import BaseComponent
 from infrastructure.global_inventory import global_inventory
+from infrastructure.machine_scheduler import machine_scheduler
 
 class ImporterComponent(BaseComponent):
+    __slots__ = ("transfer_ticks", "transfer_quantity", "_start_tick")
+
     def __init__(self, parent, args: dict) -> None:
         super().__init__(parent, args)
         self.transfer_ticks = args["transfer_ticks"]
         self.transfer_quantity = args["transfer_quantity"]
-        self._ticks = 0
+        # transfers happen every transfer_ticks ticks counted from when the importer was built
+        self._start_tick = machine_scheduler.tick
 
     def tick(self):
-        self._ticks += 1
-        if self._ticks < self.transfer_ticks:
-            return
-        self._ticks -= self.transfer_ticks
+        if (machine_scheduler.tick - self._start_tick) % self.transfer_ticks:
+            return # woken between transfers
         node = self.parent.get_item_node("item_in")
-        if node and node.item:
+        if node and node.item is not None:
             to_remove = min(node.quantity, self.transfer_quantity)
             node.quantity -= to_remove
             global_inventory.add_item(node.item, to_remove)
             if node.quantity <= 0:
-                node.item = None
\ No newline at end of file
+                node.item = None
+
+    def can_sleep(self) -> bool:
+        return True
+
+    def get_wake_tick(self) -> int | None:
+        # with nothing to import, sleep until items arrive
+        node = self.parent.get_item_node("item_in")
+        if not node or node.item is None:
+            return None
+        now = machine_scheduler.tick
+        return now + self.transfer_ticks - (now - self._start_tick) % self.transfer_ticks
\ No newline at end of file
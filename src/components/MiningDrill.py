@@ -4,6 +4,8 @@ if TYPE_CHECKING:
     from infrastructure.entity_manager import entity_manager
 
 class MiningDrill(BaseComponent):
+    __slots__ = ("entity_manager", "resource_node")
+
     def __init__(self, parent, args):
         super().__init__(parent, args)
         assert "entity_manager" in self.parent.context, "MiningDrill requires parent machine to have context {'entity_manager': entity_manager}"
@@ -11,6 +13,9 @@ class MiningDrill(BaseComponent):
         
         self.resource_node = self.parent.context["entity_manager"].get_resource_node_under_position(self.parent.position)
 
+    def can_sleep(self) -> bool:
+        return True
+
     def tick(self):
         assert self.resource_node, "MiningDrill machine not placed on resource node!"
         # print()
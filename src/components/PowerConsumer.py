@@ -1,18 +1,36 @@
 from components.base_component import BaseComponent
+from infrastructure.machine_scheduler import machine_scheduler
 
 class PowerConsumer(BaseComponent):
+    __slots__ = ("watts_required", "idle_watts", "voltage", "priority", "has_power", "_cached_demand")
+
     def __init__(self, parent, args) -> None:
         super().__init__(parent, args)
         self.watts_required = args["watts_required"]
         self.idle_watts = args["idle_watts"]
         self.voltage = args["voltage"]
+        self.priority: int = args.get("priority", 0) # higher priority consumers are powered first when a grid is short
         self.has_power = False
+        self._cached_demand: int | None = None
     
     def tick(self):
-        if self.parent.power_grid:
-            self.has_power = self.parent.power_grid.draw_power(self.evaluate_power_demand())
+        # the machine is ticking so its state may change, work the demand out again at the next settle
+        self._cached_demand = None
+        # When the simulation settles grids in batch the grid has already decided has_power for this tick
+        grid = self.parent.power_grid
+        if grid and not grid.settled:
+            self.has_power = grid.draw_power(self.evaluate_power_demand())
             # print(self.has_power)
     
+    def get_power_demand(self) -> int:
+        """
+        evaluate_power_demand, reusing the last result while the machine sleeps. Nothing the demand depends on can
+        change before the machine is woken or ticks again, so sleeping consumers cost grids nothing to settle.
+        """
+        if self._cached_demand is None or not machine_scheduler.is_asleep(self.parent):
+            self._cached_demand = self.evaluate_power_demand()
+        return self._cached_demand
+
     def evaluate_power_demand(self):
         anticipated_power = self.idle_watts
 
@@ -23,4 +41,9 @@ class PowerConsumer(BaseComponent):
     
     def evaluate_condition(self) -> bool:
         return self.has_power
+
+    def can_sleep(self) -> bool:
+        # consumers drawing power themselves ("immediate" settlement) have to draw every tick
+        grid = self.parent.power_grid
+        return grid is None or grid.settled
             
\ No newline at end of file
@@ -1,6 +1,8 @@
 from components.base_component import BaseComponent
 
 class PowerProducer(BaseComponent):
+    __slots__ = ("watts", "tier", "online", "max_internal_buffer", "current_buffer")
+
     def __init__(self, parent, args):
         super().__init__(parent, args)
         self.watts: int = args["watts"]
@@ -17,6 +19,10 @@ class PowerProducer(BaseComponent):
             self.online = False
         # print(self.current_buffer, self.max_internal_buffer)
 
+    def can_sleep(self) -> bool:
+        # online only changes with the buffer, which is filled by our own recipe or drained by a grid (which wakes us)
+        return True
+
     def can_produce(self):
         return self.current_buffer > 0
 
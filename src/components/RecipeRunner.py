@@ -1,33 +1,110 @@
+from dataclasses import dataclass
+from math import ceil
 from components.base_component import BaseComponent
 import data.configuration as c
 from typing import TYPE_CHECKING
 from infrastructure.data_registry import data_registry
+from infrastructure.machine_scheduler import machine_scheduler
 if TYPE_CHECKING:
     from infrastructure.data_registry import Recipe
+    from components.ionode import ItemIONode
     from components.PowerProducer import PowerProducer
+    from game.machine import Machine
+
+@dataclass(frozen=True, slots=True)
+class RecipePlan:
+    """
+    A recipe resolved against one machine's nodes, compiled when the recipe is selected so the per tick checks are
+    short loops over tuples. Nodes hold whatever item arrives, so every ingredient is checked against all nodes of
+    its direction, in get_item_nodes order.
+    """
+    # (item id, amount) per ingredient
+    inputs: tuple[tuple[int, int], ...]
+    outputs: tuple[tuple[int, int], ...]
+    input_nodes: tuple["ItemIONode", ...]
+    output_nodes: tuple["ItemIONode", ...]
+    # item an empty output node is counted as holding, see RecipeRunner.can_start_item_recipe
+    first_output: int | None
+    # total energy an energy recipe makes
+    energy: int
+    # ticks from start to completion, counting both
+    span: int
+    is_item: bool
+
+    @staticmethod
+    def compile(recipe: "Recipe", machine: "Machine") -> "RecipePlan":
+        if recipe.output_type not in ("item", "energy"):
+            raise ValueError(f"Invalid recipe output_type: {recipe.output_type} (must be either 'item' or 'energy'.)")
+        items = data_registry.items
+        return RecipePlan(
+            inputs=tuple((items.get_id(item), amount) for item, amount in recipe.inputs.items()),
+            outputs=tuple((items.get_id(item), amount) for item, amount in recipe.outputs.items()),
+            input_nodes=machine.get_item_nodes("input"),
+            output_nodes=machine.get_item_nodes("output"),
+            first_output=items.get_id(next(iter(recipe.outputs))) if recipe.outputs else None,
+            energy=sum(recipe.outputs.values()),
+            span=max(ceil(recipe.duration), 1),
+            is_item=recipe.output_type == "item",
+        )
 
 class RecipeRunner(BaseComponent):
+    __slots__ = ("capabilities", "is_running", "_selected_recipe", "plan", "forced_recipe", "blocked", "start_tick")
+
     def __init__(self, parent, args) -> None:
         super().__init__(parent, args)
         self.capabilities: list[str] = args["capabilities"]
         self.is_running = False
-        self.selected_recipe: Recipe | None = None
+        self._selected_recipe: Recipe | None = None
+        self.plan: RecipePlan | None = None
         self.forced_recipe = False
+        # set when the last tick could not start a recipe, see can_sleep
+        self.blocked = False
         
         if "forced_recipe" in args:
             assert args["forced_recipe"] in data_registry.recipes, f"Recipe {args["forced_recipe"]} not found in recipe registry."
-            self.selected_recipe = data_registry.recipes[args["forced_recipe"]]
+            self._selected_recipe = data_registry.recipes[args["forced_recipe"]]
+            self.plan = RecipePlan.compile(self._selected_recipe, parent)
             self.forced_recipe = True
         
-        self.progress = 0
-        self.progress_pct = 0.0
+        # tick the running recipe started on. Progress is worked out from it when asked for instead of counted
+        self.start_tick = 0
+
+    @property
+    def progress(self) -> int:
+        """Ticks the running recipe has been going for, counting the tick it started on. 0 when not running."""
+        if not self.is_running:
+            return 0
+        return machine_scheduler.tick - self.start_tick + 1
+
+    @property
+    def progress_pct(self) -> float:
+        if not self.is_running or not self.selected_recipe:
+            return 0.0
+        return min(self.progress / self.selected_recipe.duration, 1.0) if self.selected_recipe.duration else 1.0
+
+    @property
+    def completion_tick(self) -> int:
+        """Tick the running recipe finishes on, the one where progress reaches the recipe duration."""
+        assert self.plan
+        return self.start_tick + self.plan.span - 1
+
+    @property
+    def selected_recipe(self) -> "Recipe | None":
+        return self._selected_recipe
+
+    @selected_recipe.setter
+    def selected_recipe(self, recipe: "Recipe | None"):
+        self._selected_recipe = recipe
+        self.plan = RecipePlan.compile(recipe, self.parent) if recipe else None
+        self.parent.wake()
     
     def evaluate_condition(self) -> bool:
         # if a recipe is selected we assume that the machine has the capabilities to run it:
         #   - the machine has the required IOnodes to run it (e.g. number of input/output)
         #   - the machine has the required capability tags
 
-        if not self.selected_recipe:
+        plan = self.plan
+        if not plan:
             return False
         if not self.parent.enabled:
             return False
@@ -35,95 +112,92 @@ class RecipeRunner(BaseComponent):
         if not self.available_recipe_inputs():
             return False
         
-        if self.selected_recipe.output_type == "item":
+        if plan.is_item:
             return self.can_start_item_recipe()
-        elif self.selected_recipe.output_type == "energy":
-            return self.can_start_energy_recipe()
-        else:
-            raise ValueError(f"Invalid recipe output_type: {self.selected_recipe.output_type} (must be either 'item' or 'energy'.)")
+        return self.can_start_energy_recipe()
     
     def available_recipe_inputs(self) -> bool:
-        assert self.selected_recipe
-        # check item quantities in IOnodes
-        input_nodes = self.parent.get_item_nodes("input")
-
-        accounted_items: dict[str, int] = {}
-        
-        for item, amount in self.selected_recipe.inputs.items():
+        assert self.plan
+        # check item quantities in IOnodes, counting the last node holding each item
+        input_nodes = self.plan.input_nodes
+        for item, amount in self.plan.inputs:
+            held = 0
             for node in input_nodes:
-                if not node.item or node.item != item:
-                    continue
-                accounted_items.update({node.item: node.quantity})
+                if node.item == item:
+                    held = node.quantity
             
-            if accounted_items.get(item, 0) < amount:
-                # print(f"not enough {item} to run {self.selected_recipe.name} ({accounted_items.get(item, 0)}/{amount})")
+            if held < amount:
                 return False
 
         return True       
     
     def can_start_item_recipe(self) -> bool:
-        assert self.selected_recipe
+        assert self.plan
         
-        output_nodes = self.parent.get_item_nodes("output")
-        for item, amount in self.selected_recipe.outputs.items():
+        # empty nodes count as holding the first output, like output_items will fill them. Only reads the nodes so
+        # it is safe to ask while the machine sleeps
+        first_output = self.plan.first_output
+        output_nodes = self.plan.output_nodes
+        for item, amount in self.plan.outputs:
             for node in output_nodes:
-                if node.item and node.item != item:
+                node_item = node.item if node.item is not None else first_output
+                if node_item != item:
                     continue
-                elif node.item is None:
-                    node.item = item
                 if node.capacity - node.quantity < amount:
                     return False
 
         return True
     
     def can_start_energy_recipe(self) -> bool:
-        assert self.selected_recipe
+        assert self.plan
         power_producer = self.parent.get_component("PowerProducer")
         if TYPE_CHECKING:
             assert isinstance(power_producer, "PowerProducer")
         
-        if power_producer.current_buffer + sum(self.selected_recipe.outputs.values()) > power_producer.max_internal_buffer:
+        if power_producer.current_buffer + self.plan.energy > power_producer.max_internal_buffer:
             return False
         
         return True
     
     def tick(self):
-        just_started = self.is_running
-        if not self.is_running and not self.parent.can_run():
-            self.is_running = False
-            self.progress = 0
-            return
-        
-        assert self.selected_recipe
-        
-        self.is_running = True
-        if not just_started and self.is_running:
+        if not self.is_running:
+            if not self.parent.can_run():
+                self.blocked = True
+                return
+            self.blocked = False
+            self.is_running = True
+            self.start_tick = machine_scheduler.tick
             self.start_recipe()
         
-        ticks_required = self.selected_recipe.duration
-        
-        self.progress += 1
-        self.progress_pct = self.progress / ticks_required
-        # print(self.progress, self.progress_pct)
-        if self.progress >= ticks_required:
-            self.progress = 0
+        assert self.plan
+        # nothing to do between start and completion, the machine sleeps until completion_tick
+        if machine_scheduler.tick >= self.completion_tick:
             self.complete_recipe()
             self.is_running = False
     
+    def can_sleep(self) -> bool:
+        # a blocked machine stays blocked until its inputs, outputs, power or recipe change, all of which wake it.
+        # A running one only has to tick again when the recipe completes
+        return self.blocked or self.is_running
+
+    def get_wake_tick(self) -> int | None:
+        return self.completion_tick if self.is_running else None
+
     def complete_recipe(self):
-        assert self.selected_recipe
+        assert self.plan
         
-        if self.selected_recipe.output_type == "item":
+        if self.plan.is_item:
             self.output_items()
         else:
             self.output_energy()
+        self.parent.invalidate_conditions()
     
     def output_items(self):
-        assert self.selected_recipe
+        assert self.plan
         # print(f"{self.selected_recipe.name} complete!")
-        output_nodes = self.parent.get_item_nodes("output")
+        output_nodes = self.plan.output_nodes
         
-        for item, amt in self.selected_recipe.outputs.items():
+        for item, amt in self.plan.outputs:
             remaining = amt
 
             for node in output_nodes:
@@ -146,22 +220,22 @@ class RecipeRunner(BaseComponent):
                     break
         
     def output_energy(self):
-        assert self.selected_recipe
+        assert self.plan
         power_producer = self.parent.get_component("PowerProducer")
         if TYPE_CHECKING:
             assert isinstance(power_producer, "PowerProducer")
         
-        power_producer.current_buffer += sum(self.selected_recipe.outputs.values())
+        power_producer.current_buffer += self.plan.energy
     
     def start_recipe(self):
-        if self.selected_recipe:
+        if self.plan:
             # print(f"{self.selected_recipe.name} started!")
-            input_nodes = self.parent.get_item_nodes("input")
+            input_nodes = self.plan.input_nodes
             
-            for item, amt in self.selected_recipe.inputs.items():
+            for item, amt in self.plan.inputs:
                 remaining = amt
                 for node in input_nodes:
-                    if not node.item or node.item != item:
+                    if node.item != item:
                         continue
                     
                     take = min(node.quantity, remaining)
@@ -170,4 +244,4 @@ class RecipeRunner(BaseComponent):
 
                     if remaining == 0:
                         break
-        
\ No newline at end of file
+            self.parent.invalidate_conditions()
@@ -3,6 +3,8 @@ if TYPE_CHECKING:
     from game.machine import Machine
 
 class BaseComponent:
+    __slots__ = ("parent",)
+
     def __init__(self, parent: "Machine", args: dict) -> None:
         """
         Args does not do anything in this class, just a wrapper to tell the child classes that that is passed in. 
@@ -16,3 +18,17 @@ class BaseComponent:
         Override in subclasses.
         """
         raise NotImplementedError
+
+    def can_sleep(self) -> bool:
+        """
+        Whether this component has nothing to do until its machine is woken (see Machine.wake).
+        Override in subclasses that can idle.
+        """
+        return False
+
+    def get_wake_tick(self) -> int | None:
+        """
+        Tick this component has to run on even if nothing wakes its machine (e.g. a recipe finishing), or None.
+        Only asked for when the machine is about to sleep.
+        """
+        return None
@@ -1,10 +1,13 @@
 from typing import Literal, TYPE_CHECKING
 from infrastructure.io_registry import io_registry
+from infrastructure.node_store import node_store, NO_ITEM
 import data.configuration as c
 if TYPE_CHECKING:
     from game.machine import Machine
 
 class IONode:
+    __slots__ = ("parent", "direction", "offset", "kind", "id", "abs_pos")
+
     def __init__(self, node_id: str, parent_machine: "Machine", direction: Literal["input", "output"], offset: tuple[float, float]) -> None:
         self.parent = parent_machine
         self.direction = direction
@@ -23,6 +26,8 @@ class IONode:
 
 
 class ItemIONode(IONode):
+    __slots__ = ("item", "quantity", "capacity")
+
     def __init__(self,
                  node_id: str, 
                  parent_machine: "Machine", 
@@ -30,7 +35,7 @@ class ItemIONode(IONode):
                  offset: tuple[float, float], 
                  capacity: int = 10, kind: Literal["fluid", "item"] = "item") -> None:
         super().__init__(node_id, parent_machine, direction, offset)
-        self.item: None | str = None
+        self.item: int | None = None # item id, see data_registry.items
         self.quantity = 0
         self.capacity = capacity
         self.kind = kind
@@ -39,7 +44,57 @@ class ItemIONode(IONode):
     def can_output(self):
         return self.item is not None and self.quantity > 0
 
+    @staticmethod
+    def create(node_id: str,
+               parent_machine: "Machine",
+               direction: Literal['input'] | Literal['output'],
+               offset: tuple[float, float],
+               capacity: int = 10, kind: Literal["fluid", "item"] = "item") -> "ItemIONode":
+        """Creates an ItemIONode, stored in node_store arrays when the store is enabled."""
+        node_class = ArrayItemIONode if node_store.enabled else ItemIONode
+        return node_class(node_id, parent_machine, direction, offset, capacity, kind)
+
+class ArrayItemIONode(ItemIONode):
+    """ItemIONode whose item, quantity and capacity live in one slot of node_store."""
+    __slots__ = ("slot",)
+
+    def __init__(self,
+                 node_id: str,
+                 parent_machine: "Machine",
+                 direction: Literal['input'] | Literal['output'],
+                 offset: tuple[float, float],
+                 capacity: int = 10, kind: Literal["fluid", "item"] = "item") -> None:
+        self.slot = node_store.allocate(capacity)
+        super().__init__(node_id, parent_machine, direction, offset, capacity, kind)
+
+    @property
+    def item(self) -> int | None: # type: ignore[override]
+        item = node_store.items.item(self.slot)
+        return None if item == NO_ITEM else item
+
+    @item.setter
+    def item(self, item: int | None):
+        node_store.items[self.slot] = NO_ITEM if item is None else item
+
+    @property
+    def quantity(self) -> int: # type: ignore[override]
+        return node_store.quantities.item(self.slot)
+
+    @quantity.setter
+    def quantity(self, quantity: int):
+        node_store.quantities[self.slot] = quantity
+
+    @property
+    def capacity(self) -> int: # type: ignore[override]
+        return node_store.capacities.item(self.slot)
+
+    @capacity.setter
+    def capacity(self, capacity: int):
+        node_store.capacities[self.slot] = capacity
+
 class EnergyIONode(IONode):
+    __slots__ = ()
+
     def __init__(self, 
                  node_id: str,
                  parent_machine: "Machine", 
@@ -10,4 +10,46 @@ BASE_MACHINE_HEIGHT = 24
 BASE_MACHINE_SIZE = (BASE_MACHINE_WIDTH, BASE_MACHINE_HEIGHT)
 
 SIMULATION_TICKS_PER_SECOND = 60
-NODE_HOVER_DIST = 10
\ No newline at end of file
+MAX_TICKS_PER_FRAME = 5 # most catch-up ticks run in one frame before the backlog is dropped
+NODE_HOVER_DIST = 10
+
+# Renderer culling: cell size of the drawable bounds index, and how far IO node / link end circles reach past a
+# machine's tiles or a link's ends
+DRAWABLE_CELL_SIZE = (BASE_MACHINE_WIDTH * 8, BASE_MACHINE_HEIGHT * 8)
+DRAWABLE_MARGIN = 8
+
+# Camera zoom steps for the mouse wheel, and the zoom at or below which the renderer switches to far level of detail:
+# solid machine footprints, no IO node circles and plain, merged link lines
+ZOOM_LEVELS = (0.125, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0)
+FAR_LOD_ZOOM = 0.5
+
+# Draw the static parts of the world (see Renderer.draw_static) into cached chunk surfaces of RENDER_CHUNK_SIZE world
+# pixels, redrawn only when an entity touching the chunk is added or removed or the zoom changes. Cached chunks not on
+# screen are dropped, least recently seen first, once all cached chunks hold more than RENDER_CHUNK_CACHE_PIXELS pixels
+CHUNKED_RENDERING = True
+RENDER_CHUNK_SIZE = (BASE_MACHINE_WIDTH * 32, BASE_MACHINE_HEIGHT * 32)
+RENDER_CHUNK_CACHE_PIXELS = DISPLAY_WIDTH * DISPLAY_HEIGHT * 8
+
+# "batched": each grid hands out power to all its consumers in one settlement pass per tick (PowerGrid.settle)
+# "immediate": each PowerConsumer draws from its grid when it ticks, first come first served
+POWER_SETTLEMENT_MODE = "batched"
+
+# Run the simulation on its own thread (SimulationWorker). The renderer and UI then read WorldSnapshots and tool
+# actions go through the command queue. Off by default: ticks and frames share one thread, in turns.
+THREADED_SIMULATION = False
+
+# Only draw and update the parts of the screen that changed since the last frame (see systems.dirty_regions), the
+# whole screen is still redrawn when the camera moves. Frames with nothing to draw wait so the game loop runs at
+# most DIRTY_RECT_IDLE_FPS times a second while idle. Off by default: every frame redraws the whole screen.
+DIRTY_RECT_RENDERING = False
+DIRTY_RECT_IDLE_FPS = 60
+
+# How ItemIONode contents are stored (see infrastructure.node_store)
+# "objects": plain attributes on each node
+# "numpy": contiguous NumPy arrays shared by all nodes, so bulk node operations are vectorized. Needs numpy installed.
+NODE_STORE = "objects"
+
+# Tick machines running the same recipe on the same machine type as one NumPy batch (systems.recipe_batch).
+# Needs NODE_STORE = "numpy". Groups smaller than RECIPE_BATCH_MIN_GROUP tick per machine as usual.
+BATCH_RECIPES = False
+RECIPE_BATCH_MIN_GROUP = 16
@@ -1,5 +1,6 @@
 from sys import exit
 from os import listdir
+from datetime import datetime
 
 import pygame as pg
 
@@ -12,46 +13,16 @@ from infrastructure.tool_manager import tool_manager
 from infrastructure.asset_manager import asset_manager
 from infrastructure.global_inventory import global_inventory
 from game.machine import Machine
-from game.power_cable import PowerCable
-from game.transfer_link import TransferLink
 from game.resource_node import ResourceNode
 from logger import logger
 from systems.camera import Camera
+from systems.dirty_regions import DirtyRegions
 from systems.renderer import Renderer
 from systems.simulation import Simulation
+from systems.simulation_worker import SimulationWorker
+from systems.world_view import LiveWorldView, WorldView
 from ui.ui import UIManager
 
-def optimization_test(num_setups: int):
-    for i in range(num_setups):
-        m = Machine("rock_crusher", (i * 4 * c.BASE_MACHINE_WIDTH, 0))
-        m.components["RecipeRunner"].selected_recipe = data_registry.get_compatible_recipes(m.components["RecipeRunner"].capabilities)[0]
-        entity_manager.add_entity(m)
-        
-        input_node = m.get_item_node("in_main")
-        if input_node:
-            input_node.item = "item.stone"
-            input_node.quantity += 500
-    
-        st = Machine("basic_steam_turbine", (i*4*c.BASE_MACHINE_WIDTH, -4*c.BASE_MACHINE_HEIGHT))
-        entity_manager.add_entity(st)
-        input_node = st.get_item_node("steam_in")
-        if input_node:
-            input_node.item = "fluid.steam_low_pressure"
-            input_node.quantity += 1000000
-    
-        im = Machine("importer", (i*4*c.BASE_MACHINE_HEIGHT, 6*c.BASE_MACHINE_HEIGHT))
-        entity_manager.add_entity(im)
-        
-        # cables
-        node1 = m.get_item_node("out_main")
-        node2 = im.get_item_nodes('input')[0]
-        if node1 and node2:
-            entity_manager.add_entity(TransferLink(node1.abs_pos, node2.abs_pos, "basic_conveyor"))
-        node1 = st.get_energy_nodes()[0]
-        node2 = m.get_energy_nodes()[0]
-        if node1 and node2:
-            entity_manager.add_entity(PowerCable(node1.abs_pos, node2.abs_pos, "basic_cable"))
-
 def load_assets():
     for file in listdir(r"assets\graphics\resource_nodes"):
         name = file[:-4]
@@ -68,7 +39,8 @@ def load_assets():
     asset_manager.add_asset("machines", "basic_mining_drill", asset)
 
 class Game:
-    def __init__(self, display_surface: pg.Surface) -> None:
+    def __init__(self, display_surface: pg.Surface, threaded_simulation: bool = c.THREADED_SIMULATION,
+                 dirty_rects: bool = c.DIRTY_RECT_RENDERING) -> None:
         # variables
         self.running = True
         
@@ -81,13 +53,19 @@ class Game:
         self.camera.move(-400, -200)
         input_manager.camera = self.camera
         self.simulation_manager = Simulation()
-        self.renderer = Renderer()
+        self.renderer = Renderer(self.simulation_manager.profiler)
         self.renderer.generate_background_grid_surface()
         self.ui_manager = UIManager()
+        self.dirty_regions = DirtyRegions(display_surface.get_size()) if dirty_rects else None
+        # framerate limit clock.tick applies to the next frame, 0 for none
+        self.frame_limit = 0
         
         # hookup input events
         event_bus.connect("quit", lambda: setattr(self, "running", False))
         event_bus.connect("key_down", self.debug_keys)
+        event_bus.connect("mouse_wheel", self.camera.step_zoom)
+        if self.dirty_regions:
+            event_bus.connect("window_exposed", self.dirty_regions.invalidate)
         
         # fps time for debug
         self.fps_update_time = 0.0
@@ -100,21 +78,39 @@ class Game:
         # entity_manager.add_entity(Machine("rock_crusher", (3*c.BASE_MACHINE_WIDTH, 0)))
         entity_manager.add_entity(Machine("basic_mining_drill", (0, 0), context={"entity_manager":entity_manager}))
         for machine in data_registry.machines.keys():
-            global_inventory.add_item(machine, 2)
+            global_inventory.add_item(data_registry.items.get_id(machine), 2)
+
+        # started last so the worker's first snapshot includes the entities above
+        self.simulation_worker: SimulationWorker | None = None
+        self.live_world = LiveWorldView()
+        if threaded_simulation:
+            self.simulation_worker = SimulationWorker(self.simulation_manager)
+            self.simulation_worker.start()
+
+    def get_world_view(self) -> WorldView:
+        if self.simulation_worker:
+            self.simulation_worker.inspected = self.ui_manager.inspected_machines()
+            return self.simulation_worker.latest_snapshot()
+        return self.live_world
 
 
     def run(self) -> None:
         while self.running:
-            dt = self.clock.tick() / 1000 # clock.tick returns milliseconds as integer so we convert to seconds since last frame by / 1000
-            self.display_surface.fill((0, 0, 0))
+            dt = self.clock.tick(self.frame_limit) / 1000 # clock.tick returns milliseconds as integer so we convert to seconds since last frame by / 1000
 
-            input_manager.handle_input(self.ui_manager)
-            self.simulation_manager.update(dt)
+            # input reads the world this frame shows too, see InputManager.world
+            world = self.get_world_view()
+            input_manager.handle_input(self.ui_manager, world)
+            if not self.simulation_worker:
+                self.simulation_manager.update(dt)
             self.camera.update(dt)
-            self.renderer.render(self.display_surface, input_manager.last_mouse_pos, self.camera)
-            self.ui_manager.draw(self.display_surface)
-            
-            pg.display.update()
+            if self.dirty_regions:
+                self.draw_changes(world)
+            else:
+                self.display_surface.fill((0, 0, 0))
+                self.renderer.render(self.display_surface, input_manager.last_mouse_pos, self.camera, world)
+                self.ui_manager.draw(self.display_surface, world)
+                pg.display.update()
 
             self.fps_history.append(self.clock.get_fps())
             if len(self.fps_history) > 1000: # 1000 frames stored
@@ -127,14 +123,48 @@ class Game:
             else:
                 tps, target_tps = self.simulation_manager.tps
                 pg.display.set_caption(
-                    f"EX NIHILO | FPS: {avg_fps:.1f} | TPS: {tps}/{target_tps}"
+                    f"EX NIHILO | FPS: {avg_fps:.1f} | TPS: {tps}/{target_tps} | "
+                    f"Sim speed: {self.simulation_manager.time_dilation:.0%}"
                 )
                 self.fps_update_time = 0.0
 
+        if self.simulation_worker:
+            self.simulation_worker.stop()
         pg.quit()
         exit()
     
+    def draw_changes(self, world: WorldView):
+        """Dirty rectangle drawing: redraws and updates only what changed since the last frame, see DirtyRegions."""
+        assert self.dirty_regions
+        self.renderer.mark_regions(self.dirty_regions, self.display_surface, input_manager.last_mouse_pos, self.camera, world)
+        self.ui_manager.mark_regions(self.dirty_regions, world)
+        rects = self.dirty_regions.end_frame((tuple(self.camera.position), self.camera.zoom, world.entities_version))
+
+        # nothing to draw, wait out the frame instead of spinning
+        self.frame_limit = c.DIRTY_RECT_IDLE_FPS if rects == [] else 0
+        if rects == []:
+            return
+        if rects is None:
+            self.display_surface.fill((0, 0, 0))
+            self.renderer.render(self.display_surface, input_manager.last_mouse_pos, self.camera, world)
+            self.ui_manager.draw(self.display_surface, world)
+            pg.display.update()
+            return
+
+        # each rect is drawn on its own with just what touches it, a union of far apart rects would cover most of
+        # the screen
+        for rect in rects:
+            self.display_surface.set_clip(rect)
+            self.renderer.render(self.display_surface, input_manager.last_mouse_pos, self.camera, world, rect)
+            self.ui_manager.draw(self.display_surface, world, rect)
+        self.display_surface.set_clip(None)
+        pg.display.update(rects)
+    
     def debug_keys(self, key):
+        if key == pg.K_F3:
+            self.simulation_manager.profiler.toggle()
+        if key == pg.K_F4:
+            self.simulation_manager.profiler.dump(f"profile_{datetime.now():%Y%m%d_%H%M%S}.json")
         if key == pg.K_r:
             tools = list(tool_manager.tools.values())
             if tool_manager.current_tool:
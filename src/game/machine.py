@@ -1,7 +1,7 @@
 from json import load
 from typing import Any, Optional, Literal, TYPE_CHECKING
 if TYPE_CHECKING:
-    from game.power_cable import PowerGrid
+    from game.power_grid import PowerGrid
 
 import data.configuration as c
 from components.ionode import ItemIONode, EnergyIONode
@@ -12,6 +12,8 @@ from components.MiningDrill import MiningDrill
 from components.ImporterComponent import ImporterComponent
 from game.simulation_entity import SimulationEntity
 from infrastructure.data_registry import data_registry
+from infrastructure.machine_scheduler import machine_scheduler
+from infrastructure.node_store import node_store
 
 components_dict = {
     "RecipeRunner": RecipeRunner, "PowerConsumer": PowerConsumer, "PowerProducer": PowerProducer,
@@ -19,6 +21,12 @@ components_dict = {
 }
 
 class Machine(SimulationEntity):
+    __slots__ = (
+        "machine_id", "shape", "center_tile", "context", "power_grid", "nodes", "components",
+        "_condition_components", "_power_consumer", "_conditions_tick", "_conditions_met",
+        "_item_nodes", "_energy_nodes", "_item_nodes_by_id", "_energy_nodes_by_id",
+    )
+
     def __init__(self, machine_id: str, position: tuple[int, int], rotation: int = 0, context: dict[str, Any] = {}) -> None:
         self.machine_id = machine_id
         json = data_registry.machines[self.machine_id]
@@ -40,7 +48,7 @@ class Machine(SimulationEntity):
             node = None
             if node_data["type"] in ["item", "fluid"]:
                 default_cap = 10 if node_data["type"] == "item" else 1000
-                node = ItemIONode(
+                node = ItemIONode.create(
                                     node_id=node_data["id"], 
                                     parent_machine=self, 
                                     direction=node_data["direction"], 
@@ -55,6 +63,22 @@ class Machine(SimulationEntity):
             assert isinstance(node, ItemIONode | EnergyIONode)
             self.nodes.add(node)
 
+        # Node tables for the getters below, nodes never change after construction. Built in self.nodes order so
+        # lookups return what scanning the set used to
+        item_nodes = tuple(node for node in self.nodes if isinstance(node, ItemIONode))
+        self._item_nodes: dict[str, tuple[ItemIONode, ...]] = {
+            "Any": item_nodes,
+            "input": tuple(node for node in item_nodes if node.direction == "input"),
+            "output": tuple(node for node in item_nodes if node.direction == "output"),
+        }
+        self._energy_nodes = tuple(node for node in self.nodes if isinstance(node, EnergyIONode))
+        self._item_nodes_by_id: dict[str, ItemIONode] = {}
+        for node in item_nodes:
+            self._item_nodes_by_id.setdefault(node.id, node)
+        self._energy_nodes_by_id: dict[str, EnergyIONode] = {}
+        for node in self._energy_nodes:
+            self._energy_nodes_by_id.setdefault(node.id, node)
+
         # Assign machine components
         self.components: dict[str, Any] = {}
         for component_name, args in json["components"].items():
@@ -66,14 +90,58 @@ class Machine(SimulationEntity):
 
             self.components[component_name] = comp(self, args)
 
+        # components with a run condition, apart from the PowerConsumer (checked separately, see can_run)
+        self._condition_components = tuple(
+            component for component in self.components.values()
+            if hasattr(component, "evaluate_condition") and not isinstance(component, PowerConsumer)
+        )
+        self._power_consumer: PowerConsumer | None = self.components.get("PowerConsumer")
+        # tick the cached _conditions_met was evaluated on, -1 when stale. See invalidate_conditions
+        self._conditions_tick = -1
+        self._conditions_met = False
+
     def tick(self):
         for component in self.components.values():
             component.tick()
         
-        # set node items to None if they have quantity 0
-        for node in self.get_item_nodes():
-            if node.quantity == 0:
-                node.item = None
+        # set node items to None if they have quantity 0. The node store does this for every node at once, see
+        # Simulation._clear_empty_nodes
+        if not node_store.enabled:
+            for node in self.get_item_nodes():
+                if node.quantity == 0 and node.item is not None:
+                    node.item = None
+                    self.invalidate_conditions()
+
+        if self.can_sleep():
+            machine_scheduler.sleep(self, self.get_wake_tick())
+
+    def can_sleep(self) -> bool:
+        """True when no component has anything to do until something calls wake()."""
+        for component in self.components.values():
+            if not component.can_sleep():
+                return False
+        return True
+
+    def get_wake_tick(self) -> int | None:
+        """Earliest tick a component needs to run on while the machine sleeps. None to sleep until woken."""
+        wake_tick = None
+        for component in self.components.values():
+            tick = component.get_wake_tick()
+            if tick is not None and (wake_tick is None or tick < wake_tick):
+                wake_tick = tick
+        return wake_tick
+
+    def wake(self):
+        """Puts a sleeping machine back in the simulation. Call whenever something this machine depends on changes."""
+        self.invalidate_conditions()
+        machine_scheduler.wake(self)
+
+    def invalidate_conditions(self):
+        """
+        Drops the can_run result cached for this tick. Call when node contents, a producer buffer or the recipe change
+        during a tick; wake() already does. Power is not cached so has_power changes need no call.
+        """
+        self._conditions_tick = -1
 
     def can_run(self, power: bool = True) -> bool:
         """Checks all machine components to aggregate if that machine can run at this point.
@@ -84,36 +152,30 @@ class Machine(SimulationEntity):
         Returns:
             bool: If the machine can run.
         """
-        for component in self.components.values():
-            if not power and isinstance(component, PowerConsumer):
-                continue
-            
-            if hasattr(component, "evaluate_condition"):
-                if not component.evaluate_condition():
-                    return False
+        # Grid settlement, the RecipeRunner and the PowerConsumer all ask in one tick, so everything apart from power
+        # is evaluated once per tick until invalidate_conditions
+        tick = machine_scheduler.tick
+        if self._conditions_tick != tick:
+            self._conditions_met = all(component.evaluate_condition() for component in self._condition_components)
+            self._conditions_tick = tick
+        if not self._conditions_met:
+            return False
 
+        if power and self._power_consumer:
+            return self._power_consumer.evaluate_condition()
         return True
 
     def get_component(self, component_name: str):
         return self.components.get(component_name)
 
     # getters for specific IONode classes
-    def get_item_nodes(self, direction_filter: Literal["Any", "input", "output"] = "Any") -> list[ItemIONode]:
-        if direction_filter == "Any":
-            return [node for node in self.nodes if isinstance(node, ItemIONode)]
-        else:
-            return [node for node in self.nodes if isinstance(node, ItemIONode) and node.direction == direction_filter]
+    def get_item_nodes(self, direction_filter: Literal["Any", "input", "output"] = "Any") -> tuple[ItemIONode, ...]:
+        return self._item_nodes[direction_filter]
     
-    def get_energy_nodes(self) -> list[EnergyIONode]:
-        return [node for node in self.nodes if isinstance(node, EnergyIONode)]
+    def get_energy_nodes(self) -> tuple[EnergyIONode, ...]:
+        return self._energy_nodes
     # Getters for nodes by ID and type
     def get_item_node(self, id: str) -> Optional[ItemIONode]:
-        for node in self.nodes:
-            if isinstance(node, ItemIONode) and node.id == id:
-                return node
-        return None
+        return self._item_nodes_by_id.get(id)
     def get_energy_node(self, id: str) -> Optional[EnergyIONode]:
-        for node in self.nodes:
-            if isinstance(node, EnergyIONode) and node.id == id:
-                return node
-        return None
\ No newline at end of file
+        return self._energy_nodes_by_id.get(id)
@@ -0,0 +1,129 @@
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from game.machine import Machine
+    from components.PowerConsumer import PowerConsumer
+    from components.PowerProducer import PowerProducer
+
+
+class PowerGrid:
+    def __init__(self, voltage: Literal["LV", "MV", "HV", "EHV", "UHV"]) -> None:
+        """
+        System to handle power distribution. All connections must be of same voltage.
+        """
+        self.voltage = voltage
+        self.connections: set["Machine"] = set()
+        # Components split out by role when machines join, so ticking and drawing never look them up again
+        self.producers: dict["PowerProducer", None] = {}
+        self.consumers: dict["PowerConsumer", None] = {}
+        self._consumers_by_priority: list["PowerConsumer"] | None = None
+        self.available_wattage = 0
+        # set once settle() has handed out power for the current tick, so consumers do not draw again
+        self.settled = False
+
+        self.ticks_since_online = 0
+    
+    def tick(self):
+        self.settled = False
+        self.available_wattage = 0
+        for producer in self.producers:
+            self.available_wattage += producer.current_buffer
+            
+        if 0 < self.available_wattage < 25:
+            self.ticks_since_online += 0
+        else:
+            self.ticks_since_online = 0
+    
+    def draw_power(self, watts: int) -> bool:
+        if self.available_wattage >= watts:
+            self.available_wattage -= watts
+            self._drain_producers(watts)
+            return True
+        return False
+
+    def settle(self):
+        """
+        Hands out power to every consumer on the grid in a single pass, instead of each consumer drawing when it
+        happens to tick. Demand is gathered from all consumers first, then granted by priority (higher first, ties
+        in the order consumers joined the grid). A consumer is either fully powered or not at all; one that does
+        not fit in what is left is skipped so smaller consumers after it can still run. Producers are drained once
+        for the granted total. The result does not depend on tick or set iteration order.
+        """
+        remaining = self.available_wattage
+        for consumer in self.get_consumers_by_priority():
+            demand = consumer.get_power_demand()
+            if demand <= remaining:
+                if not consumer.has_power:
+                    consumer.has_power = True
+                    consumer.parent.wake()
+                remaining -= demand
+            else:
+                consumer.has_power = False
+
+        self._drain_producers(self.available_wattage - remaining)
+        self.available_wattage = remaining
+        self.settled = True
+
+    def get_consumers_by_priority(self) -> list["PowerConsumer"]:
+        if self._consumers_by_priority is None:
+            # sorted() is stable, so equal priorities keep join order
+            self._consumers_by_priority = sorted(self.consumers, key=lambda consumer: -consumer.priority)
+        return self._consumers_by_priority
+
+    def _drain_producers(self, watts: int):
+        to_remove = watts
+        for producer in self.producers:
+            if to_remove <= 0:
+                break
+            remove = min(to_remove, producer.current_buffer)
+            if remove:
+                producer.current_buffer -= remove
+                to_remove -= remove
+                producer.parent.wake()
+    
+    def add_machine(self, machine: "Machine"):
+        self.connections.add(machine)
+        machine.power_grid = self
+        machine.wake()
+
+        producer = machine.get_component("PowerProducer")
+        if producer and producer not in self.producers:
+            self.producers[producer] = None
+            # keep the running total valid until the next tick recomputes it
+            self.available_wattage += producer.current_buffer
+        consumer = machine.get_component("PowerConsumer")
+        if consumer and consumer not in self.consumers:
+            self.consumers[consumer] = None
+            self._consumers_by_priority = None
+
+    def remove_machine(self, machine: "Machine"):
+        """Takes a removed machine off the grid. Power it already added to available_wattage is dropped next tick."""
+        self.connections.discard(machine)
+        if machine.power_grid is self:
+            machine.power_grid = None
+        producer = machine.get_component("PowerProducer")
+        if producer:
+            self.producers.pop(producer, None)
+        consumer = machine.get_component("PowerConsumer")
+        if consumer in self.consumers:
+            del self.consumers[consumer]
+            self._consumers_by_priority = None
+
+    def merge(self, other: "PowerGrid"):
+        """Moves every machine from other onto this grid. other should be discarded afterwards."""
+        for machine in other.connections:
+            self.add_machine(machine)
+        other.connections.clear()
+        other.producers.clear()
+        other.consumers.clear()
+        other._consumers_by_priority = None
+
+    def disconnect_all(self):
+        for machine in self.connections:
+            if machine.power_grid is self:
+                machine.power_grid = None
+        self.connections.clear()
+        self.producers.clear()
+        self.consumers.clear()
+        self._consumers_by_priority = None
+        self.available_wattage = 0
@@ -6,6 +6,8 @@ from logger import logger
 from random import random
 
 class ResourceNode(SimulationEntity):
+    __slots__ = ("pos", "size", "type", "drop_table")
+
     def __init__(self, pos, node_id: str) -> None:
         super().__init__("Resource Node", pos[0], pos[1], False)
         json = data_registry.resource_nodes[node_id]
@@ -0,0 +1,147 @@
+from typing import Callable
+
+import data.configuration as c
+from infrastructure.data_registry import data_registry
+from infrastructure.entity_manager import entity_manager
+from game.machine import Machine
+from game.power_cable import PowerCable
+from game.transfer_link import TransferLink
+
+# World builders used by the game for debugging and by the headless runner. Every scenario takes a size argument
+# and only talks to entity_manager, so it can be built with no display, assets or input.
+
+def _fill_node(machine: Machine, node_id: str, item: str, quantity: int):
+    node = machine.get_item_node(node_id)
+    if node:
+        node.item = data_registry.items.get_id(item)
+        node.quantity += quantity
+
+def _add_crusher(position: tuple[int, int], stone: int) -> Machine:
+    crusher = Machine("rock_crusher", position)
+    crusher.components["RecipeRunner"].selected_recipe = data_registry.recipes["crush_stone"]
+    entity_manager.add_entity(crusher)
+    _fill_node(crusher, "in_main", "item.stone", stone)
+    return crusher
+
+def _add_turbine(position: tuple[int, int]) -> Machine:
+    turbine = Machine("basic_steam_turbine", position)
+    entity_manager.add_entity(turbine)
+    _fill_node(turbine, "steam_in", "fluid.steam_low_pressure", 1000000)
+    return turbine
+
+def _add_link_chain(points: list[tuple[int, int]], link_id: str):
+    link_type = TransferLink if data_registry.transfer_links[link_id]["type"] != "power" else PowerCable
+    for start, end in zip(points, points[1:]):
+        entity_manager.add_entity(link_type(start, end, link_id))
+
+def optimization_test(num_setups: int, origin: tuple[int, int] = (0, 0)):
+    ox, oy = origin
+    for i in range(num_setups):
+        m = Machine("rock_crusher", (ox + i * 4 * c.BASE_MACHINE_WIDTH, oy))
+        m.components["RecipeRunner"].selected_recipe = data_registry.get_compatible_recipes(m.components["RecipeRunner"].capabilities)[0]
+        entity_manager.add_entity(m)
+        
+        input_node = m.get_item_node("in_main")
+        if input_node:
+            input_node.item = data_registry.items.get_id("item.stone")
+            input_node.quantity += 500
+    
+        st = Machine("basic_steam_turbine", (ox + i*4*c.BASE_MACHINE_WIDTH, oy - 4*c.BASE_MACHINE_HEIGHT))
+        entity_manager.add_entity(st)
+        input_node = st.get_item_node("steam_in")
+        if input_node:
+            input_node.item = data_registry.items.get_id("fluid.steam_low_pressure")
+            input_node.quantity += 1000000
+    
+        im = Machine("importer", (ox + i*4*c.BASE_MACHINE_HEIGHT, oy + 6*c.BASE_MACHINE_HEIGHT))
+        entity_manager.add_entity(im)
+        
+        # cables
+        node1 = m.get_item_node("out_main")
+        node2 = im.get_item_nodes('input')[0]
+        if node1 and node2:
+            entity_manager.add_entity(TransferLink(node1.abs_pos, node2.abs_pos, "basic_conveyor"))
+        node1 = st.get_energy_nodes()[0]
+        node2 = m.get_energy_nodes()[0]
+        if node1 and node2:
+            entity_manager.add_entity(PowerCable(node1.abs_pos, node2.abs_pos, "basic_cable"))
+
+def conveyor_heavy(num_chains: int, origin: tuple[int, int] = (0, 0)):
+    """Each crusher feeds an 8 segment conveyor that branches into two importers. One turbine powers 10 crushers."""
+    ox, oy = origin
+    w, h = c.BASE_MACHINE_WIDTH, c.BASE_MACHINE_HEIGHT
+    turbine = None
+    last_power_pos = (0, 0)
+    for i in range(num_chains):
+        x = ox + i * 4 * w
+        crusher = _add_crusher((x, oy), 500)
+
+        out_pos = crusher.get_item_node("out_main").abs_pos # type: ignore
+        points = [(out_pos[0], out_pos[1] + k * h) for k in range(8)]
+        _add_link_chain(points, "basic_conveyor")
+        for importer_x in (x, x + 2 * w):
+            importer = Machine("importer", (importer_x, oy + 10 * h))
+            entity_manager.add_entity(importer)
+            _add_link_chain([points[-1], importer.get_item_node("item_in").abs_pos], "basic_conveyor") # type: ignore
+
+        power_pos = crusher.get_energy_nodes()[0].abs_pos
+        if i % 10 == 0:
+            turbine = _add_turbine((x, oy - 4 * h))
+            last_power_pos = turbine.get_energy_nodes()[0].abs_pos
+        _add_link_chain([last_power_pos, power_pos], "basic_cable")
+        last_power_pos = power_pos
+
+def power_heavy(num_consumers: int, origin: tuple[int, int] = (0, 0)):
+    """Crushers hang off one long subdivided cable backbone with a turbine every 5 crushers."""
+    ox, oy = origin
+    w, h = c.BASE_MACHINE_WIDTH, c.BASE_MACHINE_HEIGHT
+    backbone_y = oy - 2 * h
+    previous_tap = None
+    for i in range(num_consumers):
+        x = ox + i * 4 * w
+        crusher = _add_crusher((x, oy), 500)
+        importer = Machine("importer", (x, oy + 4 * h))
+        entity_manager.add_entity(importer)
+        _add_link_chain([crusher.get_item_node("out_main").abs_pos, importer.get_item_node("item_in").abs_pos], "basic_conveyor") # type: ignore
+
+        # drop from the backbone to the crusher's energy node
+        power_pos = crusher.get_energy_nodes()[0].abs_pos
+        tap = (power_pos[0], backbone_y)
+        _add_link_chain([tap, (power_pos[0], backbone_y + h // 2), (power_pos[0], backbone_y + h), power_pos], "basic_cable")
+        # backbone between taps, split into quarter segments
+        if previous_tap:
+            step = (tap[0] - previous_tap[0]) // 4
+            _add_link_chain([(previous_tap[0] + k * step, backbone_y) for k in range(4)] + [tap], "basic_cable")
+        previous_tap = tap
+
+        if i % 5 == 0:
+            turbine = _add_turbine((x, backbone_y - 6 * h))
+            _add_link_chain([turbine.get_energy_nodes()[0].abs_pos, tap], "basic_cable")
+
+def mixed(size: int, origin: tuple[int, int] = (0, 0)):
+    """Half optimization_test setups, a quarter conveyor chains and a quarter power consumers, side by side."""
+    ox, oy = origin
+    optimization_test(size // 2, (ox, oy))
+    conveyor_heavy(size // 4, (ox, oy + 40 * c.BASE_MACHINE_HEIGHT))
+    power_heavy(size // 4, (ox, oy + 80 * c.BASE_MACHINE_HEIGHT))
+
+def idle_heavy(size: int, origin: tuple[int, int] = (0, 0)):
+    """optimization_test layout where only every 10th crusher has stone, so most of the factory sits idle."""
+    ox, oy = origin
+    w, h = c.BASE_MACHINE_WIDTH, c.BASE_MACHINE_HEIGHT
+    for i in range(size):
+        x = ox + i * 4 * w
+        crusher = _add_crusher((x, oy), 500 if i % 10 == 0 else 0)
+        turbine = _add_turbine((x, oy - 4 * h))
+        importer = Machine("importer", (x, oy + 6 * h))
+        entity_manager.add_entity(importer)
+        _add_link_chain([crusher.get_item_node("out_main").abs_pos, importer.get_item_node("item_in").abs_pos], "basic_conveyor") # type: ignore
+        _add_link_chain([turbine.get_energy_nodes()[0].abs_pos, crusher.get_energy_nodes()[0].abs_pos], "basic_cable")
+
+SCENARIOS: dict[str, Callable[[int], None]] = {
+    "optimization_test": optimization_test,
+    "conveyor_heavy": conveyor_heavy,
+    "power_heavy": power_heavy,
+    "mixed": mixed,
+    "idle_heavy": idle_heavy,
+}
@@ -1,6 +1,10 @@
 import pygame as pg
 
 class SimulationEntity:
+    # Entities, their nodes and components are slotted: no per-instance __dict__ across tens of thousands of them
+    # and faster attribute access in tick. Subclasses list their own attributes in __slots__ too
+    __slots__ = ("name", "x", "y", "position", "enabled")
+
     def __init__(self, name: str, x: int, y: int, enabled: bool = True):
         """
         Initialize an Entity with given position, size, and name.
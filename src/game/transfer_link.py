@@ -1,90 +1,76 @@
+from itertools import count
 from json import load
-from typing import Literal, Optional
+from typing import Literal
 
-from components.ionode import ItemIONode
 from infrastructure.io_registry import io_registry
 from infrastructure.transfer_registry import transfer_registry
 from game.simulation_entity import SimulationEntity
 from infrastructure.data_registry import data_registry
 
 class TransferLink(SimulationEntity):
-    NOT_USED = 0
-    USED_BY_OTHER_LINK = 1
-    USED_BY_SELF = 2    
+    __slots__ = (
+        "end_pos", "start_pos", "link_id", "creation_index", "round_robin_index", "type",
+        "transfer_quantity", "transfer_ticks", "_ticks", "next_transfer_tick", "last_transfer_tick",
+        "upstream", "downstream",
+    )
+    # ticks_since_transfer stops counting here, links that have been idle this long all look the same
+    IDLE_TICKS = 25
+    _created = count()
+
     def __init__(self, start_pos: tuple[int, int], end_pos: tuple[int, int], link_id: str):
         super().__init__("TransferLink", start_pos[0], start_pos[1], True)
         self.end_pos = end_pos
         self.start_pos = start_pos
         self.link_id = link_id
+        # links due on the same tick transfer in creation order
+        self.creation_index = next(TransferLink._created)
         
         json = data_registry.transfer_links[self.link_id]
         
-        self.used_this_tick = TransferLink.NOT_USED
-        self.round_robin_index = 0 # used to sort out which input node that overlaps our output node gets the item
+        self.round_robin_index = 0 # index into downstream of the next link to try, so branches take turns receiving items
 
         self.type: Literal['item', 'fluid'] = json["type"]
         self.transfer_quantity: int = json["transfer_quantity"] # units per transfer_time
         self.transfer_ticks: int = json["transfer_ticks"] # ticks to complete a transfer
-        self._ticks = 0 # counter to complete transfer_time
-        self.ticks_since_transfer = 25
+        # Only chain heads transfer, on a timer (see start_timer). _ticks holds how far towards the next transfer
+        # a link had got while it is not a head
+        self._ticks = 0
+        self.next_transfer_tick: int | None = None
+        self.last_transfer_tick: int | None = None
         
         self.upstream: list[TransferLink] = []
         self.downstream: list[TransferLink] = []
         
         transfer_registry.register(self)
-    
-    def find_valid_target(self, item, visited=None) -> tuple[Optional[ItemIONode], list["TransferLink"]]:
-        if visited is None:
-            visited = set()
-        if self in visited:
-            return None, []
-        
-        visited.add(self)
 
-        # Check if our end_pos is a valid IONode
-        node = io_registry.get_item_node(self.end_pos)
-        if node and (node.item == item or node.item is None):
-            return node, [self]
+    @property
+    def ticks_since_transfer(self) -> int:
+        if self.last_transfer_tick is None:
+            return TransferLink.IDLE_TICKS
+        return min(transfer_registry.timers.now - self.last_transfer_tick, TransferLink.IDLE_TICKS)
 
-        # Try downstream links in round robin order
-        downstream_len = len(self.downstream)
-        if downstream_len == 0:
-            return None, []
+    def start_timer(self):
+        """Called by transfer_registry when this link becomes the head of a chain."""
+        self.next_transfer_tick = transfer_registry.timers.now + self.transfer_ticks - self._ticks
+        transfer_registry.timers.schedule(self.next_transfer_tick, self)
 
-        start_index = self.round_robin_index
-        for i in range(downstream_len):
-            index = (start_index + i) % downstream_len
-            link = self.downstream[index]
-            if link in visited:
-                continue
-            target, path = link.find_valid_target(item, visited)
-            if target:
-                # Update round robin index *once a valid path is found*
-                self.round_robin_index = (index + 1) % downstream_len
-                return target, [self] + path
-
-        return None, []
+    def stop_timer(self):
+        """Called by transfer_registry when this link stops being the head of a chain (it gained an upstream link)."""
+        if self.next_transfer_tick is not None:
+            self._ticks = self.transfer_ticks - (self.next_transfer_tick - transfer_registry.timers.now)
+            self.next_transfer_tick = None
     
     def tick(self):
-        # dont do anything if we have handled this chain this tick OR we have an upstream link
-        # only run on conveyors that start a chain
-        if self.ticks_since_transfer < 25:
-            self.ticks_since_transfer += 1
-        if self.used_this_tick == TransferLink.USED_BY_SELF:
-            self.used_this_tick = TransferLink.NOT_USED
-        
-        if self.upstream:
-            return
-
-        self._ticks += 1
+        # Only called for chain heads when their transfer timer is due (transfer_registry.get_due_links).
+        # Links further down a chain are moved along by their head
+        if self.next_transfer_tick != transfer_registry.timers.now:
+            return # stale timer from before the chain changed
 
-        if self._ticks < self.transfer_ticks:
-            return
-        
-        self._ticks -= self.transfer_ticks
+        self._ticks = 0
+        self.start_timer()
         # get node from our start
         start_node = io_registry.get_item_node(self.start_pos)
-        if not start_node or not start_node.item:
+        if not start_node or start_node.item is None:
             return
         
         to_remove = min(start_node.quantity, self.transfer_quantity)
@@ -92,7 +78,7 @@ class TransferLink(SimulationEntity):
             return
         
         # attempt to find path
-        target, vis = self.find_valid_target(start_node.item)
+        target, vis = transfer_registry.find_target(self, start_node.item)
         if target and vis:
             accepted = min(target.capacity - target.quantity, to_remove)
             
@@ -104,9 +90,9 @@ class TransferLink(SimulationEntity):
                 
                 if start_node.quantity <= 0:
                     start_node.item = None
+                target.parent.wake()
+                start_node.parent.wake()
                 
+                now = transfer_registry.timers.now
                 for link in vis:
-                    link.used_this_tick = TransferLink.USED_BY_OTHER_LINK
-                    link.ticks_since_transfer = 0
-                self.used_this_tick = TransferLink.USED_BY_SELF
-                self.ticks_since_transfer = 0
\ No newline at end of file
+                    link.last_transfer_tick = now
\ No newline at end of file
@@ -0,0 +1,63 @@
+from time import perf_counter
+from typing import Literal
+
+import data.configuration as c
+from infrastructure.entity_manager import entity_manager
+from infrastructure.node_store import node_store
+from game.scenarios import SCENARIOS
+from systems.simulation import Simulation
+from logger import logger
+
+def run_headless(ticks: int, scenario: str, size: int = 100,
+                 power_settlement: Literal["batched", "immediate"] = c.POWER_SETTLEMENT_MODE,
+                 node_store_mode: Literal["objects", "numpy"] = c.NODE_STORE) -> dict:
+    """Builds scenario and steps the simulation as fast as possible with no display, assets or input.
+
+    Args:
+        ticks (int): Number of simulation ticks to run.
+        scenario (str): Key in game.scenarios.SCENARIOS.
+        size (int, optional): Scenario size argument (e.g. number of setups). Defaults to 100.
+        power_settlement (str, optional): Simulation power settlement mode. Defaults to c.POWER_SETTLEMENT_MODE.
+        node_store_mode (str, optional): ItemIONode storage, see c.NODE_STORE. Defaults to c.NODE_STORE.
+
+    Returns:
+        dict: Run summary including achieved ticks per second.
+    """
+    if scenario not in SCENARIOS:
+        raise ValueError(f"Unknown scenario {scenario} (choose from {', '.join(SCENARIOS)})")
+
+    if (node_store_mode == "numpy") != node_store.enabled:
+        node_store.enable(node_store_mode == "numpy")
+
+    start = perf_counter()
+    SCENARIOS[scenario](size)
+    build_seconds = perf_counter() - start
+
+    simulation = Simulation(power_settlement)
+    start = perf_counter()
+    for _ in range(ticks):
+        simulation._tick()
+    run_seconds = perf_counter() - start
+
+    tps = ticks / run_seconds if run_seconds > 0 else float("inf")
+    return {
+        "scenario": scenario,
+        "size": size,
+        "entities": len(entity_manager.entities),
+        "ticks": ticks,
+        "build_seconds": build_seconds,
+        "run_seconds": run_seconds,
+        "tps": tps,
+        "target_tps": c.SIMULATION_TICKS_PER_SECOND,
+        # summed in one pass over the store, only available with the numpy node store
+        "items_in_nodes": node_store.item_totals() if node_store.enabled else None,
+    }
+
+def report(result: dict):
+    logger.info(
+        f"[headless] {result['scenario']} (size {result['size']}, {result['entities']} entities): "
+        f"{result['ticks']} ticks in {result['run_seconds']:.3f}s = {result['tps']:.1f} TPS "
+        f"(target {result['target_tps']}, built in {result['build_seconds']:.3f}s)"
+    )
+    if result["items_in_nodes"] is not None:
+        logger.info(f"[headless] Items held in machine nodes: {result['items_in_nodes']}")
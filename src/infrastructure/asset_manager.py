@@ -10,6 +10,8 @@ class AssetManager:
     def __init__(self) -> None:
         self.assets: dict[str, dict[str, Any]] = {}
         self.missing_texture = pg.transform.scale(pg.image.load(r"assets\graphics\misc\null.png"), (64, 64))
+        # (group, name, zoom) -> asset scaled for that camera zoom, see get_scaled
+        self._scaled: dict[tuple[str, str, float], Any] = {}
     
     def register_group(self, group_name: str):
         self.assets.setdefault(group_name, {})
@@ -17,12 +19,37 @@ class AssetManager:
     def add_asset(self, group: str, name: str, asset):
         self.register_group(group)
         self.assets[group][name] = asset
+        for key in [key for key in self._scaled if key[:2] == (group, name)]:
+            del self._scaled[key]
 
     def get(self, group: str, name: str):
         if group in self.assets and name in self.assets[group]:
             return self.assets[group][name]
         return self.missing_texture
     
+    def get_scaled(self, group: str, name: str, zoom: float):
+        """
+        Like get, with image assets (or every frame of an animation) scaled by zoom. Scaled copies are made once per
+        zoom level and kept, so zooming only pays for scaling the first time a level is shown.
+        """
+        asset = self.get(group, name)
+        if zoom == 1 or asset is self.missing_texture:
+            return asset
+        key = (group, name, zoom)
+        scaled = self._scaled.get(key)
+        if scaled is None:
+            if isinstance(asset, list):
+                scaled = [self._scale_surface(frame, zoom) for frame in asset]
+            else:
+                scaled = self._scale_surface(asset, zoom)
+            self._scaled[key] = scaled
+        return scaled
+
+    @staticmethod
+    def _scale_surface(surface: pg.Surface, zoom: float) -> pg.Surface:
+        width, height = surface.get_size()
+        return pg.transform.smoothscale(surface, (max(1, round(width * zoom)), max(1, round(height * zoom))))
+    
     def load_image(self, path: str, size: tuple[int, int] | None = c.BASE_MACHINE_SIZE) -> pg.Surface:
         start_time = time.perf_counter()
         img = pg.image.load(path).convert_alpha()
@@ -0,0 +1,40 @@
+from queue import Empty, SimpleQueue
+from typing import Callable
+
+from logger import logger
+
+class _CommandQueue:
+    def __init__(self) -> None:
+        """
+        World changes requested by the player (placing machines, links, cables). Commands are applied by whoever owns
+        the simulation, between ticks, so a tick never sees the world change underneath it. Safe to submit from any
+        thread.
+        """
+        self._commands: SimpleQueue[Callable[[], None]] = SimpleQueue()
+
+    def submit(self, command: Callable[[], None]):
+        self._commands.put(command)
+
+    def run_pending(self) -> int:
+        """Runs every queued command in submission order. Returns how many ran."""
+        ran = 0
+        while True:
+            try:
+                command = self._commands.get_nowait()
+            except Empty:
+                return ran
+            try:
+                command()
+            except Exception:
+                # one bad command must not take the simulation down with it
+                logger.exception(f"[CommandQueue] Command {command} failed")
+            ran += 1
+
+    def clear(self):
+        while True:
+            try:
+                self._commands.get_nowait()
+            except Empty:
+                return
+
+command_queue = _CommandQueue()
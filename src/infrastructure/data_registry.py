@@ -18,12 +18,42 @@ class Recipe:
     def __hash__(self):
         return 0
 
+class ItemRegistry:
+    def __init__(self) -> None:
+        """
+        Dense integer ids for item names ("item.stone", "fluid.steam_low_pressure", machine ids in the player's
+        inventory). The simulation only holds ids: node contents, recipe plans and the global inventory. Names are
+        looked up where they reach the player (UI, renderer) or come in from data and scenarios.
+        """
+        self._ids: dict[str, int] = {}
+        self.names: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def register(self, name: str) -> int:
+        item_id = self._ids.get(name)
+        if item_id is None:
+            item_id = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return item_id
+
+    def get_id(self, name: str) -> int:
+        item_id = self._ids.get(name)
+        if item_id is None:
+            raise KeyError(f"Unknown item {name}, items are registered from data when data_registry loads")
+        return item_id
+
+    def get_name(self, item_id: int) -> str:
+        return self.names[item_id]
+
 class _DataRegistry:
     def __init__(self) -> None:
         self.recipes: dict[str, Recipe] = self.load_recipes()
         self.machines: dict[str, dict] = self.load_data("machines")
         self.transfer_links: dict[str, dict] = self.load_data("transfer_links")
         self.resource_nodes: dict[str, dict] = self.load_data("resource_nodes")
+        self.items = self.load_items()
 
     def load_data(self, data_type):
         data = {}
@@ -61,6 +91,20 @@ class _DataRegistry:
                 logger.info(f"Loaded recipe {r.id} data")
         return recipes
     
+    def load_items(self) -> ItemRegistry:
+        """Registers every item named by recipes, resource node drops and placeable machines, in load order."""
+        items = ItemRegistry()
+        for recipe in self.recipes.values():
+            for item in (*recipe.inputs, *recipe.outputs):
+                items.register(item)
+        for resource_node in self.resource_nodes.values():
+            for item in resource_node["drop_table"]:
+                items.register(item)
+        for machine_id in self.machines:
+            items.register(machine_id)
+        logger.info(f"Registered {len(items)} items")
+        return items
+
     def get_compatible_recipes(self, capabilities: list[str]):
         return [r for r in self.recipes.values() if all(c in r.required_capabilities for c in capabilities)]
 
@@ -1,74 +1,279 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Mapping
 if TYPE_CHECKING:
     from game.simulation_entity import SimulationEntity
+from components.ionode import ArrayItemIONode
 from game.machine import Machine
 from game.transfer_link import TransferLink
 from game.resource_node import ResourceNode
 from game.power_cable import PowerCable
+from infrastructure.data_registry import data_registry
+from infrastructure.io_registry import io_registry
+from infrastructure.machine_scheduler import machine_scheduler
+from infrastructure.node_store import node_store
+from infrastructure.spatial_hash import BoundsIndex, SpatialHash, Rect, cells_in_rect, rects_touch
+from infrastructure.utils import get_footprint_cells
 import data.configuration as c
 
 class _EntityManager:
     def __init__(self) -> None:
         self.entities: set[SimulationEntity] = set()
+
+        # Per-type buckets, kept in sync by add_entity/remove_entity so queries never rescan self.entities.
+        # Dicts are used as insertion-ordered sets so iteration order is deterministic.
+        self._machines: dict[Machine, None] = {}
+        self._transfer_links: dict[TransferLink, None] = {}
+        self._power_cables: dict[PowerCable, None] = {}
+        self._resource_nodes: dict[ResourceNode, None] = {}
+        self._tickables: dict["SimulationEntity", None] = {}
+        # tickable entities that are neither machines nor transfer links, which the simulation has no phase for
+        self._other_tickables: dict["SimulationEntity", None] = {}
+        # component name -> machines that have that component
+        self._machines_by_component: dict[str, dict[Machine, None]] = {}
+
+        # Tile-keyed spatial indexes for world-position queries
+        self._machine_grid: SpatialHash[Machine] = SpatialHash(c.BASE_MACHINE_SIZE)
+        self._resource_node_grid: SpatialHash[ResourceNode] = SpatialHash(c.BASE_MACHINE_SIZE)
+        self._machines_by_position: dict[tuple[int, int], Machine] = {}
+        # half-tile cell -> machine whose footprint covers it, used for placement collision
+        self._occupied_cells: dict[tuple[int, int], Machine] = {}
+        # world-space bounds of everything the renderer draws, queried with the camera view for culling
+        self._drawables: BoundsIndex["SimulationEntity"] = BoundsIndex(c.DRAWABLE_CELL_SIZE)
+        # bumped whenever an entity is added or removed, so copies of the drawable index can tell they are stale
+        self.version = 0
+        # render chunk (c.RENDER_CHUNK_SIZE cell) -> bumped whenever an entity whose drawable bounds touch it is added
+        # or removed, so cached chunk surfaces can tell they are stale
+        self._chunk_versions: dict[tuple[int, int], int] = {}
     
     def add_entity(self, entity: "SimulationEntity"):
+        if entity in self.entities:
+            return
         self.entities.add(entity)
 
+        if hasattr(entity, "tick"):
+            self._tickables[entity] = None
+            if not isinstance(entity, (Machine, TransferLink)):
+                self._other_tickables[entity] = None
+
+        if isinstance(entity, Machine):
+            self._machines[entity] = None
+            for component_name in entity.components:
+                self._machines_by_component.setdefault(component_name, {})[entity] = None
+            self._machine_grid.insert(entity, self._machine_tile_rects(entity))
+            self._machines_by_position[entity.position] = entity
+            for cell in get_footprint_cells(entity.position, entity.shape):
+                self._occupied_cells[cell] = entity
+            machine_scheduler.add(entity)
+        elif isinstance(entity, TransferLink):
+            self._transfer_links[entity] = None
+        elif isinstance(entity, PowerCable):
+            self._power_cables[entity] = None
+        elif isinstance(entity, ResourceNode):
+            self._resource_nodes[entity] = None
+            self._resource_node_grid.insert(entity, [self._resource_node_rect(entity)])
+
+        bounds = self._drawable_bounds(entity)
+        if bounds:
+            self._drawables.insert_bounds(entity, bounds)
+            self._bump_chunks(bounds)
+        self.version += 1
+
     def remove_entity(self, entity: "SimulationEntity"):
         self.entities.remove(entity)
+
+        self._tickables.pop(entity, None)
+        self._other_tickables.pop(entity, None)
+        if isinstance(entity, Machine):
+            self._machines.pop(entity, None)
+            for component_name in entity.components:
+                bucket = self._machines_by_component.get(component_name)
+                if bucket is not None:
+                    bucket.pop(entity, None)
+            self._machine_grid.remove(entity)
+            if self._machines_by_position.get(entity.position) is entity:
+                del self._machines_by_position[entity.position]
+            for cell in get_footprint_cells(entity.position, entity.shape):
+                if self._occupied_cells.get(cell) is entity:
+                    del self._occupied_cells[cell]
+            machine_scheduler.remove(entity)
+            # links, cables and hover lookups must not find the removed machine's nodes, their store slots may be
+            # reused by new nodes
+            for node in entity.get_item_nodes() + entity.get_energy_nodes():
+                if io_registry.get_node(node.abs_pos) is node:
+                    io_registry.unregister(node.abs_pos)
+                if isinstance(node, ArrayItemIONode):
+                    node_store.release(node.slot)
+            if entity.power_grid:
+                entity.power_grid.remove_machine(entity)
+        elif isinstance(entity, TransferLink):
+            self._transfer_links.pop(entity, None)
+        elif isinstance(entity, PowerCable):
+            self._power_cables.pop(entity, None)
+        elif isinstance(entity, ResourceNode):
+            self._resource_nodes.pop(entity, None)
+            self._resource_node_grid.remove(entity)
+
+        bounds = self._drawables.get_bounds(entity)
+        self._drawables.remove(entity)
+        if bounds:
+            self._bump_chunks(bounds)
+        self.version += 1
+
+    def _bump_chunks(self, bounds: Rect):
+        for chunk in cells_in_rect(bounds, c.RENDER_CHUNK_SIZE):
+            self._chunk_versions[chunk] = self._chunk_versions.get(chunk, 0) + 1
+
+    @staticmethod
+    def _machine_tile_rects(machine: Machine) -> list[Rect]:
+        return [
+            (machine.position[0] + tile_x * c.BASE_MACHINE_WIDTH, machine.position[1] + tile_y * c.BASE_MACHINE_HEIGHT,
+             c.BASE_MACHINE_WIDTH, c.BASE_MACHINE_HEIGHT)
+            for tile_x, tile_y in machine.shape
+        ]
+
+    @staticmethod
+    def _resource_node_rect(resource_node: ResourceNode) -> Rect:
+        return (resource_node.position[0], resource_node.position[1], resource_node.size[0], resource_node.size[1])
+
+    @classmethod
+    def _drawable_bounds(cls, entity: "SimulationEntity") -> Rect | None:
+        """Rect covering everything the renderer draws for entity, including IO node and link end circles."""
+        margin = c.DRAWABLE_MARGIN
+        if isinstance(entity, Machine):
+            xs, ys = [], []
+            for x, y, w, h in cls._machine_tile_rects(entity):
+                xs += (x, x + w)
+                ys += (y, y + h)
+            for node in entity.nodes:
+                xs += (node.abs_pos[0] - margin, node.abs_pos[0] + margin)
+                ys += (node.abs_pos[1] - margin, node.abs_pos[1] + margin)
+            return (min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+        if isinstance(entity, (TransferLink, PowerCable)):
+            (x0, y0), (x1, y1) = entity.start_pos, entity.end_pos
+            return (min(x0, x1) - margin, min(y0, y1) - margin, abs(x1 - x0) + 2 * margin, abs(y1 - y0) + 2 * margin)
+        if isinstance(entity, ResourceNode):
+            return cls._resource_node_rect(entity)
+        return None
     
+    def clear(self):
+        self.entities.clear()
+        self._machines.clear()
+        self._transfer_links.clear()
+        self._power_cables.clear()
+        self._resource_nodes.clear()
+        self._tickables.clear()
+        self._other_tickables.clear()
+        self._machines_by_component.clear()
+        self._machine_grid.clear()
+        self._resource_node_grid.clear()
+        self._machines_by_position.clear()
+        self._occupied_cells.clear()
+        self._drawables.clear()
+        # bumped rather than cleared, a chunk version going back to 0 could match a stale cached chunk
+        for chunk in self._chunk_versions:
+            self._chunk_versions[chunk] += 1
+        self.version += 1
+        machine_scheduler.clear()
+
     def get_tickable_entities(self):
-        return [e for e in self.entities if hasattr(e, "tick")]
+        return list(self._tickables)
 
-    def get_resource_nodes(self):
-        return [e for e in self.entities if isinstance(e, ResourceNode)]
+    def get_other_tickable_entities(self):
+        return list(self._other_tickables)
 
-    def get_transfer_links(self):
-        return [e for e in self.entities if isinstance(e, TransferLink)]
+    def get_resource_nodes(self) -> list[ResourceNode]:
+        return list(self._resource_nodes)
+
+    def get_transfer_links(self) -> list[TransferLink]:
+        return list(self._transfer_links)
     
-    def get_machines(self):
-        return [e for e in self.entities if isinstance(e, Machine)]
+    def get_machines(self) -> list[Machine]:
+        return list(self._machines)
     
-    def get_power_cables(self):
-        return [e for e in self.entities if isinstance(e, PowerCable)]
+    def get_power_cables(self) -> list[PowerCable]:
+        return list(self._power_cables)
+
+    def get_machines_with_component(self, component: str) -> list[Machine]:
+        return list(self._machines_by_component.get(component, ()))
+
+    def can_place(self, machine_id: str, position: tuple[int, int]) -> bool:
+        """Checks if a machine of type machine_id placed at position would overlap any existing machine footprint."""
+        return self.footprint_free(self._occupied_cells, machine_id, position)
+
+    @staticmethod
+    def footprint_free(occupied_cells: "Mapping[tuple[int, int], Machine]", machine_id: str,
+                       position: tuple[int, int]) -> bool:
+        """can_place against occupied_cells, which may be a copy (see copy_occupied_cells)."""
+        footprint = data_registry.machines[machine_id]["footprint"]
+        for cell in get_footprint_cells(position, footprint):
+            if cell in occupied_cells:
+                return False
+        return True
 
-    def get_machines_with_component(self, component: str):
-        return [e for e in self.get_machines() if e.get_component(component)]
+    def copy_occupied_cells(self) -> dict[tuple[int, int], Machine]:
+        return dict(self._occupied_cells)
 
     def get_machine_at_position(self, position: tuple[int, int]):
-        for machine in self.get_machines():
-            if machine.position == position:
-                return machine
+        return self._machines_by_position.get(position)
         
     def get_machine_under_position(self, position: tuple[int, int]) -> None | Machine:
-        px, py = position
-        for machine in self.get_machines():
-            # quick bounding box check
-            x_min = machine.position[0]
-            y_min = machine.position[1]
-            x_max = x_min + max(tx for tx, _ in machine.shape) * c.BASE_MACHINE_WIDTH + c.BASE_MACHINE_WIDTH
-            y_max = y_min + max(ty for _, ty in machine.shape) * c.BASE_MACHINE_HEIGHT + c.BASE_MACHINE_HEIGHT
-
-            if not (x_min <= px <= x_max and y_min <= py <= y_max):
-                continue  # skip this machine entirely
-
-            # check each tile
-            for tile_x, tile_y in machine.shape:
-                x = machine.position[0] + tile_x * c.BASE_MACHINE_WIDTH
-                y = machine.position[1] + tile_y * c.BASE_MACHINE_HEIGHT
-                if (x <= px <= x + c.BASE_MACHINE_WIDTH) and (y <= py <= y + c.BASE_MACHINE_HEIGHT):
-                    return machine
+        for machine in self._machine_grid.query_point(position):
+            if self.machine_covers(machine, position):
+                return machine
         return None
 
-
     def get_resource_node_under_position(self, position: tuple[int, int]) -> None | ResourceNode:
-        px, py = position
-        for resource_node in self.get_resource_nodes():
-            x = resource_node.position[0]
-            y = resource_node.position[1]
-            
-            if (x <= px <= x + resource_node.size[0]) and (y <= py <= y + resource_node.size[1]):
+        for resource_node in self._resource_node_grid.query_point(position):
+            if self.resource_node_covers(resource_node, position):
                 return resource_node
         return None
 
-entity_manager = _EntityManager()
\ No newline at end of file
+    @staticmethod
+    def machine_covers(machine: Machine, position: tuple[int, int]) -> bool:
+        px, py = position
+        # check each tile
+        for tile_x, tile_y in machine.shape:
+            x = machine.position[0] + tile_x * c.BASE_MACHINE_WIDTH
+            y = machine.position[1] + tile_y * c.BASE_MACHINE_HEIGHT
+            if (x <= px <= x + c.BASE_MACHINE_WIDTH) and (y <= py <= y + c.BASE_MACHINE_HEIGHT):
+                return True
+        return False
+
+    @staticmethod
+    def resource_node_covers(resource_node: ResourceNode, position: tuple[int, int]) -> bool:
+        px, py = position
+        x = resource_node.position[0]
+        y = resource_node.position[1]
+        return (x <= px <= x + resource_node.size[0]) and (y <= py <= y + resource_node.size[1])
+
+    def get_machines_in_rect(self, rect: Rect) -> list[Machine]:
+        """Machines with at least one footprint tile touching rect (x, y, width, height in world space)."""
+        return [
+            machine for machine in self._machine_grid.query_rect(rect)
+            if any(rects_touch(tile_rect, rect) for tile_rect in self._machine_tile_rects(machine))
+        ]
+
+    def get_drawables_in_rect(self, rect: Rect) -> list["SimulationEntity"]:
+        """Entities with anything drawn inside rect (x, y, width, height in world space)."""
+        return self._drawables.query_bounds(rect)
+
+    def count_drawables(self) -> int:
+        return len(self._drawables)
+
+    def copy_drawables(self) -> BoundsIndex["SimulationEntity"]:
+        """Snapshot of the drawable index for readers on another thread, see WorldSnapshot."""
+        return self._drawables.copy()
+
+    def get_chunk_version(self, chunk: tuple[int, int]) -> int:
+        return self._chunk_versions.get(chunk, 0)
+
+    def copy_chunk_versions(self) -> dict[tuple[int, int], int]:
+        return dict(self._chunk_versions)
+
+    def get_resource_nodes_in_rect(self, rect: Rect) -> list[ResourceNode]:
+        """Resource nodes whose area touches rect (x, y, width, height in world space)."""
+        return [
+            resource_node for resource_node in self._resource_node_grid.query_rect(rect)
+            if rects_touch(self._resource_node_rect(resource_node), rect)
+        ]
+
+entity_manager = _EntityManager()
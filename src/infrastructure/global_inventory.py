@@ -1,13 +1,16 @@
 from collections import defaultdict as _defaultdict
 
+from infrastructure.data_registry import data_registry
+
 class GlobalInventory:
     def __init__(self) -> None:
-        self._inventory = _defaultdict(int)
+        # keyed by item id (data_registry.items)
+        self._inventory: _defaultdict[int, int] = _defaultdict(int)
 
-    def add_item(self, item: str, amount: int):
+    def add_item(self, item: int, amount: int):
         self._inventory[item] += amount
         
-    def remove_item(self, item: str, amount: int) -> int:
+    def remove_item(self, item: int, amount: int) -> int:
         """
         Removes amount of item from self._inventory. Returns amount that couldn't be removed (0 if amount could be completely removed.)
         """
@@ -15,7 +18,14 @@ class GlobalInventory:
         self._inventory[item] -= can_remove
         return amount - can_remove
 
-    def get_item(self, item: str) -> int:
+    def clear(self):
+        self._inventory.clear()
+
+    def get_item(self, item: int) -> int:
         return self._inventory.get(item, 0)
 
+    def named_items(self) -> dict[str, int]:
+        """Inventory keyed by item name, for display."""
+        return {data_registry.items.get_name(item): amount for item, amount in self._inventory.items()}
+
 global_inventory = GlobalInventory()
\ No newline at end of file
@@ -1,13 +1,12 @@
 import pygame as pg
 from infrastructure.event_bus import event_bus
-from infrastructure.io_registry import io_registry
-from infrastructure.entity_manager import entity_manager
 from math import dist
 import data.configuration as c
 
 from typing import TYPE_CHECKING, Any
 if TYPE_CHECKING:
     from systems.camera import Camera
+    from systems.world_view import WorldView
 
 from logger import logger
 
@@ -18,6 +17,9 @@ class InputManager:
         self.last_mouse_pos_snapped: tuple[int, int]
         self.held_keys: Any = None
         self.hovered_item: Any = None # hovered item. priority: IONode -> machine -> transfer link or energy cable
+        # world the current frame shows. Hover and tools read it instead of the live world, which the simulation
+        # thread may be changing
+        self.world: WorldView
         
     def update_hovered_object(self):
         selected_item = None
@@ -25,7 +27,7 @@ class InputManager:
         for i in range(4):
             dx = (i % 2) * (c.BASE_MACHINE_WIDTH // 2)
             dy = (i // 2) * (c.BASE_MACHINE_HEIGHT // 2)
-            node = io_registry.get_node((self.last_mouse_pos_snapped[0] + dx, self.last_mouse_pos_snapped[1] + dy))
+            node = self.world.node_at((self.last_mouse_pos_snapped[0] + dx, self.last_mouse_pos_snapped[1] + dy))
             if node and dist(self.camera.screen_to_world(self.last_mouse_pos), node.abs_pos) < c.NODE_HOVER_DIST:
                 selected_item = node
                 break
@@ -33,18 +35,19 @@ class InputManager:
             return selected_item
         
         # machines
-        selected_item = entity_manager.get_machine_under_position(self.camera.screen_to_world(self.last_mouse_pos))
+        selected_item = self.world.machine_under_position(self.camera.screen_to_world(self.last_mouse_pos))
         if selected_item:
             return selected_item
 
         # resource nodes
-        selected_item = entity_manager.get_resource_node_under_position(self.camera.screen_to_world(self.last_mouse_pos))
+        selected_item = self.world.resource_node_under_position(self.camera.screen_to_world(self.last_mouse_pos))
         if selected_item:
             return selected_item
         
         # todo figure out how to do transfer links ?
 
-    def handle_input(self, ui_manager):
+    def handle_input(self, ui_manager, world: "WorldView"):
+        self.world = world
         self.held_keys = pg.key.get_pressed()
 
         self.last_mouse_pos = pg.mouse.get_pos()
@@ -92,6 +95,12 @@ class InputManager:
                 world_pos = self.camera.screen_to_world(event.pos)
                 event_bus.emit("mouse_up", world_pos, event.pos, event.button)
             
+            if event.type == pg.WINDOWEXPOSED:
+                event_bus.emit("window_exposed")
+            
+            if event.type == pg.MOUSEWHEEL:
+                event_bus.emit("mouse_wheel", event.y, self.last_mouse_pos)
+            
             if event.type == pg.KEYDOWN:
                 event_bus.emit("key_down", event.key)
             
@@ -7,13 +7,21 @@ _IONodeType = Union["ItemIONode", "EnergyIONode"]
 class _IORegistry:
     def __init__(self) -> None:
         self._io_nodes: dict[tuple[int, int], _IONodeType] = {}
+        # bumped on every change so caches built from node positions (e.g. transfer routes) can tell they are stale
+        self.version = 0
 
     def register(self, position: tuple[int, int], io_node: _IONodeType):
         self._io_nodes[position] = io_node
+        self.version += 1
         # print(f"Registered {position} as an IONode of type {type(io_node)} with type {io_node.kind}")
 
     def unregister(self, position: tuple[int, int]):
         self._io_nodes.pop(position, None)
+        self.version += 1
+
+    def clear(self):
+        self._io_nodes.clear()
+        self.version += 1
 
     def get_item_node(self, position: tuple[int, int]) -> Optional["ItemIONode"]:
         node = self._io_nodes.get(position)
@@ -30,4 +38,8 @@ class _IORegistry:
     def get_node(self, position: tuple[int, int]) -> Optional[_IONodeType]:
         return self._io_nodes.get(position)
 
+    def copy_nodes(self) -> dict[tuple[int, int], _IONodeType]:
+        """Snapshot of position -> node for readers on another thread, see WorldSnapshot."""
+        return dict(self._io_nodes)
+
 io_registry = _IORegistry()
\ No newline at end of file
@@ -0,0 +1,102 @@
+from typing import TYPE_CHECKING, Literal
+if TYPE_CHECKING:
+    from game.machine import Machine
+from infrastructure.timer_wheel import TimerWheel
+
+MachinePhase = Literal["producers", "consumers", "machines"]
+
+class _MachineScheduler:
+    def __init__(self) -> None:
+        """
+        Active set scheduling for machines. A machine that had nothing to do on its last tick (Machine.can_sleep) is
+        put to sleep and skipped by the Simulation until something it depends on changes and Machine.wake() is
+        called: items arriving in or leaving its nodes, power being granted, its producer buffer being drained,
+        joining a grid or its recipe changing. Tick cost then follows the number of busy machines rather than every
+        machine placed.
+
+        Machines that are waiting on time rather than on an event (a recipe in progress, an importer between
+        transfers) sleep with a wake tick, and are woken by a timer wheel when it comes round.
+        """
+        # current simulation tick, moved on by the Simulation through advance()
+        self.tick = 0
+        self._phases: dict["Machine", MachinePhase] = {}
+        # insertion ordered sets of awake machines, per Simulation phase
+        self._active: dict[MachinePhase, dict["Machine", None]] = {"producers": {}, "consumers": {}, "machines": {}}
+        # sleeping machine -> tick it asked to be woken on (None to sleep until an event wakes it)
+        self._asleep: dict["Machine", int | None] = {}
+        # machine -> tick of its pending timer, so repeated naps towards the same tick do not stack timers
+        self._pending_timers: dict["Machine", int] = {}
+        self._timers: TimerWheel["Machine"] = TimerWheel()
+
+    @staticmethod
+    def phase_for(machine: "Machine") -> MachinePhase:
+        if "PowerProducer" in machine.components:
+            return "producers"
+        if "PowerConsumer" in machine.components:
+            return "consumers"
+        return "machines"
+
+    def add(self, machine: "Machine"):
+        """New machines start awake."""
+        phase = self.phase_for(machine)
+        self._phases[machine] = phase
+        self._active[phase][machine] = None
+
+    def remove(self, machine: "Machine"):
+        phase = self._phases.pop(machine, None)
+        if phase:
+            self._active[phase].pop(machine, None)
+        self._asleep.pop(machine, None)
+        self._pending_timers.pop(machine, None)
+
+    def clear(self):
+        self.tick = 0
+        self._phases.clear()
+        for machines in self._active.values():
+            machines.clear()
+        self._asleep.clear()
+        self._pending_timers.clear()
+        self._timers.clear()
+
+    def advance(self, tick: int):
+        """Moves the clock to tick and wakes every machine whose wake tick it is. Call before ticking any machine."""
+        self.tick = tick
+        for machine in self._timers.advance(tick):
+            if self._pending_timers.get(machine) == tick:
+                del self._pending_timers[machine]
+            if machine in self._asleep and self._asleep[machine] == tick:
+                self.wake(machine)
+
+    def sleep(self, machine: "Machine", wake_tick: int | None = None):
+        phase = self._phases.get(machine)
+        if phase is None or machine in self._asleep:
+            return
+        if wake_tick is not None:
+            if wake_tick <= self.tick:
+                return # due now, stay awake
+            if self._pending_timers.get(machine) != wake_tick:
+                self._pending_timers[machine] = wake_tick
+                self._timers.schedule(wake_tick, machine)
+        del self._active[phase][machine]
+        self._asleep[machine] = wake_tick
+
+    def wake(self, machine: "Machine"):
+        if machine not in self._asleep:
+            return
+        del self._asleep[machine]
+        self._active[self._phases[machine]][machine] = None
+
+    def is_asleep(self, machine: "Machine") -> bool:
+        return machine in self._asleep
+
+    def get_active(self, phase: MachinePhase) -> list["Machine"]:
+        # copied, machines fall asleep while the phase iterates
+        return list(self._active[phase])
+
+    def count_active(self) -> int:
+        return len(self._phases) - len(self._asleep)
+
+    def count_asleep(self) -> int:
+        return len(self._asleep)
+
+machine_scheduler = _MachineScheduler()
@@ -0,0 +1,99 @@
+from typing import TYPE_CHECKING
+try:
+    import numpy as np
+except ImportError: # numpy is optional, only needed for the "numpy" node store
+    np = None
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+import data.configuration as c
+from infrastructure.data_registry import data_registry
+from logger import logger
+
+# item id of an empty node
+NO_ITEM = -1
+
+class _ItemNodeStore:
+    def __init__(self, initial_size: int = 1024) -> None:
+        """
+        Structure of arrays storage for ItemIONodes. With the store enabled every ItemIONode created is an
+        ArrayItemIONode: a view onto one slot of the quantity, capacity and item id (data_registry.items) arrays
+        below. Per-node reads and writes go through the view and are a little slower than plain attributes, in
+        exchange bulk operations over every node (clearing emptied slots, free space, totals) are single NumPy
+        operations instead of Python loops. Slots of removed nodes are emptied and reused by allocate.
+
+        Enabled by c.NODE_STORE = "numpy". Only nodes created while enabled use the store, so switch modes between
+        worlds (after clear()), never during one.
+        """
+        self.enabled = False
+        self._initial_size = initial_size
+        self.size = 0
+        # released slots, reused before the arrays grow
+        self._free: list[int] = []
+        self.quantities: "npt.NDArray"
+        self.capacities: "npt.NDArray"
+        self.items: "npt.NDArray"
+        if c.NODE_STORE == "numpy":
+            self.enable()
+
+    def enable(self, enabled: bool = True):
+        if enabled and np is None:
+            logger.warning("[NodeStore] numpy is not installed, falling back to object node storage")
+            enabled = False
+        self.enabled = enabled
+        self.clear()
+
+    def clear(self):
+        self.size = 0
+        self._free.clear()
+        if np is None or not self.enabled:
+            return
+        self.quantities = np.zeros(self._initial_size, dtype=np.int64)
+        self.capacities = np.zeros(self._initial_size, dtype=np.int64)
+        self.items = np.full(self._initial_size, NO_ITEM, dtype=np.int32)
+
+    def allocate(self, capacity: int) -> int:
+        """Reserves a slot for a new, empty node and returns its index."""
+        assert np is not None and self.enabled, "Node store is not enabled"
+        if self._free:
+            slot = self._free.pop()
+            self.capacities[slot] = capacity
+            return slot
+        if self.size == len(self.quantities):
+            grown = len(self.quantities) * 2
+            self.quantities = np.resize(self.quantities, grown)
+            self.capacities = np.resize(self.capacities, grown)
+            self.items = np.resize(self.items, grown)
+        slot = self.size
+        self.size += 1
+        self.quantities[slot] = 0
+        self.capacities[slot] = capacity
+        self.items[slot] = NO_ITEM
+        return slot
+
+    def release(self, slot: int):
+        """Empties the slot of a removed node, so bulk operations ignore it, and makes it available to allocate."""
+        self.quantities[slot] = 0
+        self.capacities[slot] = 0
+        self.items[slot] = NO_ITEM
+        self._free.append(slot)
+
+    # bulk operations over every node in the store
+    def clear_empty_items(self):
+        """Sets the item of every node holding quantity 0 to None."""
+        n = self.size
+        self.items[:n][self.quantities[:n] == 0] = NO_ITEM
+
+    def free_space(self) -> "npt.NDArray":
+        """Free capacity per slot."""
+        n = self.size
+        return self.capacities[:n] - self.quantities[:n]
+
+    def item_totals(self) -> dict[str, int]:
+        """Total quantity of each item held across all nodes, keyed by item name."""
+        n = self.size
+        held = self.items[:n] != NO_ITEM
+        totals = np.bincount(self.items[:n][held], weights=self.quantities[:n][held], minlength=len(data_registry.items))
+        return {data_registry.items.get_name(item_id): int(total) for item_id, total in enumerate(totals) if total}
+
+node_store = _ItemNodeStore()
@@ -0,0 +1,119 @@
+from typing import TYPE_CHECKING, Iterable
+if TYPE_CHECKING:
+    from game.power_cable import PowerCable
+    from game.machine import Machine
+from game.power_grid import PowerGrid
+from infrastructure.io_registry import io_registry
+
+class PowerNetwork:
+    def __init__(self) -> None:
+        """
+        Tracks which cables form connected grids using union-find. Adding a cable merges grids in near-constant
+        time; removing one only re-walks the component it belonged to. Everything is iterative so long cable
+        runs cannot hit the recursion limit.
+        """
+        self._parent: dict["PowerCable", "PowerCable"] = {}
+        self._rank: dict["PowerCable", int] = {}
+        # component root -> grid for that component
+        self._grids: dict["PowerCable", PowerGrid] = {}
+
+    def find(self, cable: "PowerCable") -> "PowerCable":
+        root = cable
+        while self._parent[root] is not root:
+            root = self._parent[root]
+        # path compression
+        while self._parent[cable] is not root:
+            self._parent[cable], cable = root, self._parent[cable]
+        return root
+
+    def get_grid(self, cable: "PowerCable") -> PowerGrid:
+        return self._grids[self.find(cable)]
+
+    def get_grids(self) -> Iterable[PowerGrid]:
+        return self._grids.values()
+
+    def add_cable(self, cable: "PowerCable"):
+        """Adds cable as its own grid, then merges it with every same-voltage cable in cable.connected."""
+        self._parent[cable] = cable
+        self._rank[cable] = 0
+        grid = PowerGrid(cable.voltage)
+        self._grids[cable] = grid
+        self._attach_machines(cable, grid)
+
+        for neighbor in cable.connected:
+            if neighbor.voltage == cable.voltage and neighbor in self._parent:
+                self._union(cable, neighbor)
+
+    def remove_cable(self, cable: "PowerCable"):
+        """
+        Removes cable and re-splits the grid it belonged to. Must be called after cable has been removed from its
+        neighbors' connected sets, but while cable.connected still lists them.
+        """
+        if cable not in self._parent:
+            return
+
+        root = self.find(cable)
+        old_grid = self._grids.pop(root)
+        old_grid.disconnect_all()
+
+        # collect the remaining cables of the old component
+        component: list["PowerCable"] = []
+        seen = {cable}
+        stack = [n for n in cable.connected if n.voltage == cable.voltage]
+        seen.update(stack)
+        while stack:
+            current = stack.pop()
+            component.append(current)
+            for neighbor in current.connected:
+                if neighbor not in seen and neighbor.voltage == current.voltage:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+
+        del self._parent[cable]
+        del self._rank[cable]
+        for member in component:
+            self._parent[member] = member
+            self._rank[member] = 0
+        # rebuild just this component; members that are still connected get merged back together
+        for member in component:
+            if self._parent[member] is member and member not in self._grids:
+                self._grids[member] = PowerGrid(member.voltage)
+            self._attach_machines(member, self.get_grid(member))
+            for neighbor in member.connected:
+                if neighbor.voltage == member.voltage and neighbor in self._parent:
+                    self._union(member, neighbor)
+
+    def clear(self):
+        for grid in self._grids.values():
+            grid.disconnect_all()
+        self._parent.clear()
+        self._rank.clear()
+        self._grids.clear()
+
+    def _union(self, a: "PowerCable", b: "PowerCable"):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a is root_b:
+            return
+        if self._rank[root_a] < self._rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        if self._rank[root_a] == self._rank[root_b]:
+            self._rank[root_a] += 1
+
+        grid_a = self._grids.setdefault(root_a, PowerGrid(root_a.voltage))
+        grid_b = self._grids.pop(root_b, None)
+        if grid_b is not None:
+            # keep the bigger grid so fewer machines need moving
+            if len(grid_b.connections) > len(grid_a.connections):
+                grid_a, grid_b = grid_b, grid_a
+                self._grids[root_a] = grid_a
+            grid_a.merge(grid_b)
+
+    @staticmethod
+    def _attach_machines(cable: "PowerCable", grid: PowerGrid):
+        for pos in (cable.start_pos, cable.end_pos):
+            node = io_registry.get_energy_node(pos)
+            if node:
+                machine: "Machine" = node.parent
+                if machine.get_component("PowerConsumer") or machine.get_component("PowerProducer"):
+                    grid.add_machine(machine)
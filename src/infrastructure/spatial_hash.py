@@ -0,0 +1,117 @@
+from math import floor
+from typing import Generic, Hashable, Iterable, TypeVar
+
+_T = TypeVar("_T", bound=Hashable)
+
+# (x, y, width, height) in world space
+Rect = tuple[float, float, float, float]
+
+class SpatialHash(Generic[_T]):
+    def __init__(self, cell_size: tuple[int, int]) -> None:
+        """
+        Buckets entities into fixed-size world-space cells so point and rectangle lookups only touch the cells
+        they cover, independent of how many entities exist. Rects are treated as inclusive on all edges, matching
+        the `x <= px <= x + w` checks used elsewhere, so an entity is stored in every cell its bounds touch.
+        """
+        self.cell_width, self.cell_height = cell_size
+        self._cells: dict[tuple[int, int], dict[_T, None]] = {}
+        self._entity_cells: dict[_T, list[tuple[int, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entity_cells)
+
+    def __contains__(self, entity: _T) -> bool:
+        return entity in self._entity_cells
+
+    def cell_at(self, position: tuple[float, float]) -> tuple[int, int]:
+        return (floor(position[0] / self.cell_width), floor(position[1] / self.cell_height))
+
+    def cells_in_rect(self, rect: Rect) -> Iterable[tuple[int, int]]:
+        return cells_in_rect(rect, (self.cell_width, self.cell_height))
+
+    def insert(self, entity: _T, rects: Iterable[Rect]):
+        """Stores entity in every cell touched by any of rects. Re-inserting an entity replaces its old cells."""
+        if entity in self._entity_cells:
+            self.remove(entity)
+
+        cells: list[tuple[int, int]] = []
+        for rect in rects:
+            for cell in self.cells_in_rect(rect):
+                bucket = self._cells.setdefault(cell, {})
+                if entity not in bucket:
+                    bucket[entity] = None
+                    cells.append(cell)
+        self._entity_cells[entity] = cells
+
+    def remove(self, entity: _T):
+        for cell in self._entity_cells.pop(entity, ()):
+            bucket = self._cells[cell]
+            bucket.pop(entity, None)
+            if not bucket:
+                del self._cells[cell]
+
+    def clear(self):
+        self._cells.clear()
+        self._entity_cells.clear()
+
+    def query_point(self, position: tuple[float, float]) -> tuple[_T, ...]:
+        """
+        Candidates whose bounds touch the cell containing position. Callers do the exact containment test.
+        Returns a copy so hover lookups from the game thread stay safe while a SimulationWorker edits the world.
+        """
+        return tuple(self._cells.get(self.cell_at(position), ()))
+
+    def query_rect(self, rect: Rect) -> list[_T]:
+        """Candidates whose bounds touch any cell covered by rect, without duplicates."""
+        found: dict[_T, None] = {}
+        for cell in self.cells_in_rect(rect):
+            bucket = self._cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return list(found)
+
+class BoundsIndex(SpatialHash[_T]):
+    def __init__(self, cell_size: tuple[int, int]) -> None:
+        """SpatialHash of one bounding rect per entity, so rect queries can return exact overlaps rather than candidates."""
+        super().__init__(cell_size)
+        self._bounds: dict[_T, Rect] = {}
+
+    def insert_bounds(self, entity: _T, bounds: Rect):
+        self._bounds[entity] = bounds
+        self.insert(entity, [bounds])
+
+    def get_bounds(self, entity: _T) -> Rect | None:
+        return self._bounds.get(entity)
+
+    def remove(self, entity: _T):
+        self._bounds.pop(entity, None)
+        super().remove(entity)
+
+    def clear(self):
+        super().clear()
+        self._bounds.clear()
+
+    def query_bounds(self, rect: Rect) -> list[_T]:
+        """Entities whose bounds touch rect."""
+        return [entity for entity in self.query_rect(rect) if rects_touch(self._bounds[entity], rect)]
+
+    def copy(self) -> "BoundsIndex[_T]":
+        """Independent copy, which later inserts and removes on this index do not affect."""
+        index: BoundsIndex[_T] = BoundsIndex((self.cell_width, self.cell_height))
+        index._cells = {cell: dict(bucket) for cell, bucket in self._cells.items()}
+        index._entity_cells = {entity: list(cells) for entity, cells in self._entity_cells.items()}
+        index._bounds = dict(self._bounds)
+        return index
+
+def rects_touch(a: Rect, b: Rect) -> bool:
+    return a[0] <= b[0] + b[2] and b[0] <= a[0] + a[2] and a[1] <= b[1] + b[3] and b[1] <= a[1] + a[3]
+
+def cells_in_rect(rect: Rect, cell_size: tuple[int, int]) -> Iterable[tuple[int, int]]:
+    """Every cell of a cell_size grid that rect touches, edges included."""
+    x, y, w, h = rect
+    cell_width, cell_height = cell_size
+    x0, y0 = floor(x / cell_width), floor(y / cell_height)
+    x1, y1 = floor((x + w) / cell_width), floor((y + h) / cell_height)
+    for cy in range(y0, y1 + 1):
+        for cx in range(x0, x1 + 1):
+            yield (cx, cy)
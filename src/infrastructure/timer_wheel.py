@@ -0,0 +1,45 @@
+from typing import Generic, Hashable, TypeVar
+
+_T = TypeVar("_T", bound=Hashable)
+
+class TimerWheel(Generic[_T]):
+    def __init__(self, num_slots: int = 256) -> None:
+        """
+        Hashed timing wheel: "fire at tick T" timers are bucketed by T % num_slots, so scheduling is O(1) and
+        advancing one tick only looks at one slot. Timers further than num_slots ticks ahead simply wait in their
+        slot until their tick comes round. advance() must be called for every tick, in order.
+
+        Timers cannot be cancelled; owners check on firing whether the timer is still the one they want.
+        """
+        self.num_slots = num_slots
+        self.now = 0
+        self._slots: list[list[tuple[int, _T]]] = [[] for _ in range(num_slots)]
+
+    def __len__(self) -> int:
+        return sum(len(slot) for slot in self._slots)
+
+    def schedule(self, tick: int, item: _T):
+        assert tick > self.now, f"Timer for tick {tick} scheduled at tick {self.now}, timers must be in the future"
+        self._slots[tick % self.num_slots].append((tick, item))
+
+    def advance(self, tick: int) -> list[_T]:
+        """Moves the wheel to tick and returns the items due on it, in the order they were scheduled."""
+        self.now = tick
+        slot = self._slots[tick % self.num_slots]
+        if not slot:
+            return []
+
+        due: list[_T] = []
+        later: list[tuple[int, _T]] = []
+        for timer in slot:
+            if timer[0] == tick:
+                due.append(timer[1])
+            else:
+                later.append(timer)
+        self._slots[tick % self.num_slots] = later
+        return due
+
+    def clear(self):
+        self.now = 0
+        for slot in self._slots:
+            slot.clear()
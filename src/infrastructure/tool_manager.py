@@ -1,9 +1,9 @@
+from functools import partial
 from math import atan2, degrees
 from typing import Literal
 
-import data.configuration as c
-
 from components.ionode import EnergyIONode, ItemIONode
+from infrastructure.command_queue import command_queue
 from infrastructure.data_registry import data_registry
 from infrastructure.entity_manager import entity_manager
 from infrastructure.event_bus import event_bus
@@ -13,8 +13,7 @@ from infrastructure.global_inventory import global_inventory
 from game.power_cable import PowerCable
 from game.transfer_link import TransferLink
 from game.machine import Machine
-from infrastructure.utils import get_footprint_center, tiles_overlap
-from infrastructure.transfer_registry import transfer_registry, cable_registry
+from infrastructure.utils import get_placement_position
 from logger import logger
 
 
@@ -45,32 +44,34 @@ class PlaceTool(Tool):
         if button != 1:
             return
         if self.tool_manager.context.selected_machine_id:
-            num_stored = global_inventory.get_item(self.tool_manager.context.selected_machine_id)
+            num_stored = input_manager.world.inventory.get(self.tool_manager.context.selected_machine_id, 0)
             if num_stored < 1:
                 self.tool_manager.deselect_tool()
                 return
 
-            mouse_pos = input_manager.mouse_pos_closest_corner
             machine_data = data_registry.machines[self.tool_manager.context.selected_machine_id]
-            fpx, fpy = get_footprint_center(machine_data['footprint'])
-            center_pos = (
-                int(mouse_pos[0] - fpx * c.BASE_MACHINE_WIDTH),
-                int(mouse_pos[1] - fpy * c.BASE_MACHINE_HEIGHT)
-            )
+            center_pos = get_placement_position(machine_data['footprint'], input_manager.mouse_pos_closest_corner)
 
             # collision check: any overlap with existing machines
-            for machine in entity_manager.get_machines():
-                if tiles_overlap(center_pos, machine_data['footprint'], machine.position, machine.shape):
-                    return  # cancel placement
+            if not input_manager.world.can_place(self.tool_manager.context.selected_machine_id, center_pos):
+                return  # cancel placement
 
             # place the machine
-            entity_manager.add_entity(Machine(self.tool_manager.context.selected_machine_id, center_pos)) 
-            global_inventory.remove_item(self.tool_manager.context.selected_machine_id, 1)   
+            command_queue.submit(partial(self.place_machine, self.tool_manager.context.selected_machine_id, center_pos))
 
             if num_stored - 1 < 1:
                 self.tool_manager.deselect_tool()
                 return
 
+    @staticmethod
+    def place_machine(machine_id: str, position: tuple[int, int]):
+        # checked again as the world may have changed between the click and this command running
+        item = data_registry.items.get_id(machine_id)
+        if global_inventory.get_item(item) < 1 or not entity_manager.can_place(machine_id, position):
+            return
+        entity_manager.add_entity(Machine(machine_id, position))
+        global_inventory.remove_item(item, 1)
+
 class LinkTool(Tool):
     def __init__(self, tool_manager: "_ToolManager") -> None:
         super().__init__("Link")
@@ -105,7 +106,7 @@ class LinkTool(Tool):
                 return True
 
         # connect to existing link
-        for link in transfer_registry.get_links(input_manager.mouse_pos_closest_corner):
+        for link in input_manager.world.transfer_links_at(input_manager.mouse_pos_closest_corner):
             if link.link_id != selected_link["id"]:
                 print(link.link_id, selected_link["id"])
                 return False
@@ -113,7 +114,7 @@ class LinkTool(Tool):
             self.type = link.type
             return True
     
-        for link in cable_registry.get_cables(input_manager.mouse_pos_closest_corner):
+        for link in input_manager.world.power_cables_at(input_manager.mouse_pos_closest_corner):
             if link.link_id != selected_link["id"]:
                 print(link.link_id, selected_link["id"])
                 return False
@@ -162,12 +163,17 @@ class LinkTool(Tool):
                 self.placing = False
                 return
             
-            if self.type in ['item', 'fluid']:
-                entity_manager.add_entity(TransferLink(self.start_pos, end_pos, self.tool_manager.context.selected_link_type))
-            else:
-                entity_manager.add_entity(PowerCable(self.start_pos, end_pos, self.tool_manager.context.selected_link_type))
+            link_class = TransferLink if self.type in ['item', 'fluid'] else PowerCable
+            command_queue.submit(partial(self.place_link, link_class, self.start_pos, end_pos,
+                                         self.tool_manager.context.selected_link_type))
         self.placing = False
 
+    @staticmethod
+    def place_link(link_class: type[TransferLink] | type[PowerCable], start_pos: tuple[int, int],
+                   end_pos: tuple[int, int], link_id: str):
+        # links register themselves when created, so creation has to happen in the command too
+        entity_manager.add_entity(link_class(start_pos, end_pos, link_id))
+
 #* === ToolManager === *#
 class _ToolManager:
     def __init__(self) -> None:
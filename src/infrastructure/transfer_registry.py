@@ -1,13 +1,26 @@
 from typing import TYPE_CHECKING
 from collections import defaultdict
 if TYPE_CHECKING:
+    from components.ionode import ItemIONode
     from game.transfer_link import TransferLink
     from game.power_cable import PowerCable
+    from game.power_grid import PowerGrid
+from infrastructure.io_registry import io_registry
+from infrastructure.power_network import PowerNetwork
+from infrastructure.timer_wheel import TimerWheel
 from logger import logger
 
+# The item node at a link's end (if any) and the links continuing on from it
+Hop = tuple["ItemIONode | None", tuple["TransferLink", ...]]
+
 class _TransferRegistry:
     def __init__(self) -> None:
         self.link_map: dict[tuple[int, int], list["TransferLink"]] = defaultdict(list)
+        # link -> hop, rebuilt lazily after any topology or io_registry change
+        self._hops: dict["TransferLink", Hop] = {}
+        self._hops_io_version = io_registry.version
+        # transfer timers of chain heads. Its clock is moved on by the Simulation through get_due_links
+        self.timers: TimerWheel["TransferLink"] = TimerWheel()
     
     def get_links(self, pos: tuple[int, int]) -> list["TransferLink"]:
         return self.link_map.get(pos, [])
@@ -23,10 +36,15 @@ class _TransferRegistry:
         for neighbor in self.link_map[link.end_pos]:
             if neighbor.start_pos == link.end_pos and neighbor.type == link.type and neighbor.link_id == link.link_id:
                 link.downstream.append(neighbor)
+                if not neighbor.upstream:
+                    neighbor.stop_timer() # no longer a chain head
                 neighbor.upstream.append(link)
         
         self.link_map[link.start_pos].append(link)
         self.link_map[link.end_pos].append(link)
+        if not link.upstream:
+            link.start_timer()
+        self._hops.clear()
     
     def unregister(self, link: "TransferLink"):
         try:
@@ -37,14 +55,79 @@ class _TransferRegistry:
                 upstream.downstream.remove(link)
             for downstream in link.downstream:
                 downstream.upstream.remove(link)
-        except KeyError:
+                if not downstream.upstream:
+                    downstream.start_timer() # now heads its own chain
+            link.stop_timer()
+        except (KeyError, ValueError):
             logger.fatal(f"Error when unregistering link from {link.start_pos} to {link.end_pos}: link not in registry!")
+        self._hops.clear()
+
+    def clear(self):
+        self.link_map.clear()
+        self._hops.clear()
+        self.timers.clear()
+
+    def get_due_links(self, tick: int) -> list["TransferLink"]:
+        """Moves the transfer timers to tick and returns the chain heads due to transfer on it, in creation order."""
+        due = self.timers.advance(tick)
+        if len(due) > 1:
+            due.sort(key=lambda link: link.creation_index)
+        return due
+
+    def get_hop(self, link: "TransferLink") -> Hop:
+        """
+        The item node at link's end and its downstream links. Cached until a link is (un)registered or io_registry
+        changes, so steady-state transfers do no node lookups.
+        """
+        if self._hops_io_version != io_registry.version:
+            self._hops.clear()
+            self._hops_io_version = io_registry.version
+
+        hop = self._hops.get(link)
+        if hop is None:
+            hop = (io_registry.get_item_node(link.end_pos), tuple(link.downstream))
+            self._hops[link] = hop
+        return hop
+
+    def find_target(self, head: "TransferLink", item: int) -> tuple["ItemIONode | None", tuple["TransferLink", ...]]:
+        """
+        Node an item transferred by chain head goes to, and the links leading there. A link's own end node is taken
+        if it can hold item, otherwise its downstream links are tried depth first, starting from its round robin
+        index, which moves past the link that found a target so branches take turns.
+        """
+        node, downstream = self.get_hop(head)
+        if node and (node.item == item or node.item is None):
+            return node, (head,)
+
+        visited: set["TransferLink"] = {head}
+        # (link, its downstream links, how many of them have been tried), iterative so long chains cannot hit the
+        # recursion limit
+        stack: list[tuple["TransferLink", tuple["TransferLink", ...], int]] = [(head, downstream, 0)]
+        while stack:
+            link, downstream, tried = stack[-1]
+            if tried == len(downstream):
+                stack.pop()
+                continue
+            stack[-1] = (link, downstream, tried + 1)
+            next_link = downstream[(link.round_robin_index + tried) % len(downstream)]
+            if next_link in visited:
+                continue
+            visited.add(next_link)
+
+            node, next_downstream = self.get_hop(next_link)
+            if node and (node.item == item or node.item is None):
+                for path_link, path_downstream, path_tried in stack:
+                    path_link.round_robin_index = (path_link.round_robin_index + path_tried) % len(path_downstream)
+                return node, tuple(path_link for path_link, _, _ in stack) + (next_link,)
+            stack.append((next_link, next_downstream, 0))
+        return None, ()
                 
 transfer_registry = _TransferRegistry()
 
 class _CableRegistry():
     def __init__(self) -> None:
         self.cable_map: dict[tuple[int, int], list["PowerCable"]] = defaultdict(list)
+        self.network = PowerNetwork()
     
     def register(self, cable: "PowerCable"):
         for neighbor in self.cable_map[cable.start_pos] + self.cable_map[cable.end_pos]:
@@ -53,20 +136,33 @@ class _CableRegistry():
 
         self.cable_map[cable.start_pos].append(cable)
         self.cable_map[cable.end_pos].append(cable)
+        self.network.add_cable(cable)
         
     def unregister(self, cable: "PowerCable"):
         if cable not in self.cable_map[cable.start_pos]:
             logger.warning(f"Error when unregistering link from {cable.start_pos} to {cable.end_pos}: cable not in registry!")
             return
 
-        for neighbor in self.cable_map[cable.start_pos] + self.cable_map[cable.end_pos]:
-            neighbor.connected.remove(cable)
-            cable.connected.remove(neighbor)
-        
         self.cable_map[cable.start_pos].remove(cable)
         self.cable_map[cable.end_pos].remove(cable)
+
+        for neighbor in cable.connected:
+            neighbor.connected.discard(cable)
+        # the network walks cable.connected to find the component to re-split, so clear it afterwards
+        self.network.remove_cable(cable)
+        cable.connected.clear()
     
+    def clear(self):
+        self.cable_map.clear()
+        self.network.clear()
+
     def get_cables(self, pos: tuple[int, int]) -> list["PowerCable"]:
         return self.cable_map.get(pos, [])
 
+    def get_grid(self, cable: "PowerCable") -> "PowerGrid":
+        return self.network.get_grid(cable)
+
+    def get_grids(self) -> list["PowerGrid"]:
+        return list(self.network.get_grids())
+
 cable_registry = _CableRegistry()
\ No newline at end of file
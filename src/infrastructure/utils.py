@@ -1,3 +1,5 @@
+from math import ceil, floor
+
 import data.configuration as c
 
 def interpolate(value, range_a_start, range_a_end, value_a, value_b):
@@ -26,24 +28,26 @@ def get_footprint_center(footprint: list[tuple[int, int]]) -> tuple[float, float
     center_y = (min(ys) + max(ys)) / 2
     return (center_x+0.5, center_y+0.5)
 
-def tiles_overlap(pos_a, shape_a, pos_b, shape_b):
-    ax, ay = pos_a
-    bx, by = pos_b
-    for tx_a, ty_a in shape_a:
-        rect_a = (
-            ax + tx_a * c.BASE_MACHINE_WIDTH,
-            ay + ty_a * c.BASE_MACHINE_HEIGHT,
-            c.BASE_MACHINE_WIDTH,
-            c.BASE_MACHINE_HEIGHT
-        )
-        for tx_b, ty_b in shape_b:
-            rect_b = (
-                bx + tx_b * c.BASE_MACHINE_WIDTH,
-                by + ty_b * c.BASE_MACHINE_HEIGHT,
-                c.BASE_MACHINE_WIDTH,
-                c.BASE_MACHINE_HEIGHT
-            )
-            if (rect_a[0] < rect_b[0] + rect_b[2] and rect_a[0] + rect_a[2] > rect_b[0] and
-                rect_a[1] < rect_b[1] + rect_b[3] and rect_a[1] + rect_a[3] > rect_b[1]):
-                return True
-    return False
+def get_placement_position(footprint: list[tuple[int, int]], corner: tuple[float, float]) -> tuple[int, int]:
+    """World position of a machine with footprint whose footprint center is placed at corner."""
+    fpx, fpy = get_footprint_center(footprint)
+    return (
+        int(corner[0] - fpx * c.BASE_MACHINE_WIDTH),
+        int(corner[1] - fpy * c.BASE_MACHINE_HEIGHT)
+    )
+
+def get_footprint_cells(position: tuple[int, int], footprint: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """
+    Half-tile grid cells covered by footprint placed at position. Machines are placed on half-tile snap points,
+    so two footprints overlap (some of their tiles intersect with positive area) exactly when they share a cell.
+    """
+    half_width = c.BASE_MACHINE_WIDTH / 2
+    half_height = c.BASE_MACHINE_HEIGHT / 2
+    cells = []
+    for tx, ty in footprint:
+        x = position[0] + tx * c.BASE_MACHINE_WIDTH
+        y = position[1] + ty * c.BASE_MACHINE_HEIGHT
+        for cy in range(floor(y / half_height), ceil((y + c.BASE_MACHINE_HEIGHT) / half_height)):
+            for cx in range(floor(x / half_width), ceil((x + c.BASE_MACHINE_WIDTH) / half_width)):
+                cells.append((cx, cy))
+    return cells
@@ -1,16 +1,72 @@
+from argparse import ArgumentParser
+
 from logger import logger
-import pygame as pg
 import data.configuration as c
 
-from game.game import Game
+def run_game(threaded_simulation: bool = c.THREADED_SIMULATION, dirty_rects: bool = c.DIRTY_RECT_RENDERING):
+    # Imported here so the headless commands never initialise a display or load assets
+    import pygame as pg
+    from game.game import Game
 
-def main():
     pg.init()
     display_surface = pg.display.set_mode(c.DISPLAY_SIZE)
     pg.display.set_caption("EX NIHILO | FPS: 0")
-    game = Game(display_surface)
+    game = Game(display_surface, threaded_simulation, dirty_rects)
     logger.info("Game initialized")
     game.run()
 
+def run_simulate(args):
+    from headless import run_headless, report
+    report(run_headless(args.ticks, args.scenario, args.size, args.power_settlement, args.node_store))
+
+def run_bench(args):
+    from benchmark import SUITES, run_suite, write_results, load_results, compare
+
+    cases = SUITES[args.suite]
+    if args.scenario:
+        cases = [(args.scenario, args.size, args.ticks)]
+    # batching works on the numpy node store
+    node_store_mode = "numpy" if args.batch_recipes else args.node_store
+    results = run_suite(cases, args.power_settlement, node_store_mode, args.batch_recipes)
+    write_results(results, args.output)
+    if args.compare:
+        for line in compare(results, load_results(args.compare)):
+            logger.info(f"[benchmark] {line}")
+
+def main():
+    parser = ArgumentParser(description="EX NIHILO")
+    parser.add_argument("--threaded-simulation", action="store_true", default=c.THREADED_SIMULATION,
+                        help="Run the simulation on a background thread while playing")
+    parser.add_argument("--dirty-rects", action="store_true", default=c.DIRTY_RECT_RENDERING,
+                        help="Only redraw and update the parts of the screen that changed each frame")
+    commands = parser.add_subparsers(dest="command")
+
+    simulate = commands.add_parser("simulate", help="Run the simulation headless and report achieved TPS")
+    simulate.add_argument("--ticks", type=int, default=c.SIMULATION_TICKS_PER_SECOND * 60)
+    simulate.add_argument("--scenario", default="optimization_test")
+    simulate.add_argument("--size", type=int, default=100, help="Scenario size (e.g. number of setups)")
+    simulate.add_argument("--power-settlement", choices=["batched", "immediate"], default=c.POWER_SETTLEMENT_MODE)
+    simulate.add_argument("--node-store", choices=["objects", "numpy"], default=c.NODE_STORE)
+
+    bench = commands.add_parser("bench", help="Run the benchmark suite and write machine-readable results")
+    bench.add_argument("--suite", choices=["quick", "default"], default="default")
+    bench.add_argument("--scenario", help="Run a single scenario instead of a suite")
+    bench.add_argument("--size", type=int, default=1000)
+    bench.add_argument("--ticks", type=int, default=300)
+    bench.add_argument("--power-settlement", choices=["batched", "immediate"], default=c.POWER_SETTLEMENT_MODE)
+    bench.add_argument("--node-store", choices=["objects", "numpy"], default=c.NODE_STORE)
+    bench.add_argument("--batch-recipes", action="store_true", default=c.BATCH_RECIPES,
+                       help="Tick identical recipe machines as NumPy batches (uses the numpy node store)")
+    bench.add_argument("--output", default="benchmark_results.json")
+    bench.add_argument("--compare", help="Earlier results file to report TPS changes against")
+
+    args = parser.parse_args()
+    if args.command == "simulate":
+        run_simulate(args)
+    elif args.command == "bench":
+        run_bench(args)
+    else:
+        run_game(args.threaded_simulation, args.dirty_rects)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
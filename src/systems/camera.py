@@ -1,14 +1,16 @@
 from infrastructure.input_manager import input_manager
 import pygame as pg
 
+import data.configuration as c
+
 class Camera:
     def __init__(self, screen_size, position=(0, 0), zoom=1.0):
         self.position = list(position)
         self.screen_width, self.screen_height = screen_size
         self.zoom = zoom
-    
-        # self.min_zoom = 0.25
-        # self.max_zoom = 4.0
+        # zoom steps the mouse wheel moves through, starting from the one closest to zoom
+        self.zoom_levels = c.ZOOM_LEVELS
+        self.zoom_index = min(range(len(self.zoom_levels)), key=lambda i: abs(self.zoom_levels[i] - zoom))
 
     def move(self, dx, dy):
         self.position[0] += dx / self.zoom
@@ -20,6 +22,30 @@ class Camera:
     def set_pos(self, x, y):
         self.position = [x, y]
 
+    def get_view_rect(self) -> tuple[float, float, float, float]:
+        """World-space (x, y, width, height) currently on screen."""
+        return (self.position[0], self.position[1], self.screen_width / self.zoom, self.screen_height / self.zoom)
+
+    def screen_rect_to_world(self, rect: pg.Rect) -> tuple[float, float, float, float]:
+        """World-space (x, y, width, height) shown in screen rect."""
+        x, y = self.screen_to_world(rect.topleft)
+        return (x, y, rect.width / self.zoom, rect.height / self.zoom)
+
+    def step_zoom(self, steps: int, anchor: tuple[float, float]):
+        """Moves steps zoom levels in (positive) or out, keeping the world point under screen position anchor fixed."""
+        index = max(0, min(len(self.zoom_levels) - 1, self.zoom_index + steps))
+        if index == self.zoom_index:
+            return
+        anchor_world = self.screen_to_world(anchor)
+        self.zoom_index = index
+        self.zoom = self.zoom_levels[index]
+        self.position = [anchor_world[0] - anchor[0] / self.zoom, anchor_world[1] - anchor[1] / self.zoom]
+
+    @property
+    def far_lod(self) -> bool:
+        """Whether the view is zoomed out far enough for the renderer's cheap representations."""
+        return self.zoom <= c.FAR_LOD_ZOOM
+
     def world_to_screen(self, world_pos):
         return (
             (world_pos[0] - self.position[0]) * self.zoom,
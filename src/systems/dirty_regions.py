@@ -0,0 +1,54 @@
+from typing import Any, Hashable
+
+import pygame as pg
+
+class DirtyRegions:
+    def __init__(self, screen_size: tuple[int, int]) -> None:
+        """
+        Works out which parts of the screen changed since the last frame, so only those are drawn again and passed
+        to pg.display.update (c.DIRTY_RECT_RENDERING). Each frame, everything drawn that can change without the
+        camera moving marks its screen rect under a key, with a state value that changes whenever its pixels do:
+        the renderer's overlays and debug labels, and UI elements. A key whose rect or state changed, or that was
+        not marked again, is dirty in both its old and new rect.
+
+        The rest of the screen only changes when the camera moves or zooms or entities are added or removed, which
+        redraws everything.
+        """
+        self.screen_rect = pg.Rect((0, 0), screen_size)
+        # key -> (screen rect, state) marked in the last frame and in the current one
+        self._previous: dict[Hashable, tuple[pg.Rect, Any]] = {}
+        self._current: dict[Hashable, tuple[pg.Rect, Any]] = {}
+        # camera and entities the last frame was drawn with
+        self._view: Hashable = None
+        self._full = True
+
+    def invalidate(self):
+        """Redraws the whole screen next frame, e.g. after the window was uncovered."""
+        self._full = True
+
+    def mark(self, key: Hashable, rect: pg.Rect, state: Any):
+        self._current[key] = (rect, state)
+
+    def end_frame(self, view: Hashable) -> list[pg.Rect] | None:
+        """
+        Compares this frame's marks with the last frame's. view identifies what the rest of the screen shows
+        (camera position and zoom, entity version). Returns None when the whole screen has to be drawn, otherwise
+        the rects to draw and update, empty when nothing changed.
+        """
+        previous, current = self._previous, self._current
+        self._previous, self._current = current, {}
+        if self._full or view != self._view:
+            self._full = False
+            self._view = view
+            return None
+
+        dirty: list[pg.Rect] = []
+        for key, (rect, state) in current.items():
+            old = previous.pop(key, None)
+            if old is None:
+                dirty.append(rect)
+            elif old[0] != rect or old[1] != state:
+                dirty += (old[0], rect)
+        # gone since the last frame
+        dirty += (rect for rect, _ in previous.values())
+        return [rect.clip(self.screen_rect) for rect in dirty if rect.colliderect(self.screen_rect)]
@@ -0,0 +1,94 @@
+import json
+from collections import deque
+from time import perf_counter
+
+from logger import logger
+
+class TickProfiler:
+    def __init__(self, capacity: int = 600) -> None:
+        """
+        Opt-in wall time recorder for Simulation ticks. Keeps the last capacity ticks of samples (in milliseconds)
+        per phase and per entity type in ring buffers, so memory stays fixed no matter how long the game runs.
+        Does nothing unless enabled.
+        """
+        self.enabled = False
+        self.capacity = capacity
+        self.tick_samples: deque[float] = deque(maxlen=capacity)
+        self.phase_samples: dict[str, deque[float]] = {}
+        self.entity_samples: dict[str, deque[float]] = {}
+
+        self.ticks_recorded = 0
+        self._tick_start = 0.0
+        self._entity_times: dict[str, float] = {}
+        self._summary: dict | None = None
+        self._summary_tick = -1
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        logger.info(f"[TickProfiler] {'Enabled' if self.enabled else 'Disabled'}")
+
+    def reset(self):
+        self.tick_samples.clear()
+        self.phase_samples.clear()
+        self.entity_samples.clear()
+        self._entity_times.clear()
+        self._summary = None
+
+    def begin_tick(self):
+        self._tick_start = perf_counter()
+
+    def end_tick(self):
+        self.tick_samples.append((perf_counter() - self._tick_start) * 1000)
+        for entity_type, seconds in self._entity_times.items():
+            self._samples_for(self.entity_samples, entity_type).append(seconds * 1000)
+        self._entity_times.clear()
+        self.ticks_recorded += 1
+
+    def record_phase(self, phase: str, seconds: float):
+        self._samples_for(self.phase_samples, phase).append(seconds * 1000)
+
+    def add_entity_time(self, entity_type: str, seconds: float):
+        """Accumulates time spent on one entity type during the current tick."""
+        self._entity_times[entity_type] = self._entity_times.get(entity_type, 0.0) + seconds
+
+    def summary(self) -> dict[str, dict[str, dict[str, float]]]:
+        """p50/p99 milliseconds per tick for the whole tick, each phase and each entity type. Cached per tick."""
+        if self._summary is not None and self._summary_tick == self.ticks_recorded:
+            return self._summary
+
+        # items are copied first: with a SimulationWorker, new phases/entity types can appear while we read
+        self._summary = {
+            "tick": {"total": self._percentiles(self.tick_samples)},
+            "phases": {name: self._percentiles(samples) for name, samples in list(self.phase_samples.items())},
+            "entities": {name: self._percentiles(samples) for name, samples in list(self.entity_samples.items())},
+        }
+        self._summary_tick = self.ticks_recorded
+        return self._summary
+
+    def dump(self, path: str):
+        with open(path, "w") as f:
+            json.dump({
+                "capacity": self.capacity,
+                "ticks_recorded": self.ticks_recorded,
+                "summary": self.summary(),
+                "samples": {
+                    "tick": list(self.tick_samples),
+                    "phases": {name: list(samples) for name, samples in list(self.phase_samples.items())},
+                    "entities": {name: list(samples) for name, samples in list(self.entity_samples.items())},
+                },
+            }, f, indent=4)
+        logger.info(f"[TickProfiler] Wrote profile to {path}")
+
+    def _samples_for(self, series: dict[str, deque[float]], name: str) -> deque[float]:
+        samples = series.get(name)
+        if samples is None:
+            samples = series[name] = deque(maxlen=self.capacity)
+        return samples
+
+    @staticmethod
+    def _percentiles(samples: deque[float]) -> dict[str, float]:
+        if not samples:
+            return {"p50": 0.0, "p99": 0.0}
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+        return {"p50": ordered[round(last * 0.5)], "p99": ordered[round(last * 0.99)]}
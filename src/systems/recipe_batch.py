@@ -0,0 +1,173 @@
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from game.machine import Machine
+    from components.PowerConsumer import PowerConsumer
+    from components.PowerProducer import PowerProducer
+    from components.RecipeRunner import RecipeRunner
+    from infrastructure.data_registry import Recipe
+
+import numpy as np
+
+import data.configuration as c
+from components.ionode import ArrayItemIONode
+from infrastructure.machine_scheduler import machine_scheduler
+from infrastructure.node_store import node_store, NO_ITEM
+
+# components whose tick the batch path reproduces
+_BATCHABLE_COMPONENTS = {"RecipeRunner", "PowerConsumer", "PowerProducer"}
+
+class _MachinePlan:
+    """What the batch path needs to read and write for one machine, resolved once."""
+    def __init__(self, machine: "Machine") -> None:
+        self.machine = machine
+        self.runner: "RecipeRunner" = machine.components["RecipeRunner"]
+        self.consumer: "PowerConsumer | None" = machine.get_component("PowerConsumer")
+        self.producer: "PowerProducer | None" = machine.get_component("PowerProducer")
+        component_names = list(machine.components)
+        # PowerProducer.tick reads the buffer, so whether it ticks before or after the recipe matters
+        self.producer_first = bool(self.producer) and (
+            component_names.index("PowerProducer") < component_names.index("RecipeRunner")
+        )
+        inputs = machine.get_item_nodes("input")
+        outputs = machine.get_item_nodes("output")
+        self.in_slot = inputs[0].slot if len(inputs) == 1 else None
+        self.out_slot = outputs[0].slot if len(outputs) == 1 else None
+
+    @staticmethod
+    def supports(machine: "Machine") -> bool:
+        return (
+            "RecipeRunner" in machine.components
+            and _BATCHABLE_COMPONENTS.issuperset(machine.components)
+            and all(isinstance(node, ArrayItemIONode) for node in machine.get_item_nodes())
+        )
+
+    def fits(self, recipe: "Recipe") -> bool:
+        """Whether the batch path can run recipe on this machine exactly like RecipeRunner.tick would."""
+        if len(recipe.inputs) != 1 or self.in_slot is None:
+            return False
+        if recipe.output_type == "item":
+            return len(recipe.outputs) == 1 and self.out_slot is not None
+        return recipe.output_type == "energy" and self.producer is not None
+
+class RecipeBatcher:
+    def __init__(self, min_group_size: int = c.RECIPE_BATCH_MIN_GROUP) -> None:
+        """
+        Ticks machines that run the same recipe on the same machine type as one group, doing the RecipeRunner,
+        PowerConsumer and PowerProducer work as NumPy operations over node_store arrays instead of one Machine.tick
+        per machine. Results, including sleeping and wake ticks, match the per-object path exactly.
+
+        Only covers the common shape: machines made of those three components, one input node, one output node for
+        item recipes, single input recipes and grids already settled this tick (batched settlement). Everything else
+        and groups smaller than min_group_size (where array overhead outweighs the saving) tick per object.
+        Needs the numpy node store.
+        """
+        assert node_store.enabled, "Recipe batching needs the numpy node store (c.NODE_STORE)"
+        self.min_group_size = min_group_size
+        # machine -> plan, None for machines that can never be batched
+        self._plans: dict["Machine", _MachinePlan | None] = {}
+
+    def clear(self):
+        self._plans.clear()
+
+    def tick(self, machines: list["Machine"]) -> list["Machine"]:
+        """Ticks every machine it can in groups. Returns the rest, in their original order, to tick per object."""
+        groups: dict[tuple[str, "Recipe"], list[_MachinePlan]] = {}
+        rest: list["Machine"] = []
+        for machine in machines:
+            plan = self._plans.get(machine, False)
+            if plan is False:
+                plan = self._plans[machine] = _MachinePlan(machine) if _MachinePlan.supports(machine) else None
+            recipe = plan.runner.selected_recipe if plan else None
+            if plan is None or recipe is None or not plan.fits(recipe) or (
+                plan.consumer and plan.machine.power_grid and not plan.machine.power_grid.settled
+            ):
+                rest.append(machine)
+                continue
+            groups.setdefault((machine.machine_id, recipe), []).append(plan)
+
+        for (_, recipe), plans in groups.items():
+            if len(plans) < self.min_group_size:
+                rest.extend(plan.machine for plan in plans)
+            else:
+                self._tick_group(recipe, plans)
+
+        if len(rest) != len(machines):
+            # groups that fell back have to keep their place in the per-object order
+            order = {machine: i for i, machine in enumerate(machines)}
+            rest.sort(key=order.__getitem__)
+        return rest
+
+    def _tick_group(self, recipe: "Recipe", plans: list[_MachinePlan]):
+        now = machine_scheduler.tick
+        runners = [plan.runner for plan in plans]
+        quantities, capacities, items = node_store.quantities, node_store.capacities, node_store.items
+
+        ins = np.fromiter((plan.in_slot for plan in plans), dtype=np.intp, count=len(plans))
+        running = np.fromiter((runner.is_running for runner in runners), dtype=bool, count=len(plans))
+        start = np.fromiter((runner.start_tick for runner in runners), dtype=np.int64, count=len(plans))
+        idle = ~running
+
+        # RecipeRunner.evaluate_condition and PowerConsumer.evaluate_condition (Machine.can_run)
+        recipe_plan = plans[0].runner.plan
+        assert recipe_plan
+        (input_item, input_amount), = recipe_plan.inputs
+        can_run = idle & np.fromiter((plan.machine.enabled for plan in plans), dtype=bool, count=len(plans))
+        can_run &= np.fromiter((plan.consumer.has_power if plan.consumer else True for plan in plans),
+                               dtype=bool, count=len(plans))
+        can_run &= (items[ins] == input_item) & (quantities[ins] >= input_amount)
+
+        if recipe.output_type == "item":
+            (output_id, output_amount), = recipe_plan.outputs
+            outs = np.fromiter((plan.out_slot for plan in plans), dtype=np.intp, count=len(plans))
+            # an empty output node counts as holding the output, see RecipeRunner.can_start_item_recipe
+            can_run &= (capacities[outs] - quantities[outs] >= output_amount) | (
+                (items[outs] != NO_ITEM) & (items[outs] != output_id)
+            )
+        else:
+            energy = recipe_plan.energy
+            producers = [plan.producer for plan in plans]
+            buffers = np.fromiter((producer.current_buffer for producer in producers), # type: ignore[union-attr]
+                                  dtype=np.int64, count=len(plans))
+            buffers_before = buffers.copy()
+            can_run &= buffers + energy <= np.fromiter((producer.max_internal_buffer for producer in producers), # type: ignore[union-attr]
+                                                       dtype=np.int64, count=len(plans))
+        blocked = idle & ~can_run
+
+        # RecipeRunner.start_recipe, the one input node always holds enough
+        quantities[ins[can_run]] -= input_amount
+        start[can_run] = now
+        running |= can_run
+
+        # RecipeRunner.complete_recipe
+        completion = start + recipe_plan.span - 1
+        done = running & (now >= completion)
+        if recipe.output_type == "item":
+            done_outs = outs[done]
+            empty = items[done_outs] == NO_ITEM
+            items[done_outs[empty]] = output_id
+            space = capacities[done_outs] - quantities[done_outs]
+            quantities[done_outs] += np.where(items[done_outs] == output_id, np.clip(space, 0, output_amount), 0)
+        else:
+            buffers[done] += energy
+        running &= ~done
+
+        for i, plan in enumerate(plans):
+            runner = plan.runner
+            if idle[i]:
+                runner.blocked = bool(blocked[i])
+            runner.is_running = bool(running[i])
+            runner.start_tick = int(start[i])
+            plan.machine.invalidate_conditions()
+            if plan.consumer:
+                plan.consumer._cached_demand = None
+            if recipe.output_type == "energy":
+                producer = plan.producer
+                producer.current_buffer = int(buffers[i]) # type: ignore[union-attr]
+                producer.online = bool((buffers_before if plan.producer_first else buffers)[i] > 0) # type: ignore[union-attr]
+            elif plan.producer:
+                producer = plan.producer
+                producer.online = producer.can_produce()
+
+            # Machine.tick's sleep, every component here can sleep once the recipe is running or blocked
+            if runner.blocked or runner.is_running:
+                machine_scheduler.sleep(plan.machine, int(completion[i]) if runner.is_running else None)
@@ -0,0 +1,78 @@
+from math import floor
+from typing import TYPE_CHECKING, Callable, Sequence
+if TYPE_CHECKING:
+    from game.simulation_entity import SimulationEntity
+    from systems.world_view import WorldView
+
+import pygame as pg
+
+import data.configuration as c
+from infrastructure.spatial_hash import Rect, cells_in_rect
+from systems.camera import Camera
+
+# draws the static layer of entities onto a surface through a camera, see Renderer.draw_static
+DrawStatic = Callable[[pg.Surface, Camera, Sequence["SimulationEntity"], "WorldView"], None]
+
+class RenderChunkCache:
+    def __init__(self, draw_static: DrawStatic, chunk_size: tuple[int, int] = c.RENDER_CHUNK_SIZE,
+                 max_pixels: int = c.RENDER_CHUNK_CACHE_PIXELS) -> None:
+        """
+        The static layer of the world (draw_static) drawn into one surface per chunk_size world space chunk, at the
+        current zoom. A chunk is drawn again only when its version in the world view changes, which entity_manager
+        bumps when something touching it is added or removed, or when the zoom changes. Each frame is then one blit
+        per visible chunk instead of a draw call per entity; the renderer draws what changes on top.
+        """
+        self.draw_static = draw_static
+        self.chunk_width, self.chunk_height = chunk_size
+        self.max_pixels = max_pixels
+        # chunk -> (chunk version it was drawn at, surface), least recently on screen first
+        self._chunks: dict[tuple[int, int], tuple[int, pg.Surface]] = {}
+        self._pixels = 0
+        self._zoom: float | None = None
+        # chunks drawn again in the last frame
+        self.redrawn = 0
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def clear(self):
+        self._chunks.clear()
+        self._pixels = 0
+
+    def draw(self, surface: pg.Surface, camera: Camera, world: "WorldView", rect: Rect | None = None):
+        """Blits the chunks on screen, or with rect (world space) only those touching it."""
+        if camera.zoom != self._zoom:
+            self.clear()
+            self._zoom = camera.zoom
+
+        self.redrawn = 0
+        visible = list(cells_in_rect(rect or camera.get_view_rect(), (self.chunk_width, self.chunk_height)))
+        for chunk in visible:
+            version = world.chunk_version(chunk)
+            cached = self._chunks.pop(chunk, None)
+            if cached is None or cached[0] != version:
+                if cached:
+                    self._pixels -= cached[1].width * cached[1].height
+                cached = (version, self._draw_chunk(chunk, camera.zoom, world))
+                self._pixels += cached[1].width * cached[1].height
+                self.redrawn += 1
+            self._chunks[chunk] = cached
+
+            x, y = camera.world_to_screen((chunk[0] * self.chunk_width, chunk[1] * self.chunk_height))
+            # floored so neighbouring chunks, a whole number of pixels apart, always meet exactly
+            surface.blit(cached[1], (floor(x), floor(y)))
+
+        # visible chunks were moved to the end, so only chunks off screen are dropped. Drawing just a rect does not
+        # see every chunk on screen, so leaves dropping to the next full draw
+        while rect is None and self._pixels > self.max_pixels and len(self._chunks) > len(visible):
+            _, dropped = self._chunks.pop(next(iter(self._chunks)))
+            self._pixels -= dropped.width * dropped.height
+
+    def _draw_chunk(self, chunk: tuple[int, int], zoom: float, world: "WorldView") -> pg.Surface:
+        rect = (chunk[0] * self.chunk_width, chunk[1] * self.chunk_height, self.chunk_width, self.chunk_height)
+        size = (round(self.chunk_width * zoom), round(self.chunk_height * zoom))
+        surface = pg.Surface(size).convert()
+        # a camera looking at just this chunk
+        chunk_camera = Camera(size, rect[:2], zoom)
+        self.draw_static(surface, chunk_camera, world.drawables_in_rect(rect), world)
+        return surface
@@ -1,20 +1,40 @@
+from typing import TYPE_CHECKING, Sequence
+if TYPE_CHECKING:
+    from game.simulation_entity import SimulationEntity
+
 import pygame as pg
 
 import data.configuration as c
 from infrastructure.asset_manager import asset_manager
-from infrastructure.entity_manager import entity_manager
-from infrastructure.global_inventory import global_inventory
 from infrastructure.input_manager import input_manager
 from infrastructure.tool_manager import tool_manager, LinkTool, PlaceTool
-from infrastructure.io_registry import io_registry
 from infrastructure.data_registry import data_registry
-from infrastructure.utils import interpolate_color, get_footprint_center
+from infrastructure.utils import interpolate_color, get_placement_position
+from components.ionode import IONode
+from game.machine import Machine
+from game.power_cable import PowerCable
+from game.resource_node import ResourceNode
+from game.transfer_link import TransferLink
 from systems.camera import Camera
+from systems.dirty_regions import DirtyRegions
+from systems.profiler import TickProfiler
+from systems.render_chunks import RenderChunkCache
+from systems.world_view import IDLE_ACTIVITY, WorldView
 
 
 class Renderer:
-    def __init__(self) -> None:
+    def __init__(self, profiler: TickProfiler | None = None) -> None:
         self.debug_font = pg.font.SysFont("arial", 16)
+        self.profiler = profiler
+        # entities drawn and skipped by view culling in the last frame
+        self.drawn = 0
+        self.culled = 0
+        # static layer cache, see draw_static
+        self.chunk_cache = RenderChunkCache(self.draw_static) if c.CHUNKED_RENDERING else None
+        # debug label name -> (text, rendered text), see debug_label
+        self._debug_labels: dict[str, tuple[str, pg.Surface]] = {}
+        # where the profiler overlay was last drawn
+        self.profiler_rect: pg.Rect | None = None
     
     def generate_background_grid_surface(self, tile_size=256, grid_size=(2048, 2048),
                                         color1=(30, 30, 30), color2=(31, 31, 31)):
@@ -37,7 +57,7 @@ class Renderer:
 
     def draw_cached_background(self, surface: pg.Surface, camera, bg_surface: pg.Surface):
         screen_w, screen_h = surface.get_size()
-        offset_x, offset_y = camera.get_offset()
+        offset_x, offset_y = camera.world_to_screen((0, 0))
         bg_w, bg_h = bg_surface.get_size()
 
         x0 = int(offset_x) % bg_w - bg_w
@@ -48,87 +68,34 @@ class Renderer:
                 surface.blit(bg_surface, (x, y))
                 # pg.draw.rect(surface, (0, 0, 0), pg.Rect(x, y, bg_w, bg_h), 5)
     
-    def render(self, surface: pg.Surface, mouse_pos: tuple[int, int], camera: Camera) -> None:
-        offset = camera.get_offset()
-        surface.fill((30, 30, 30))
-        self.draw_cached_background(surface, camera, asset_manager.assets["background"]["grid"])
+    def render(self, surface: pg.Surface, mouse_pos: tuple[int, int], camera: Camera, world: WorldView,
+               rect: pg.Rect | None = None) -> None:
+        """
+        Draws world, which is either the live world or the latest snapshot from a SimulationWorker. With rect only
+        what touches that screen rect is drawn, for dirty rectangle drawing (see Game.draw_changes); the caller
+        clips surface to it.
+        """
+        zoom = camera.zoom
+        surface.fill((30, 30, 30), rect)
         
         # tile_rect = pg.Rect(camera.world_to_screen(input_manager.last_mouse_pos_snapped), (c.BASE_MACHINE_WIDTH/2, c.BASE_MACHINE_HEIGHT/2))
         # pg.draw.rect(surface, (60, 60, 60), tile_rect)
         # pg.draw.circle(surface, (255, 0, 0), camera.world_to_screen(input_manager.mouse_pos_closest_corner), 5)
-        resource_nodes = entity_manager.get_resource_nodes()
-        for node in resource_nodes:
-            pos = camera.world_to_screen(node.position)
-            # print(node.type)
-            img = asset_manager.get("resource_nodes", node.type)
-            surface.blit(img, pos)
-        
-        
-        machines = entity_manager.get_machines()
-        for machine in machines:
-            surf = asset_manager.get("machines", machine.machine_id)
-            pos = camera.world_to_screen(machine.position)
-            if surf != asset_manager.missing_texture:
-                if isinstance(surf, list):
-                    surface.blit(surf[0], pos)
-                else:
-                    surface.blit(surf, pos)
-            else:
-                for tile in machine.shape:
-                    color = (100, 100, 100)
-                    if input_manager.hovered_item is machine:
-                        color = (140, 140, 140)
-                    pg.draw.rect(surface, color, pg.Rect(
-                        pos[0]+tile[0] * c.BASE_MACHINE_WIDTH, pos[1]+tile[1] * c.BASE_MACHINE_HEIGHT, 
-                        c.BASE_MACHINE_WIDTH, c.BASE_MACHINE_HEIGHT))
-        
-        for cable in entity_manager.get_power_cables():
-            start_size, end_size = 2, 2
-            if input_manager.mouse_pos_closest_corner == cable.start_pos: start_size += 2
-            if input_manager.mouse_pos_closest_corner == cable.end_pos: end_size += 2
-            
-            start_size = 0 if io_registry.get_node(cable.start_pos) else start_size
-            end_size = 0 if io_registry.get_node(cable.end_pos) else end_size
-            
-            on_color, off_color = (255, 0, 0), (100, 0, 0)
-            
-            color = interpolate_color(cable.grid.ticks_since_online, 0, 25, on_color, off_color)
-            start, end = camera.world_to_screen(cable.start_pos), camera.world_to_screen(cable.end_pos)
-
-            pg.draw.aaline(surface, color, start, end, 2)
-            pg.draw.circle(surface, color, (start[0]+start_size//2, start[1]+start_size//2), start_size)
-            pg.draw.circle(surface, color, (end[0]+end_size//2, end[1]+end_size//2), end_size)
-        
-        for link in entity_manager.get_transfer_links():
-            start_size, end_size = 2, 2
-            if input_manager.mouse_pos_closest_corner == link.start_pos: start_size += 2
-            if input_manager.mouse_pos_closest_corner == link.end_pos: end_size += 2
-            on_color = (241, 201, 120) if link.type == "item" else (97, 158, 249)
-            start, end = camera.world_to_screen(link.start_pos), camera.world_to_screen(link.end_pos)
-            color = interpolate_color(link.ticks_since_transfer, 0, 25, on_color, (150, 150, 150))
-
-            start_size = 0 if io_registry.get_node(link.start_pos) else start_size
-            end_size = 0 if io_registry.get_node(link.end_pos) else end_size
-
-            pg.draw.aaline(surface, color, start, end, 2)
-            pg.draw.circle(surface, color, (start[0]+start_size//2, start[1]+start_size//2), start_size)
-            pg.draw.circle(surface, color, (end[0]+end_size//2, end[1]+end_size//2), end_size)
-        
-        for machine in machines:
-            for node in machine.nodes:
-                size = 4
-                if node is input_manager.hovered_item:
-                    size += 2
-                pos = camera.world_to_screen(node.abs_pos)
-                if node.kind == "item":
-                    if node.direction == "input":
-                        pg.draw.circle(surface, (0, 0, 255), pos, size)
-                    if node.direction == "output":
-                        pg.draw.circle(surface, (204, 102, 51), pos, size)
-                if node.kind == "energy":
-                    pg.draw.circle(surface, (255, 0, 0), pos, size)
-                if node.kind == "fluid":
-                    pg.draw.circle(surface, (0, 0, 255), pos, size)
+        # only entities whose drawable bounds touch the view (or rect) are drawn
+        if rect is None:
+            view = camera.get_view_rect()
+            visible = world.drawables_in_rect(view)
+            self.drawn = len(visible)
+            self.culled = world.drawable_count() - self.drawn
+        else:
+            view = camera.screen_rect_to_world(rect)
+            visible = world.drawables_in_rect(view)
+
+        if self.chunk_cache is not None:
+            self.chunk_cache.draw(surface, camera, world, None if rect is None else view)
+        else:
+            self.draw_static(surface, camera, visible, world)
+        self.draw_dynamic(surface, camera, visible, world)
         
         if tool_manager.current_tool:
             if isinstance(tool_manager.current_tool, LinkTool):
@@ -139,20 +106,21 @@ class Renderer:
             if isinstance(tool_manager.current_tool, PlaceTool):
                 if tool_manager.context.selected_machine_id:
                     # get machine center position
-                    mouse_pos = camera.world_to_screen(input_manager.mouse_pos_closest_corner)
                     machine_data = data_registry.machines[tool_manager.context.selected_machine_id]
-                    fpx, fpy = get_footprint_center(machine_data['footprint'])
-                    center_pos = (mouse_pos[0] - fpx*c.BASE_MACHINE_WIDTH, mouse_pos[1] - fpy*c.BASE_MACHINE_HEIGHT)
+                    world_pos = get_placement_position(machine_data['footprint'], input_manager.mouse_pos_closest_corner)
+                    center_pos = camera.world_to_screen(world_pos)
 
-                    # draw machine profile
-                    for x, y in machine_data['footprint']:
-                        pos = (center_pos[0] + x*c.BASE_MACHINE_WIDTH, center_pos[1] + (y*c.BASE_MACHINE_HEIGHT))
-                        pg.draw.rect(surface, (100//2, 100//2, 100//2), (pos, c.BASE_MACHINE_SIZE))
+                    # draw machine profile, tinted red if it would collide with an existing machine
+                    profile_color = (100//2, 100//2, 100//2)
+                    if not world.can_place(tool_manager.context.selected_machine_id, world_pos):
+                        profile_color = (120, 40, 40)
+                    for tile in machine_data['footprint']:
+                        pg.draw.rect(surface, profile_color, self.tile_rect(center_pos, tile, zoom))
                     
                     # draw node previews
                     for node in machine_data["ionodes"]:
                         ox, oy = node['offset']
-                        pos = (center_pos[0] + ox*c.BASE_MACHINE_WIDTH, center_pos[1] + oy*c.BASE_MACHINE_HEIGHT)
+                        pos = (center_pos[0] + ox*c.BASE_MACHINE_WIDTH*zoom, center_pos[1] + oy*c.BASE_MACHINE_HEIGHT*zoom)
                         if node['type'] == 'energy':
                             color = (255//2, 0, 0)
                         elif node['type'] == 'item':
@@ -165,20 +133,339 @@ class Renderer:
                         pg.draw.circle(surface, color, pos, 4)
         
         # debug labels
-        f = self.debug_font.render(str(camera.screen_to_world(mouse_pos)), True, (255, 255, 255))
-        surface.blit(f, (10, 10))
+        for _, label, pos in self.debug_labels(surface, mouse_pos, camera, world):
+            if rect is None or rect.colliderect(label.get_rect(topleft=pos)):
+                surface.blit(label, pos)
+
+        if self.profiler and self.profiler.enabled:
+            if rect is None or self.profiler_rect is None or rect.colliderect(self.profiler_rect):
+                self.draw_profiler_overlay(surface, self.profiler)
+
+    @staticmethod
+    def partition(entities: Sequence["SimulationEntity"]) -> tuple[list[ResourceNode], list[Machine], list[PowerCable], list[TransferLink]]:
+        resource_nodes: list[ResourceNode] = []
+        machines: list[Machine] = []
+        power_cables: list[PowerCable] = []
+        transfer_links: list[TransferLink] = []
+        for entity in entities:
+            if isinstance(entity, Machine):
+                machines.append(entity)
+            elif isinstance(entity, TransferLink):
+                transfer_links.append(entity)
+            elif isinstance(entity, PowerCable):
+                power_cables.append(entity)
+            elif isinstance(entity, ResourceNode):
+                resource_nodes.append(entity)
+        return resource_nodes, machines, power_cables, transfer_links
+
+    def draw_static(self, surface: pg.Surface, camera: Camera, entities: Sequence["SimulationEntity"], world: WorldView):
+        """
+        Everything about entities that only changes when they are added or removed: the background, resource nodes,
+        machine sprites and footprints, IO nodes, and cables and links in their resting colours (grid online, link
+        idle). This is the layer RenderChunkCache caches, draw_dynamic draws the rest on top.
+        """
+        zoom = camera.zoom
+        far_lod = camera.far_lod
+        self.draw_cached_background(surface, camera, asset_manager.get_scaled("background", "grid", zoom))
+        resource_nodes, machines, power_cables, transfer_links = self.partition(entities)
 
-        f = self.debug_font.render("\n".join([f"{key}: {val}" for key, val in global_inventory._inventory.items()]), True, (255, 255, 255))
-        surface.blit(f, (surface.width - f.get_width() - 15, 10))
+        for node in resource_nodes:
+            pos = camera.world_to_screen(node.position)
+            # print(node.type)
+            img = asset_manager.get_scaled("resource_nodes", node.type, zoom)
+            surface.blit(img, pos)
         
-        f = self.debug_font.render(str(input_manager.last_mouse_pos_snapped), True, (255, 255, 255))
-        surface.blit(f, (10, 40))
+        for machine in machines:
+            pos = camera.world_to_screen(machine.position)
+            # sprites are only drawn up close, far out every machine is its solid footprint
+            if not far_lod and asset_manager.is_asset("machines", machine.machine_id):
+                surf = asset_manager.get_scaled("machines", machine.machine_id, zoom)
+                # animations are drawn by draw_dynamic
+                if not isinstance(surf, list):
+                    surface.blit(surf, pos)
+            else:
+                for tile in machine.shape:
+                    pg.draw.rect(surface, (100, 100, 100), self.tile_rect(pos, tile, zoom))
+        
+        if far_lod:
+            # IO node circles would be a few pixels wide far out, they are left out there
+            self.draw_far_links(surface, camera, power_cables, transfer_links)
+            return
         
+        for cable in power_cables:
+            self.draw_link(surface, camera, world, cable, self.cable_color(0))
+        for link in transfer_links:
+            self.draw_link(surface, camera, world, link, self.link_color(link, IDLE_ACTIVITY))
+        for machine in machines:
+            for node in machine.nodes:
+                self.draw_io_node(surface, camera, node)
+
+    def draw_dynamic(self, surface: pg.Surface, camera: Camera, entities: Sequence["SimulationEntity"], world: WorldView):
+        """Draws over draw_static whatever changes between frames: machine animations, hover highlights, and cables
+        and links that are not in their resting colour."""
+        zoom = camera.zoom
+        far_lod = camera.far_lod
+        hovered_item = input_manager.hovered_item
+        _, machines, power_cables, transfer_links = self.partition(entities)
+
+        # machines drawn over have their links and IO nodes drawn again on top
+        redrawn: list[Machine] = []
+        for machine in machines:
+            pos = camera.world_to_screen(machine.position)
+            frame = self.animation_frame(machine, camera, world)
+            if frame is not None:
+                surface.blit(frame, pos)
+                redrawn.append(machine)
+            elif machine is hovered_item and self.draws_footprint(machine, camera):
+                for tile in machine.shape:
+                    pg.draw.rect(surface, (140, 140, 140), self.tile_rect(pos, tile, zoom))
+                redrawn.append(machine)
+        
+        if far_lod:
+            return
+        
+        corner = input_manager.mouse_pos_closest_corner
+        covered = self.covered_corners(redrawn)
+        # ends of the links drawn over, IO nodes there go back on top
+        link_ends: set[tuple[int, int]] = set()
+        for link in (*power_cables, *transfer_links):
+            color, at_rest = self.link_state(link, world)
+            if (not at_rest or corner == link.start_pos or corner == link.end_pos
+                    or link.start_pos in covered or link.end_pos in covered):
+                self.draw_link(surface, camera, world, link, color, corner)
+                link_ends.update((link.start_pos, link.end_pos))
+        
+        if link_ends or covered:
+            for machine in machines:
+                for node in machine.nodes:
+                    if node.abs_pos in link_ends or node.abs_pos in covered:
+                        self.draw_io_node(surface, camera, node)
+        if isinstance(hovered_item, IONode):
+            self.draw_io_node(surface, camera, hovered_item, 6)
+
+    def mark_regions(self, regions: DirtyRegions, surface: pg.Surface, mouse_pos: tuple[int, int], camera: Camera,
+                     world: WorldView):
+        """
+        Marks everything render draws that can change while the camera stays put: what draw_dynamic draws for its
+        own sake (animated and hovered machines, links not at rest or with a hovered end, the hovered IO node), debug
+        labels, the profiler overlay and tool previews. Call before render, with the same arguments.
+        """
+        visible = world.drawables_in_rect(camera.get_view_rect())
+        self.drawn = len(visible)
+        self.culled = world.drawable_count() - self.drawn
+        _, machines, power_cables, transfer_links = self.partition(visible)
+        hovered_item = input_manager.hovered_item
+
+        for machine in machines:
+            frame = self.animation_frame(machine, camera, world)
+            if frame is not None:
+                regions.mark(machine, self.machine_rect(machine, camera), frame)
+            elif machine is hovered_item and self.draws_footprint(machine, camera):
+                regions.mark(machine, self.machine_rect(machine, camera), "hovered")
+        
+        if not camera.far_lod:
+            corner = input_manager.mouse_pos_closest_corner
+            for link in (*power_cables, *transfer_links):
+                color, at_rest = self.link_state(link, world)
+                hovered_end = corner if corner == link.start_pos or corner == link.end_pos else None
+                if not at_rest or hovered_end:
+                    regions.mark(link, self.link_rect(link, camera), (color, hovered_end))
+            if isinstance(hovered_item, IONode):
+                rect = pg.Rect(0, 0, 16, 16)
+                rect.center = camera.world_to_screen(hovered_item.abs_pos)
+                regions.mark("hovered node", rect, hovered_item)
+
+        for name, label, pos in self.debug_labels(surface, mouse_pos, camera, world):
+            regions.mark(("debug label", name), label.get_rect(topleft=pos), label)
+        if self.profiler and self.profiler.enabled:
+            # timings change every tick
+            regions.mark("profiler", self.profiler_rect or surface.get_rect(), object())
+        preview = self.tool_preview_state()
+        if preview:
+            regions.mark("tool preview", surface.get_rect(), preview)
+
+    def animation_frame(self, machine: Machine, camera: Camera, world: WorldView) -> pg.Surface | None:
+        """Current frame of an animated machine sprite, None for machines without one (or drawn as footprints)."""
+        if self.draws_footprint(machine, camera):
+            return None
+        frames = asset_manager.get_scaled("machines", machine.machine_id, camera.zoom)
+        if not isinstance(frames, list):
+            return None
+        progress = world.recipe_progress(machine) or 0.0
+        return frames[min(int(progress * len(frames)), len(frames) - 1)]
+
+    @staticmethod
+    def draws_footprint(machine: Machine, camera: Camera) -> bool:
+        # sprites are only drawn up close, far out every machine is its solid footprint
+        return camera.far_lod or not asset_manager.is_asset("machines", machine.machine_id)
+
+    def link_state(self, link: TransferLink | PowerCable, world: WorldView) -> tuple[tuple[int, int, int], bool]:
+        """Current colour of a link or cable, and whether that is the resting colour draw_static draws it in."""
+        if isinstance(link, PowerCable):
+            activity = world.grid_activity(link)
+            return self.cable_color(activity), activity <= 0
+        activity = world.link_activity(link)
+        return self.link_color(link, activity), activity >= IDLE_ACTIVITY
+
+    def machine_rect(self, machine: Machine, camera: Camera) -> pg.Rect:
+        """Screen rect of a machine's footprint, grown to take in its IO node circles."""
+        pos = camera.world_to_screen(machine.position)
+        tiles = [self.tile_rect(pos, tile, camera.zoom) for tile in machine.shape]
+        return tiles[0].unionall(tiles[1:]).inflate(16, 16)
+
+    @staticmethod
+    def link_rect(link: TransferLink | PowerCable, camera: Camera) -> pg.Rect:
+        """Screen rect of a link or cable, grown to take in its end circles."""
+        (x0, y0), (x1, y1) = camera.world_to_screen(link.start_pos), camera.world_to_screen(link.end_pos)
+        return pg.Rect(min(x0, x1), min(y0, y1), abs(x1 - x0), abs(y1 - y0)).inflate(16, 16)
+
+    @staticmethod
+    def tool_preview_state() -> tuple | None:
+        """What the current tool preview depends on, None when no preview is drawn."""
+        tool = tool_manager.current_tool
+        if isinstance(tool, LinkTool) and tool.placing:
+            return ("link", tool.start_pos, input_manager.mouse_pos_closest_corner)
+        if isinstance(tool, PlaceTool) and tool_manager.context.selected_machine_id:
+            return ("place", tool_manager.context.selected_machine_id, input_manager.mouse_pos_closest_corner)
+        return None
+
+    def debug_label(self, name: str, text: str) -> pg.Surface:
+        """text rendered in the debug font, rendered again only when the text of label name changes."""
+        cached = self._debug_labels.get(name)
+        if cached is None or cached[0] != text:
+            cached = self._debug_labels[name] = (text, self.debug_font.render(text, True, (255, 255, 255)))
+        return cached[1]
+
+    def debug_labels(self, surface: pg.Surface, mouse_pos: tuple[int, int], camera: Camera,
+                     world: WorldView) -> list[tuple[str, pg.Surface, tuple[int, int]]]:
+        """(name, rendered text, screen position) of each debug label."""
         hovered_item = input_manager.hovered_item
         if hovered_item:
             obj_name = str(input_manager.hovered_item).split('.')[2].split(' ')[0]
         else:
             obj_name = "Nothing hovered"
-        f = self.debug_font.render(str(obj_name), True, (255, 255, 255))
-        surface.blit(f, (10, 40+40*1))
-    
\ No newline at end of file
+
+        culling = f"drawn: {self.drawn} | culled: {self.culled}"
+        if self.chunk_cache is not None:
+            culling += f" | chunks: {len(self.chunk_cache)} ({self.chunk_cache.redrawn} redrawn)"
+
+        inventory = self.debug_label("inventory", "\n".join([f"{key}: {val}" for key, val in world.inventory.items()]))
+        return [
+            ("mouse", self.debug_label("mouse", str(camera.screen_to_world(mouse_pos))), (10, 10)),
+            ("inventory", inventory, (surface.width - inventory.get_width() - 15, 10)),
+            ("snapped", self.debug_label("snapped", str(input_manager.last_mouse_pos_snapped)), (10, 40)),
+            ("hovered", self.debug_label("hovered", str(obj_name)), (10, 40+40*1)),
+            ("culling", self.debug_label("culling", culling), (10, 40+40*2)),
+        ]
+
+    @staticmethod
+    def covered_corners(machines: list[Machine]) -> set[tuple[int, int]]:
+        """Half-tile corners on or inside the footprints of machines, which is where link ends and IO nodes sit."""
+        half_width, half_height = c.BASE_MACHINE_WIDTH // 2, c.BASE_MACHINE_HEIGHT // 2
+        corners: set[tuple[int, int]] = set()
+        for machine in machines:
+            for tile_x, tile_y in machine.shape:
+                x = machine.position[0] + tile_x * c.BASE_MACHINE_WIDTH
+                y = machine.position[1] + tile_y * c.BASE_MACHINE_HEIGHT
+                corners.update((x + i * half_width, y + j * half_height) for i in range(3) for j in range(3))
+        return corners
+
+    @staticmethod
+    def cable_color(activity: int) -> tuple[int, int, int]:
+        return interpolate_color(activity, 0, 25, (255, 0, 0), (100, 0, 0))
+
+    @staticmethod
+    def link_color(link: TransferLink, activity: int) -> tuple[int, int, int]:
+        on_color = (241, 201, 120) if link.type == "item" else (97, 158, 249)
+        return interpolate_color(activity, 0, 25, on_color, (150, 150, 150))
+
+    @staticmethod
+    def draw_link(surface: pg.Surface, camera: Camera, world: WorldView, link: TransferLink | PowerCable,
+                  color: tuple[int, int, int], hovered_corner: tuple[int, int] | None = None):
+        """Draws a link or cable, with a circle on each end not on an IO node. The end on hovered_corner is bigger."""
+        start_size, end_size = 2, 2
+        if hovered_corner == link.start_pos: start_size += 2
+        if hovered_corner == link.end_pos: end_size += 2
+        
+        start_size = 0 if world.has_node_at(link.start_pos) else start_size
+        end_size = 0 if world.has_node_at(link.end_pos) else end_size
+        
+        start, end = camera.world_to_screen(link.start_pos), camera.world_to_screen(link.end_pos)
+        pg.draw.aaline(surface, color, start, end, 2)
+        pg.draw.circle(surface, color, (start[0]+start_size//2, start[1]+start_size//2), start_size)
+        pg.draw.circle(surface, color, (end[0]+end_size//2, end[1]+end_size//2), end_size)
+
+    @staticmethod
+    def draw_io_node(surface: pg.Surface, camera: Camera, node: IONode, size: int = 4):
+        pos = camera.world_to_screen(node.abs_pos)
+        if node.kind == "item":
+            if node.direction == "input":
+                pg.draw.circle(surface, (0, 0, 255), pos, size)
+            if node.direction == "output":
+                pg.draw.circle(surface, (204, 102, 51), pos, size)
+        if node.kind == "energy":
+            pg.draw.circle(surface, (255, 0, 0), pos, size)
+        if node.kind == "fluid":
+            pg.draw.circle(surface, (0, 0, 255), pos, size)
+
+    @staticmethod
+    def tile_rect(screen_pos: tuple[float, float], tile: tuple[int, int], zoom: float) -> pg.Rect:
+        """Screen rect of one footprint tile of a machine drawn at screen_pos. Edges are rounded, not truncated, so
+        neighbouring tiles meet without gaps at any zoom."""
+        tile_w, tile_h = c.BASE_MACHINE_WIDTH * zoom, c.BASE_MACHINE_HEIGHT * zoom
+        left, top = round(screen_pos[0] + tile[0] * tile_w), round(screen_pos[1] + tile[1] * tile_h)
+        right, bottom = round(screen_pos[0] + (tile[0] + 1) * tile_w), round(screen_pos[1] + (tile[1] + 1) * tile_h)
+        return pg.Rect(left, top, right - left, bottom - top)
+
+    def draw_far_links(self, surface: pg.Surface, camera: Camera,
+                       power_cables: list[PowerCable], transfer_links: list[TransferLink]):
+        """
+        Far level of detail for cables and links: one plain line per distinct on-screen segment, coloured by type
+        only. Far out, parallel and overlapping links round to the same pixels and are drawn once, and links shorter
+        than a pixel are not drawn at all.
+        """
+        segments: dict[tuple[tuple[int, int], tuple[int, int]], tuple[int, int, int]] = {}
+        for cable in power_cables:
+            self._add_far_segment(segments, camera, cable.start_pos, cable.end_pos, (180, 0, 0))
+        for link in transfer_links:
+            color = (241, 201, 120) if link.type == "item" else (97, 158, 249)
+            self._add_far_segment(segments, camera, link.start_pos, link.end_pos, color)
+        for (start, end), color in segments.items():
+            pg.draw.line(surface, color, start, end)
+
+    @staticmethod
+    def _add_far_segment(segments: dict, camera: Camera, start_pos, end_pos, color: tuple[int, int, int]):
+        sx, sy = camera.world_to_screen(start_pos)
+        ex, ey = camera.world_to_screen(end_pos)
+        start, end = (round(sx), round(sy)), (round(ex), round(ey))
+        if start == end:
+            return
+        # direction does not matter for a plain line
+        segments.setdefault((start, end) if start < end else (end, start), color)
+
+    def draw_profiler_overlay(self, surface: pg.Surface, profiler: TickProfiler, max_entity_rows: int = 6):
+        """Draws p50/p99 tick, phase and (slowest) entity type timings in the bottom left corner."""
+        budget_ms = 1000 / c.SIMULATION_TICKS_PER_SECOND
+        summary = profiler.summary()
+
+        rows: list[tuple[str, dict[str, float]]] = [("tick", summary["tick"]["total"])]
+        rows += list(summary["phases"].items())
+        slowest = sorted(summary["entities"].items(), key=lambda item: item[1]["p99"], reverse=True)
+        rows += [(f"  {name}", stats) for name, stats in slowest[:max_entity_rows]]
+
+        line_height = self.debug_font.get_linesize()
+        panel = pg.Rect(10, surface.height - 20 - line_height * (len(rows) + 1), 300, line_height * (len(rows) + 1) + 10)
+        overlay = pg.Surface(panel.size, pg.SRCALPHA)
+        overlay.fill((0, 0, 0, 160))
+        surface.blit(overlay, panel)
+        self.profiler_rect = panel
+
+        columns = (panel.x + 5, panel.x + 170, panel.x + 235)
+        header = ("profiler (ms)", "p50", f"p99 / {budget_ms:.1f}")
+        for x, text in zip(columns, header):
+            surface.blit(self.debug_font.render(text, True, (200, 200, 200)), (x, panel.y + 5))
+        for i, (name, stats) in enumerate(rows):
+            color = (255, 90, 90) if stats["p99"] > budget_ms else (255, 255, 255)
+            y = panel.y + 5 + line_height * (i + 1)
+            for x, text in zip(columns, (name, f"{stats['p50']:.2f}", f"{stats['p99']:.2f}")):
+                surface.blit(self.debug_font.render(text, True, color), (x, y))
@@ -1,68 +1,189 @@
+from infrastructure.command_queue import command_queue
 from infrastructure.entity_manager import entity_manager
+from infrastructure.machine_scheduler import machine_scheduler
+from infrastructure.node_store import node_store
+from infrastructure.transfer_registry import transfer_registry, cable_registry
+from systems.profiler import TickProfiler
 from logger import logger
 import data.configuration as c
+from time import perf_counter
+from typing import Any, Callable, Iterable, Literal, TYPE_CHECKING
+if TYPE_CHECKING:
+    from game.machine import Machine
+    from systems.recipe_batch import RecipeBatcher
 
 class Simulation:
-    def __init__(self) -> None:
+    # Every entity runs this many times per tick, as when the last loop of the tick ticked every entity again after
+    # the phases. Machine, recipe and link rates are tuned to it
+    STEPS_PER_TICK = 2
+
+    def __init__(self, power_settlement: Literal["batched", "immediate"] = c.POWER_SETTLEMENT_MODE,
+                 max_ticks_per_frame: int = c.MAX_TICKS_PER_FRAME, report_time_dilation: bool = False,
+                 batch_recipes: bool = c.BATCH_RECIPES) -> None:
+        """
+        Args:
+            power_settlement (str, optional): How grids hand out power, see c.POWER_SETTLEMENT_MODE.
+            max_ticks_per_frame (int, optional): Most ticks update() runs to catch up in one frame. Backlog beyond
+                that is dropped so a slow frame cannot snowball into slower ones (spiral of death).
+            report_time_dilation (bool, optional): Log a warning every second the simulation ran slower than real time.
+            batch_recipes (bool, optional): Tick groups of identical recipe machines as NumPy batches, see
+                systems.recipe_batch. Ignored with a warning unless the numpy node store is enabled.
+        """
+        assert power_settlement in ("batched", "immediate"), f"Unknown power settlement mode {power_settlement}"
+        assert max_ticks_per_frame >= 1, "max_ticks_per_frame must be at least 1"
+        self.power_settlement = power_settlement
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.report_time_dilation = report_time_dilation
         self._tick_time = 0.0
         
         self._tick_count = 0
+        # total steps run (STEPS_PER_TICK per tick), never reset. Machine and link timers count these
+        self.tick_number = 0
         self._tps_time = 0.0
         self.tps: tuple[int, int] = (0, c.SIMULATION_TICKS_PER_SECOND)
+        # simulated time / real time over the last second; below 1.0 when ticks had to be dropped
+        self.time_dilation = 1.0
+        self.dropped_ticks = 0
+        self.profiler = TickProfiler()
+
+        self.recipe_batcher: "RecipeBatcher | None" = None
+        if batch_recipes:
+            if node_store.enabled:
+                from systems.recipe_batch import RecipeBatcher
+                self.recipe_batcher = RecipeBatcher()
+            else:
+                logger.warning("Recipe batching needs the numpy node store (c.NODE_STORE), ticking machines per object")
+
+        # Ordered tick phases. Kept as a list so tools like the benchmark can time each phase on its own.
+        self.phases: list[tuple[str, Callable[[], None]]] = [
+            ("producers", self._tick_producers),
+            ("grids", self._tick_grids),
+            ("consumers", self._tick_consumers),
+            ("machines", self._tick_other_machines),
+            ("links", self._tick_links),
+            ("unscheduled", self._tick_unscheduled),
+        ]
+        if node_store.enabled:
+            # machines leave emptied nodes for the store to clear in one go, before links read them
+            self.phases.insert(4, ("nodes", self._clear_empty_nodes))
     
-    def update(self, dt: float) -> None:
+    def update(self, dt: float) -> int:
+        """Applies queued commands, then runs however many ticks dt is worth. Returns the number of ticks run."""
+        command_queue.run_pending()
+        tick_interval = 1.0 / c.SIMULATION_TICKS_PER_SECOND
         self._tick_time += dt
 
+        # Fixed timestep: run every tick interval that has built up, up to max_ticks_per_frame
+        ticks_run = 0
+        while self._tick_time >= tick_interval and ticks_run < self.max_ticks_per_frame:
+            self._tick_time -= tick_interval
+            self._tick()
+            ticks_run += 1
+
+        # Spiral of death guard: drop whole intervals we could not run, keep the fractional remainder
+        if self._tick_time >= tick_interval:
+            backlog = int(self._tick_time / tick_interval)
+            self.dropped_ticks += backlog
+            self._tick_time -= backlog * tick_interval
+
         self._tps_time += dt
         if self._tps_time >= 1.0:
             # logger.debug(f"TPS: {self._tick_count} | TARGET: {c.SIMULATION_TICKS_PER_SECOND}")
             self.tps = (self._tick_count, c.SIMULATION_TICKS_PER_SECOND)
+            self.time_dilation = self._tick_count * tick_interval / self._tps_time
+            if self.report_time_dilation and self.time_dilation < 0.99:
+                logger.warning(f"Simulation running at {self.time_dilation:.0%} of real time ({self.dropped_ticks} ticks dropped)")
             self._tick_count = 0
-            self._tps_time -= 1.0
+            self._tps_time = 0.0
 
-        if not self._tick_time > 1.0 / c.SIMULATION_TICKS_PER_SECOND:
-            return
-        self._tick_time -= 1.0 / c.SIMULATION_TICKS_PER_SECOND
-        self._tick()
+        return ticks_run
+
+    def time_until_next_tick(self) -> float:
+        return max(0.0, 1.0 / c.SIMULATION_TICKS_PER_SECOND - self._tick_time)
     
     def _tick(self):
         self._tick_count += 1
-        # Reset transfer links
-        for link in entity_manager.get_transfer_links():
-            link.used_this_tick = link.NOT_USED
-
-        ticked_entities = set()
-        # update power producers
-        for machine in entity_manager.get_machines_with_component("PowerProducer"):
-            machine.tick()
-            ticked_entities.add(machine)
-
-        # Tick power cables and grids (rebuilds grids if dirty, collects available wattage)
-        # We tick grids here so we which grids are able to run
-        ticked_power_grids = set()
-        for cable in entity_manager.get_power_cables():
-            cable.tick()
-            ticked_entities.add(cable)
-            if cable.grid not in ticked_power_grids:
-                cable.grid.tick()
-                ticked_power_grids.add(cable.grid)
-        
-        for machine in entity_manager.get_machines_with_component("PowerConsumer"):
-            machine.tick()
-            ticked_entities.add(machine)
-        
-        # Tick any other missed machines
-        for other_machine in entity_manager.get_machines():
-            if other_machine not in ticked_entities:
-                other_machine.tick()
-                ticked_entities.add(other_machine)
-        
-        for link in entity_manager.get_transfer_links():
-            link.tick()
-            ticked_entities.add(link)
-        
-        for other in entity_manager.get_tickable_entities():
-            if hasattr(other, 'tick'):
-                other.tick() # type: ignore
-                if other not in ticked_entities:
-                    logger.warning(f"Entity {other} not ticked deliberately in simulation!")
+        if self.profiler.enabled:
+            self._profiled_tick()
+            return
+        for _ in range(self.STEPS_PER_TICK):
+            self._start_tick()
+            for _, phase in self.phases:
+                phase()
+
+    def _start_tick(self):
+        self.tick_number += 1
+        machine_scheduler.advance(self.tick_number)
+
+    def _profiled_tick(self):
+        profiler = self.profiler
+        profiler.begin_tick()
+        phase_seconds = dict.fromkeys((name for name, _ in self.phases), 0.0)
+        for _ in range(self.STEPS_PER_TICK):
+            self._start_tick()
+            for name, phase in self.phases:
+                start = perf_counter()
+                phase()
+                phase_seconds[name] += perf_counter() - start
+        for name, seconds in phase_seconds.items():
+            profiler.record_phase(name, seconds)
+        profiler.end_tick()
+
+    def _tick_entities(self, entities: Iterable[Any]):
+        if not self.profiler.enabled:
+            for entity in entities:
+                entity.tick()
+            return
+
+        # attribute time per entity type (machine id for machines, class name otherwise)
+        profiler = self.profiler
+        for entity in entities:
+            start = perf_counter()
+            entity.tick()
+            profiler.add_entity_time(getattr(entity, "machine_id", None) or type(entity).__name__, perf_counter() - start)
+
+    def _tick_machines(self, machines: list["Machine"]):
+        if self.recipe_batcher:
+            start = perf_counter()
+            machines = self.recipe_batcher.tick(machines)
+            if self.profiler.enabled:
+                self.profiler.add_entity_time("RecipeBatch", perf_counter() - start)
+        self._tick_entities(machines)
+
+    def _tick_producers(self):
+        # update power producers. Only awake machines are ticked in the machine phases, see machine_scheduler
+        self._tick_machines(machine_scheduler.get_active("producers"))
+
+    def _tick_grids(self):
+        # Tick power grids (collects available wattage). Grid connectivity is kept current by cable_registry.
+        # We tick grids here so we which grids are able to run, then settle every consumer's demand in one pass
+        batched = self.power_settlement == "batched"
+        profiling = self.profiler.enabled
+        start = perf_counter()
+        for grid in cable_registry.get_grids():
+            grid.tick()
+            if batched:
+                grid.settle()
+        if profiling:
+            self.profiler.add_entity_time("PowerGrid", perf_counter() - start)
+
+    def _tick_consumers(self):
+        # machines that are also producers were already ticked with the producers
+        self._tick_machines(machine_scheduler.get_active("consumers"))
+
+    def _tick_other_machines(self):
+        # Tick any machines not covered by the power phases
+        self._tick_machines(machine_scheduler.get_active("machines"))
+
+    def _clear_empty_nodes(self):
+        node_store.clear_empty_items()
+
+    def _tick_links(self):
+        # Only chain heads whose transfer timer is due this tick
+        self._tick_entities(transfer_registry.get_due_links(self.tick_number))
+
+    def _tick_unscheduled(self):
+        # Catch anything the phases above did not cover
+        for other in entity_manager.get_other_tickable_entities():
+            logger.warning(f"Entity {other} not ticked deliberately in simulation!")
+            other.tick() # type: ignore
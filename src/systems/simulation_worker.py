@@ -0,0 +1,59 @@
+from threading import Event, Thread
+from time import perf_counter
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from game.machine import Machine
+
+from logger import logger
+from systems.simulation import Simulation
+from systems.world_view import WorldSnapshot
+
+class SimulationWorker:
+    def __init__(self, simulation: Simulation) -> None:
+        """
+        Runs simulation on a background thread at c.SIMULATION_TICKS_PER_SECOND so slow frames and slow ticks no
+        longer hold each other up. The game thread never touches the live world while the worker runs:
+            - it reads the latest WorldSnapshot, which the worker republishes after a tick once the previous one
+              has been picked up (so snapshots are only built as fast as frames are drawn)
+            - it changes the world through command_queue, which the worker drains before ticking
+        """
+        self.simulation = simulation
+        # machines the UI wants MachineDetails for in the next snapshot
+        self.inspected: tuple["Machine", ...] = ()
+
+        self._snapshot = WorldSnapshot.capture(simulation.tick_number)
+        self._snapshot_wanted = True
+        self._stop = Event()
+        self._thread = Thread(target=self._run, name="SimulationWorker", daemon=True)
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def start(self):
+        self._thread.start()
+        logger.info("[SimulationWorker] Started")
+
+    def stop(self, timeout: float = 1.0):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+        logger.info("[SimulationWorker] Stopped")
+
+    def latest_snapshot(self) -> WorldSnapshot:
+        self._snapshot_wanted = True
+        return self._snapshot
+
+    def _run(self):
+        last_time = perf_counter()
+        while not self._stop.is_set():
+            now = perf_counter()
+            ticks_run = self.simulation.update(now - last_time)
+            last_time = now
+
+            if ticks_run and self._snapshot_wanted:
+                self._snapshot_wanted = False
+                # single reference assignment, so readers always see a whole snapshot
+                self._snapshot = WorldSnapshot.capture(self.simulation.tick_number, self.inspected, self._snapshot)
+
+            self._stop.wait(self.simulation.time_until_next_tick())
@@ -0,0 +1,264 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Mapping, Sequence
+if TYPE_CHECKING:
+    from components.ionode import IONode
+    from game.simulation_entity import SimulationEntity
+    from infrastructure.data_registry import Recipe
+
+from game.machine import Machine
+from game.power_cable import PowerCable
+from game.transfer_link import TransferLink
+from game.resource_node import ResourceNode
+from infrastructure.data_registry import data_registry
+from infrastructure.entity_manager import entity_manager
+from infrastructure.global_inventory import global_inventory
+from infrastructure.io_registry import io_registry
+from infrastructure.spatial_hash import BoundsIndex, Rect
+from infrastructure.transfer_registry import cable_registry, transfer_registry
+
+# activity reported for links and cables a snapshot has no entry for, drawn fully faded out
+IDLE_ACTIVITY = 25
+
+@dataclass(frozen=True, slots=True)
+class MachineDetails:
+    """What the machine config panel shows for one machine."""
+    # (direction, item name, quantity) per item node
+    item_nodes: tuple[tuple[str, str | None, int], ...]
+    recipe: "Recipe | None"
+    recipe_progress: float | None
+    power_demand: int | None
+    has_power: bool | None
+    # (current, max) internal buffer of a PowerProducer
+    power_buffer: tuple[int, int] | None
+
+    @staticmethod
+    def capture(machine: "Machine") -> "MachineDetails":
+        recipe_runner = machine.get_component("RecipeRunner")
+        consumer = machine.get_component("PowerConsumer")
+        producer = machine.get_component("PowerProducer")
+        return MachineDetails(
+            item_nodes=tuple(
+                (node.direction, data_registry.items.get_name(node.item) if node.item is not None else None, node.quantity)
+                for node in machine.get_item_nodes()
+            ),
+            recipe=recipe_runner.selected_recipe if recipe_runner else None,
+            recipe_progress=recipe_runner.progress_pct if recipe_runner else None,
+            power_demand=consumer.evaluate_power_demand() if consumer else None,
+            has_power=consumer.has_power if consumer else None,
+            power_buffer=(producer.current_buffer, producer.max_internal_buffer) if producer else None,
+        )
+
+    def item_count(self, direction: str, item: str) -> int:
+        return sum(quantity for node_direction, node_item, quantity in self.item_nodes
+                   if node_direction == direction and node_item == item)
+
+class LiveWorldView:
+    """
+    Reads straight from the live world. Only safe on the thread that ticks the simulation, which is the case when
+    the game runs the simulation in-line with rendering.
+    """
+    @property
+    def resource_nodes(self) -> Sequence["ResourceNode"]:
+        return entity_manager.get_resource_nodes()
+
+    @property
+    def machines(self) -> Sequence["Machine"]:
+        return entity_manager.get_machines()
+
+    @property
+    def transfer_links(self) -> Sequence["TransferLink"]:
+        return entity_manager.get_transfer_links()
+
+    @property
+    def power_cables(self) -> Sequence["PowerCable"]:
+        return entity_manager.get_power_cables()
+
+    @property
+    def inventory(self) -> Mapping[str, int]:
+        return global_inventory.named_items()
+
+    @property
+    def entities_version(self) -> int:
+        return entity_manager.version
+
+    def has_node_at(self, pos: tuple[int, int]) -> bool:
+        return io_registry.get_node(pos) is not None
+
+    def node_at(self, pos: tuple[int, int]) -> "IONode | None":
+        return io_registry.get_node(pos)
+
+    def machine_under_position(self, pos: tuple[float, float]) -> "Machine | None":
+        return entity_manager.get_machine_under_position(pos)
+
+    def resource_node_under_position(self, pos: tuple[float, float]) -> "ResourceNode | None":
+        return entity_manager.get_resource_node_under_position(pos)
+
+    def transfer_links_at(self, pos: tuple[int, int]) -> Sequence["TransferLink"]:
+        return transfer_registry.get_links(pos)
+
+    def power_cables_at(self, pos: tuple[int, int]) -> Sequence["PowerCable"]:
+        return cable_registry.get_cables(pos)
+
+    def can_place(self, machine_id: str, pos: tuple[int, int]) -> bool:
+        return entity_manager.can_place(machine_id, pos)
+
+    def drawables_in_rect(self, rect: Rect) -> list["SimulationEntity"]:
+        return entity_manager.get_drawables_in_rect(rect)
+
+    def drawable_count(self) -> int:
+        return entity_manager.count_drawables()
+
+    def chunk_version(self, chunk: tuple[int, int]) -> int:
+        return entity_manager.get_chunk_version(chunk)
+
+    def link_activity(self, link: "TransferLink") -> int:
+        return link.ticks_since_transfer
+
+    def grid_activity(self, cable: "PowerCable") -> int:
+        return cable.grid.ticks_since_online
+
+    def recipe_progress(self, machine: "Machine") -> float | None:
+        recipe_runner = machine.get_component("RecipeRunner")
+        return recipe_runner.progress_pct if recipe_runner else None
+
+    def machine_details(self, machine: "Machine") -> MachineDetails | None:
+        return MachineDetails.capture(machine)
+
+@dataclass(frozen=True, slots=True)
+class WorldSnapshot:
+    """
+    Immutable copy of everything the renderer and UI read, published by the SimulationWorker after a tick.
+    Entities are shared with the live world but only their fixed attributes (positions, ids, shapes, nodes) may be
+    read from it; anything that changes while ticking is copied into the mappings below. Hover, link tool and
+    placement checks read it too, the commands they submit check the live world again.
+    """
+    tick: int
+    resource_nodes: tuple["ResourceNode", ...]
+    machines: tuple["Machine", ...]
+    transfer_links: tuple["TransferLink", ...]
+    power_cables: tuple["PowerCable", ...]
+    inventory: Mapping[str, int]
+    # copy of io_registry, and the io_registry.version it was copied at
+    nodes: Mapping[tuple[int, int], "IONode"]
+    io_version: int
+    # ticks_since_transfer per link
+    link_activities: Mapping["TransferLink", int]
+    # ticks_since_online of each cable's grid
+    grid_activities: Mapping["PowerCable", int]
+    # progress_pct per machine with a RecipeRunner
+    recipe_progresses: Mapping["Machine", float]
+    # full details only for the machines the UI asked for, capturing every machine each frame would be wasteful
+    details: Mapping["Machine", MachineDetails]
+    # copy of entity_manager's drawable index for culling, and the entity_manager.version it was copied at
+    drawables: BoundsIndex["SimulationEntity"]
+    entities_version: int
+    # entity_manager's render chunk versions and footprint occupancy, copied along with the drawable index
+    chunk_versions: Mapping[tuple[int, int], int]
+    occupied_cells: Mapping[tuple[int, int], "Machine"]
+
+    @staticmethod
+    def capture(tick: int, inspected: "Sequence[Machine]" = (), previous: "WorldSnapshot | None" = None) -> "WorldSnapshot":
+        """
+        Copies the live world. Must run on the simulation thread, between ticks. The drawable index is shared with
+        previous when no entity was added or removed since, it only has to be copied again after world edits. The
+        same goes for the render chunk versions, footprint occupancy and (after io_registry changes) the nodes.
+        """
+        machines = tuple(entity_manager.get_machines())
+        transfer_links = tuple(entity_manager.get_transfer_links())
+        power_cables = tuple(entity_manager.get_power_cables())
+        if previous and previous.entities_version == entity_manager.version:
+            drawables, chunk_versions = previous.drawables, previous.chunk_versions
+            occupied_cells = previous.occupied_cells
+        else:
+            drawables, chunk_versions = entity_manager.copy_drawables(), MappingProxyType(entity_manager.copy_chunk_versions())
+            occupied_cells = MappingProxyType(entity_manager.copy_occupied_cells())
+        if previous and previous.io_version == io_registry.version:
+            nodes = previous.nodes
+        else:
+            nodes = MappingProxyType(io_registry.copy_nodes())
+        recipe_progresses = {}
+        for machine in machines:
+            recipe_runner = machine.get_component("RecipeRunner")
+            if recipe_runner:
+                recipe_progresses[machine] = recipe_runner.progress_pct
+
+        return WorldSnapshot(
+            tick=tick,
+            resource_nodes=tuple(entity_manager.get_resource_nodes()),
+            machines=machines,
+            transfer_links=transfer_links,
+            power_cables=power_cables,
+            inventory=MappingProxyType(global_inventory.named_items()),
+            nodes=nodes,
+            io_version=io_registry.version,
+            link_activities=MappingProxyType(
+                {link: link.ticks_since_transfer for link in transfer_links}
+            ),
+            grid_activities=MappingProxyType(
+                {cable: cable_registry.get_grid(cable).ticks_since_online for cable in power_cables}
+            ),
+            recipe_progresses=MappingProxyType(recipe_progresses),
+            details=MappingProxyType({
+                machine: MachineDetails.capture(machine) for machine in inspected if machine in entity_manager.entities
+            }),
+            drawables=drawables,
+            entities_version=entity_manager.version,
+            chunk_versions=chunk_versions,
+            occupied_cells=occupied_cells,
+        )
+
+    def has_node_at(self, pos: tuple[int, int]) -> bool:
+        return pos in self.nodes
+
+    def node_at(self, pos: tuple[int, int]) -> "IONode | None":
+        return self.nodes.get(pos)
+
+    def machine_under_position(self, pos: tuple[float, float]) -> "Machine | None":
+        for entity in self.drawables.query_bounds((pos[0], pos[1], 0, 0)):
+            if isinstance(entity, Machine) and entity_manager.machine_covers(entity, pos):
+                return entity
+        return None
+
+    def resource_node_under_position(self, pos: tuple[float, float]) -> "ResourceNode | None":
+        for entity in self.drawables.query_bounds((pos[0], pos[1], 0, 0)):
+            if isinstance(entity, ResourceNode) and entity_manager.resource_node_covers(entity, pos):
+                return entity
+        return None
+
+    def transfer_links_at(self, pos: tuple[int, int]) -> list["TransferLink"]:
+        """Links starting or ending at pos, in the order transfer_registry.get_links returns them."""
+        links = [entity for entity in self.drawables.query_bounds((pos[0], pos[1], 0, 0))
+                 if isinstance(entity, TransferLink) and pos in (entity.start_pos, entity.end_pos)]
+        links.sort(key=lambda link: link.creation_index)
+        return links
+
+    def power_cables_at(self, pos: tuple[int, int]) -> list["PowerCable"]:
+        return [entity for entity in self.drawables.query_bounds((pos[0], pos[1], 0, 0))
+                if isinstance(entity, PowerCable) and pos in (entity.start_pos, entity.end_pos)]
+
+    def can_place(self, machine_id: str, pos: tuple[int, int]) -> bool:
+        return entity_manager.footprint_free(self.occupied_cells, machine_id, pos)
+
+    def drawables_in_rect(self, rect: Rect) -> list["SimulationEntity"]:
+        return self.drawables.query_bounds(rect)
+
+    def drawable_count(self) -> int:
+        return len(self.drawables)
+
+    def chunk_version(self, chunk: tuple[int, int]) -> int:
+        return self.chunk_versions.get(chunk, 0)
+
+    def link_activity(self, link: "TransferLink") -> int:
+        return self.link_activities.get(link, IDLE_ACTIVITY)
+
+    def grid_activity(self, cable: "PowerCable") -> int:
+        return self.grid_activities.get(cable, IDLE_ACTIVITY)
+
+    def recipe_progress(self, machine: "Machine") -> float | None:
+        return self.recipe_progresses.get(machine)
+
+    def machine_details(self, machine: "Machine") -> MachineDetails | None:
+        return self.details.get(machine)
+
+WorldView = LiveWorldView | WorldSnapshot
@@ -4,8 +4,7 @@ from game.machine import Machine
 from infrastructure.input_manager import input_manager
 from infrastructure.data_registry import data_registry
 from components.RecipeRunner import RecipeRunner
-from components.PowerProducer import PowerProducer
-from components.PowerConsumer import PowerConsumer
+from systems.world_view import LiveWorldView, WorldView
 
 
 from logger import logger
@@ -13,6 +12,7 @@ from logger import logger
 from typing import TYPE_CHECKING, List, Any
 if TYPE_CHECKING:
     from game.game import Game
+    from systems.dirty_regions import DirtyRegions
 
 class UIElement:
     def __init__(self, rect, visible=True):
@@ -31,6 +31,15 @@ class UIElement:
     def draw_self(self, surface):
         pass  # Override in subclass
 
+    def repaint_region(self) -> tuple[pg.Rect, Any]:
+        """Screen rect this element draws in and a value that changes whenever what it draws does, see DirtyRegions."""
+        return self.global_rect().copy(), (
+            self.visible, self.visual_state(), tuple(child.repaint_region() for child in self.children)
+        )
+
+    def visual_state(self) -> Any:
+        return None  # Override in subclass
+
     def handle_event(self, event):
         if not self.visible:
             return
@@ -79,6 +88,9 @@ class UIWindow(UIElement):
         title_surf = self.font.render(self.title, True, (255, 255, 255))
         surface.blit(title_surf, rect.move(10, 5))
     
+    def visual_state(self):
+        return self.title
+
     def close(self):
         self.visible = False
     
@@ -100,6 +112,9 @@ class UILabel(UIElement):
         text_surf = self.font.render(self.text, True, self.color)
         surface.blit(text_surf, rect)
 
+    def visual_state(self):
+        return (self.text, self.color)
+
 class UIButton(UIElement):
     def __init__(self, rect, text, callback=None, bg_color=(60, 60, 60), hover_color=(80, 80, 80), text_color=(255, 255, 255),
                  clickable = True, disabled_color=(40, 40, 40)):
@@ -123,6 +138,9 @@ class UIButton(UIElement):
         text_surf = self.font.render(self.text, True, self.text_color)
         surface.blit(text_surf, text_surf.get_rect(center=rect.center))
 
+    def visual_state(self):
+        return (self.text, self.hover, self.clickable)
+
     def handle_event(self, event):
         if not self.clickable:
             return
@@ -162,6 +180,9 @@ class UIToggleButton(UIButton):
         text_surf = self.font.render(self.text, True, self.text_color)
         surface.blit(text_surf, text_surf.get_rect(center=rect.center))
 
+    def visual_state(self):
+        return (self.text, self.hover, self.state)
+
 # class UIInventoryPanel(UIElement):
 #     def __init__(self, game: "Game"):
 #         super().__init__(pg.Rect(0, 0, 0, 0))  # placeholder rect
@@ -645,6 +666,8 @@ class UIMachineConfig(UIElement):
         self.rect = pg.Rect(0, 0, 400, 250)
         self.machine = machine
         self.parent = parent
+        # UIElement.__init__ resets parent, keep our own reference to read the world from
+        self.contexts_manager = parent
 
         self.rect.topleft = mouse_pos
         super().__init__(self.rect, True)
@@ -661,11 +684,16 @@ class UIMachineConfig(UIElement):
         
         txt = self.font.render(self.machine.name, antialias=True, color=(255, 255, 255))
         surface.blit(txt, global_rect.move(5, 5))
+
+        # a snapshot taken before this panel opened has no details yet, they arrive with the next one
+        details = self.contexts_manager.world.machine_details(self.machine)
+        if details is None:
+            return
         
         recipe_text = "N/A"
         recipe_component = self.machine.get_component("RecipeRunner")
-        if recipe_component and recipe_component.selected_recipe:
-            recipe_text = recipe_component.selected_recipe.name
+        if recipe_component and details.recipe:
+            recipe_text = details.recipe.name
         txt = self.font.render(f"Recipe: {recipe_text}", antialias=True, color=(255, 255, 255))
         surface.blit(txt, global_rect.move(5, 5+txt.get_height()*1))
         
@@ -685,15 +713,15 @@ class UIMachineConfig(UIElement):
         bar_bg = pg.Rect(global_rect.topleft, (60, 20)).move((global_rect.width//2)-30, global_rect.height//2)
         pg.draw.rect(surface, (75, 75, 75), bar_bg, border_radius=5)
         progress_bar_width = 60
-        if recipe_component:
-            progress_bar_width = 60 * recipe_component.progress_pct
+        if details.recipe_progress is not None:
+            progress_bar_width = 60 * details.recipe_progress
         
         bar_progress = pg.Rect(global_rect.topleft, (progress_bar_width, 20)).move((global_rect.width//2)-30, global_rect.height//2)
         pg.draw.rect(surface, (150, 150, 150), bar_progress, border_radius=5)
         
         bar_txt = ""
-        if recipe_component:
-            bar_txt = f"{int(recipe_component.progress_pct * 100)}%"
+        if details.recipe_progress is not None:
+            bar_txt = f"{int(details.recipe_progress * 100)}%"
             
         bar_txt = self.font.render(bar_txt, antialias=True, color=(255, 255, 255))
         surface.blit(bar_txt, (bar_bg.centerx-(bar_txt.width//2), bar_bg.centery-(bar_txt.height//2)))
@@ -708,8 +736,8 @@ class UIMachineConfig(UIElement):
         y = 2 + txt.height
         if recipe_component:
             assert isinstance(recipe_component, RecipeRunner)
-            if recipe_component.selected_recipe:
-                for item, count in recipe_component.selected_recipe.inputs.items():
+            if details.recipe:
+                for item, count in details.recipe.inputs.items():
                     r = pg.Rect((inputs_rect.move(2, y).topleft), (20, 20))
                     pg.draw.rect(surface, (255, 0, 0), r, border_radius=1)
                     
@@ -718,23 +746,20 @@ class UIMachineConfig(UIElement):
                     txt = self.font.render(txt, True, (255, 255, 255))
                     surface.blit(txt, (r.right + 2, r.top-2))
                     
-                    machine_item_count = 0
-                    for node in self.machine.get_item_nodes('input'):
-                        if node.item == item:
-                            machine_item_count += node.quantity
+                    machine_item_count = details.item_count("input", item)
                     txt = self.font.render(f"{machine_item_count}/{count}", True, (255, 255, 255))
                     surface.blit(txt, (r.right + 2, r.top-2 + txt.height))
                     
                     y += 25
         else:
             items = {}
-            for node in self.machine.get_item_nodes('input'):
-                if not node.item:
+            for direction, item, quantity in details.item_nodes:
+                if direction != "input" or not item:
                     continue
-                if node.item not in items:
-                    items[node.item] = node.quantity
+                if item not in items:
+                    items[item] = quantity
                 else:
-                    items[node.item] += node.quantity
+                    items[item] += quantity
         
             for item, count in items.items():
                 r = pg.Rect((inputs_rect.move(2, y).topleft), (20, 20))
@@ -753,38 +778,35 @@ class UIMachineConfig(UIElement):
         y = 2 + txt.height
         if recipe_component:
             assert isinstance(recipe_component, RecipeRunner)
-            if recipe_component.selected_recipe:
-                if recipe_component.selected_recipe.output_type == "item":
+            if details.recipe:
+                if details.recipe.output_type == "item":
                     # for item in t_list:
-                    for item, count in recipe_component.selected_recipe.outputs.items():
+                    for item, count in details.recipe.outputs.items():
                         r = pg.Rect((outputs_rect.move(2, y).topleft), (20, 20))
                         pg.draw.rect(surface, (255, 0, 0), r, border_radius=1)
                         
                         txt = self.font.render(item.split(".")[-1].title(), True, (255, 255, 255))
                         surface.blit(txt, (r.right + 2, r.top))
                         
-                        machine_item_count = 0
-                        for node in self.machine.get_item_nodes('output'):
-                            if node.item == item:
-                                machine_item_count += node.quantity
+                        machine_item_count = details.item_count("output", item)
                         txt = self.font.render(f"{machine_item_count}/{count}", True, (255, 255, 255))
                         surface.blit(txt, (r.right + 2, r.top + txt.height))
                         
                         y += 25
-                elif recipe_component.selected_recipe.output_type == "energy":
-                    for item, count in recipe_component.selected_recipe.outputs.items():
+                elif details.recipe.output_type == "energy":
+                    for item, count in details.recipe.outputs.items():
                         r = pg.Rect((outputs_rect.move(2, y).topleft), (20, 20))
                         pg.draw.rect(surface, (255, 0, 0), r, border_radius=1)
                         
                         txt = self.font.render(f"{item.split(".")[-1].upper()} power", True, (255, 255, 255))
                         surface.blit(txt, (r.right + 2, r.top))
                         
-                        power_producer = self.machine.get_component("PowerProducer")
-                        assert isinstance(power_producer, PowerProducer)
+                        assert details.power_buffer is not None
+                        current_buffer, max_internal_buffer = details.power_buffer
                         
-                        joules = power_producer.current_buffer // 60
+                        joules = current_buffer // 60
 
-                        txt = self.font.render(f"{joules}/{power_producer.max_internal_buffer // 60} J", True, (255, 255, 255))
+                        txt = self.font.render(f"{joules}/{max_internal_buffer // 60} J", True, (255, 255, 255))
                         surface.blit(txt, (r.right + 2, r.top + txt.height))
                         
                         y += 25
@@ -794,15 +816,12 @@ class UIMachineConfig(UIElement):
         
         
         # Wattage use
-        power_consumer = self.machine.get_component("PowerConsumer")
-        if power_consumer:
-            assert isinstance(power_consumer, PowerConsumer)
-
+        if details.power_demand is not None:
             color = (255, 100, 100)
-            if power_consumer.has_power:
+            if details.has_power:
                 color = (255, 255, 255)
 
-            txt = self.font.render(f"{power_consumer.evaluate_power_demand()} W", True, color)
+            txt = self.font.render(f"{details.power_demand} W", True, color)
             txt_rect = txt.get_rect()
             txt_rect.bottom = global_rect.bottom
             txt_rect.right = global_rect.right
@@ -810,8 +829,8 @@ class UIMachineConfig(UIElement):
         # recipe duration
         if recipe_component:
             assert isinstance(recipe_component, RecipeRunner)
-            if recipe_component.selected_recipe:
-                txt = self.font.render(f"{recipe_component.selected_recipe.duration}t", True, (255, 255, 255))
+            if details.recipe:
+                txt = self.font.render(f"{details.recipe.duration}t", True, (255, 255, 255))
                 txt_rect = txt.get_rect()
                 txt_rect.bottom = global_rect.bottom
                 txt_rect.centerx = global_rect.centerx
@@ -821,11 +840,19 @@ class UIMachineContextsManager(UIElement):
     def __init__(self) -> None:
         super().__init__((0, 0, 0, 0))
         self.current_context = None
+        self.world: WorldView = LiveWorldView()
     
     def draw_self(self, surface):
         if self.current_context:
             self.current_context.draw_self(surface)
     
+    def repaint_region(self):
+        # the open panel draws outside this element's own (empty) rect
+        context = self.current_context
+        if not context:
+            return pg.Rect(0, 0, 0, 0), None
+        return context.rect.copy(), (context.machine, self.world.machine_details(context.machine))
+
     def clear_context(self):
         del(self.current_context)
         self.current_context = None
@@ -906,9 +933,27 @@ class UIManager:
     def add(self, element):
         self.elements.append(element)
 
-    def draw(self, surface):
+    def draw(self, surface, world: WorldView, rect: pg.Rect | None = None):
+        """
+        Draws every element, or with rect only those whose region touches it (dirty rectangle drawing). world is
+        what machine panels read from, see Renderer.render.
+        """
+        self.machine_contexts_manager.world = world
         for el in self.elements:
-            el.draw(surface)
+            if rect is None or rect.colliderect(el.repaint_region()[0]):
+                el.draw(surface)
+
+    def mark_regions(self, regions: "DirtyRegions", world: WorldView):
+        """Marks the region of every element, see DirtyRegions. world is the one draw will be given."""
+        self.machine_contexts_manager.world = world
+        for i, el in enumerate(self.elements):
+            rect, state = el.repaint_region()
+            regions.mark(("ui", i), rect, state)
+
+    def inspected_machines(self) -> tuple[Machine, ...]:
+        """Machines that currently have a panel open, so a SimulationWorker can include their details in snapshots."""
+        context = self.machine_contexts_manager.current_context
+        return (context.machine,) if context else ()
 
     def handle_event(self, event):
         for el in self.elements:
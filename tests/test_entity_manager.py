@@ -0,0 +1,90 @@
+import os
+import sys
+import unittest
+
+# run from the repository root, like the game: data is loaded from src/data relative to the working directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import data.configuration as c
+from benchmark import reset_world
+from game.machine import Machine
+from game.power_cable import PowerCable
+from infrastructure.entity_manager import entity_manager
+from infrastructure.io_registry import io_registry
+from infrastructure.node_store import node_store, np
+from infrastructure.transfer_registry import cable_registry
+
+class RemoveMachineTest(unittest.TestCase):
+    def setUp(self):
+        reset_world()
+
+    def tearDown(self):
+        reset_world()
+
+    def build_powered_crusher(self) -> tuple[Machine, Machine, PowerCable]:
+        turbine = Machine("basic_steam_turbine", (0, -4 * c.BASE_MACHINE_HEIGHT))
+        crusher = Machine("rock_crusher", (0, 0))
+        entity_manager.add_entity(turbine)
+        entity_manager.add_entity(crusher)
+        cable = PowerCable(turbine.get_energy_nodes()[0].abs_pos, crusher.get_energy_nodes()[0].abs_pos, "basic_cable")
+        entity_manager.add_entity(cable)
+        return turbine, crusher, cable
+
+    def test_replace_powered_machine(self):
+        turbine, crusher, cable = self.build_powered_crusher()
+        grid = cable_registry.get_grid(cable)
+        self.assertIs(crusher.power_grid, grid)
+        energy_pos = crusher.get_energy_nodes()[0].abs_pos
+        item_pos = crusher.get_item_node("in_main").abs_pos
+
+        entity_manager.remove_entity(crusher)
+        self.assertIsNone(io_registry.get_node(energy_pos))
+        self.assertIsNone(io_registry.get_node(item_pos))
+        self.assertIsNone(crusher.power_grid)
+        self.assertNotIn(crusher, grid.connections)
+        self.assertNotIn(crusher.get_component("PowerConsumer"), grid.consumers)
+
+        replacement = Machine("rock_crusher", (0, 0))
+        entity_manager.add_entity(replacement)
+        self.assertIs(io_registry.get_energy_node(energy_pos).parent, replacement)
+        self.assertIs(io_registry.get_item_node(item_pos).parent, replacement)
+
+        # a new cable to the spot connects the replacement, never the removed machine
+        new_cable = PowerCable(turbine.get_energy_nodes()[0].abs_pos, energy_pos, "basic_cable")
+        entity_manager.add_entity(new_cable)
+        grid = cable_registry.get_grid(new_cable)
+        self.assertIs(replacement.power_grid, grid)
+        self.assertEqual(grid.connections, {turbine, replacement})
+
+    def test_remove_producer(self):
+        turbine, crusher, cable = self.build_powered_crusher()
+        grid = cable_registry.get_grid(cable)
+        entity_manager.remove_entity(turbine)
+        self.assertIsNone(io_registry.get_node(turbine.get_energy_nodes()[0].abs_pos))
+        self.assertEqual(grid.producers, {})
+        self.assertEqual(grid.connections, {crusher})
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_node_store_slots_reused(self):
+        node_store.enable()
+        try:
+            crusher = Machine("rock_crusher", (0, 0))
+            entity_manager.add_entity(crusher)
+            slots = sorted(node.slot for node in crusher.get_item_nodes())
+            node = crusher.get_item_node("in_main")
+            node.item, node.quantity = 0, 5
+
+            entity_manager.remove_entity(crusher)
+            self.assertEqual(node_store.item_totals(), {})
+            self.assertEqual(node_store.free_space().sum(), 0)
+
+            replacement = Machine("rock_crusher", (0, 0))
+            entity_manager.add_entity(replacement)
+            self.assertEqual(sorted(node.slot for node in replacement.get_item_nodes()), slots)
+            self.assertEqual(node_store.size, len(slots))
+            self.assertTrue(all(node.quantity == 0 and node.item is None for node in replacement.get_item_nodes()))
+        finally:
+            node_store.enable(c.NODE_STORE == "numpy")
+
+if __name__ == "__main__":
+    unittest.main()